@@ -0,0 +1,437 @@
+"""
+Callback plugin aggregating the Prisma Access API metrics of a playbook run.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+import tempfile
+import time
+
+from ansible.plugins.callback import CallbackBase
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+name: api_metrics
+
+type: aggregate
+
+short_description: Aggregate the Prisma Access API metrics of a playbook run.
+
+version_added: "0.1.9"
+
+description:
+    - Collect the API metrics returned by the modules of this collection when their I(metrics) option is enabled,
+      and aggregate them per module and per tenant across the whole playbook run.
+    - At the end of the run, write a JSON summary and, optionally, a file for the textfile collector of the
+      Prometheus node exporter, with latency histograms, request, retry, throttling and error counts, bytes
+      transferred, time spent per phase and the duration of the run.
+    - Enable the I(metrics) option of every module of the collection at once with C(module_defaults) and the
+      C(group/cdot65.prisma_access.prisma_access) action group, which holds every module calling the API.
+    - The address_group_preview, mirror_info and snapshot_diff modules only read local files, have no I(metrics)
+      option and are not part of the action group, so the defaults of the group never reach them.
+
+requirements:
+    - enable the plugin with C(callbacks_enabled = cdot65.prisma_access.api_metrics) in C(ansible.cfg)
+
+options:
+    buckets:
+        description:
+            - upper bounds, in seconds, of the buckets of the latency histograms
+        default: [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+        type: list
+        elements: float
+        env:
+            - name: PRISMA_ACCESS_METRICS_BUCKETS
+        ini:
+            - section: callback_api_metrics
+              key: buckets
+    summary_path:
+        description:
+            - path of the JSON summary written at the end of the run
+        default: "prisma_access_metrics.json"
+        type: path
+        env:
+            - name: PRISMA_ACCESS_METRICS_SUMMARY
+        ini:
+            - section: callback_api_metrics
+              key: summary_path
+    textfile_path:
+        description:
+            - path of the Prometheus textfile written at the end of the run, in the directory watched by the
+              textfile collector of the node exporter; no file is written when unset
+        required: false
+        type: path
+        env:
+            - name: PRISMA_ACCESS_METRICS_TEXTFILE
+        ini:
+            - section: callback_api_metrics
+              key: textfile_path
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+# ansible.cfg
+# [defaults]
+# callbacks_enabled = cdot65.prisma_access.api_metrics
+#
+# [callback_api_metrics]
+# summary_path = /var/tmp/prisma_access_metrics.json
+# textfile_path = /var/lib/node_exporter/textfile_collector/prisma_access.prom
+
+- name: CONFIGURE Prisma Access
+  hosts: prisma
+  connection: local
+  gather_facts: False
+  module_defaults:
+    group/cdot65.prisma_access.prisma_access:
+      metrics: true
+
+  tasks:
+    - name: CREATE tags
+      cdot65.prisma_access.tag:
+        provider: "{{ provider }}"
+        name: "ansible"
+        folder: "Shared"
+        state: "present"
+"""
+
+# prefix of every exported Prometheus metric
+PREFIX = "prisma_access"
+
+
+def escape(value):
+    """Escape a Prometheus label value."""
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace('"', '\\"')
+    )
+
+
+def labels(**values):
+    return ",".join(
+        f'{key}="{escape(value)}"' for key, value in values.items()
+    )
+
+
+class Series:
+    """Requests of one module against one tenant, with a latency histogram in constant memory."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.requests = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes = 0
+        self.retries = 0
+        self.throttled = 0
+        self.errors = 0
+        self.status = {}
+
+    def add(self, request):
+        seconds = request.get("ms", 0) / 1000
+        status = request.get("status")
+        index = next(
+            (
+                index
+                for index, bound in enumerate(self.buckets)
+                if seconds <= bound
+            ),
+            len(self.buckets),
+        )
+        self.counts[index] += 1
+        self.requests += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.bytes += request.get("bytes", 0)
+        self.retries += request.get("retries", 0)
+        if status == 429:
+            self.throttled += 1
+        elif isinstance(status, int) and status >= 500:
+            self.errors += 1
+        self.status[str(status)] = self.status.get(str(status), 0) + 1
+
+    def cumulative(self):
+        """Return the cumulative count of every bucket, ending with +Inf."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + [float("inf")], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def summary(self):
+        return {
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "status": self.status,
+            "latency_seconds": {
+                "sum": round(self.seconds, 6),
+                "mean": round(self.seconds / self.requests, 6)
+                if self.requests
+                else 0.0,
+                "max": round(self.max_seconds, 6),
+                "buckets": dict(
+                    ("+Inf" if bound == float("inf") else str(bound), count)
+                    for bound, count in self.cumulative()
+                ),
+            },
+        }
+
+
+class CallbackModule(CallbackBase):
+    """Aggregates the metrics returned by the collection's modules and writes them at the end of the run."""
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "cdot65.prisma_access.api_metrics"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, *args, **kwargs):
+        super(CallbackModule, self).__init__(*args, **kwargs)
+        self.started = time.time()
+        self.playbook = None
+        self.series = {}
+        self.modules = {}
+
+    # ---------------------------------------------------------------------------------------------------------- #
+    # events                                                                                                     #
+    # ---------------------------------------------------------------------------------------------------------- #
+    def v2_playbook_on_start(self, playbook):
+        self.started = time.time()
+        self.playbook = os.path.basename(playbook._file_name)
+
+    def v2_runner_on_ok(self, result):
+        self.record(result, failed=False)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self.record(result, failed=True)
+
+    def v2_playbook_on_stats(self, stats):
+        summary = self.summary()
+
+        path = self.get_option("summary_path")
+        if path:
+            self.write(path, json.dumps(summary, indent=2) + "\n")
+
+        path = self.get_option("textfile_path")
+        if path:
+            self.write(path, self.textfile(summary))
+
+    # ---------------------------------------------------------------------------------------------------------- #
+    # aggregation                                                                                                #
+    # ---------------------------------------------------------------------------------------------------------- #
+    def record(self, result, failed):
+        task = result._task
+        module = getattr(task, "resolved_action", None) or task.action
+
+        # loops return the result of every item under results
+        runs = result._result.get("results")
+        if not isinstance(runs, list):
+            runs = [result._result]
+
+        for run in runs:
+            metrics = run.get("metrics") if isinstance(run, dict) else None
+            if not isinstance(metrics, dict):
+                continue
+
+            totals = self.modules.setdefault(
+                module,
+                {
+                    "tasks": 0,
+                    "failed": 0,
+                    "phases": {
+                        "auth": 0.0,
+                        "list": 0.0,
+                        "wait": 0.0,
+                        "write": 0.0,
+                    },
+                },
+            )
+            totals["tasks"] += 1
+            if run.get("failed", failed):
+                totals["failed"] += 1
+            for phase, phase_totals in metrics.get("phases", {}).items():
+                totals["phases"][phase] = (
+                    totals["phases"].get(phase, 0.0)
+                    + phase_totals.get("ms", 0) / 1000
+                )
+
+            for request in metrics.get("requests", []):
+                key = (module, request.get("tenant", ""))
+                if key not in self.series:
+                    self.series[key] = Series(
+                        sorted(
+                            float(each) for each in self.get_option("buckets")
+                        )
+                    )
+                self.series[key].add(request)
+
+    def summary(self):
+        finished = time.time()
+        return {
+            "playbook": self.playbook,
+            "started": self.started,
+            "finished": finished,
+            "duration_seconds": round(finished - self.started, 3),
+            "modules": dict(
+                (
+                    module,
+                    dict(
+                        totals,
+                        phases=dict(
+                            (phase, round(seconds, 6))
+                            for phase, seconds in totals["phases"].items()
+                        ),
+                    ),
+                )
+                for module, totals in sorted(self.modules.items())
+            ),
+            "tenants": [
+                dict(module=module, tenant=tenant, **series.summary())
+                for (module, tenant), series in sorted(self.series.items())
+            ],
+        }
+
+    def textfile(self, summary):
+        """Return the summary in the Prometheus text exposition format."""
+        lines = []
+
+        def family(name, kind, description):
+            lines.append(f"# HELP {PREFIX}_{name} {description}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+        family(
+            "api_request_duration_seconds",
+            "histogram",
+            "Latency of the API requests, per module and tenant.",
+        )
+        for (module, tenant), series in sorted(self.series.items()):
+            for bound, count in series.cumulative():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f"{PREFIX}_api_request_duration_seconds_bucket"
+                    f"{{{labels(module=module, tenant=tenant, le=le)}}} {count}"
+                )
+            lines.append(
+                f"{PREFIX}_api_request_duration_seconds_sum"
+                f"{{{labels(module=module, tenant=tenant)}}} {series.seconds}"
+            )
+            lines.append(
+                f"{PREFIX}_api_request_duration_seconds_count"
+                f"{{{labels(module=module, tenant=tenant)}}} {series.requests}"
+            )
+
+        family(
+            "api_requests_total",
+            "counter",
+            "API requests, per module, tenant and status.",
+        )
+        for (module, tenant), series in sorted(self.series.items()):
+            for status, count in sorted(series.status.items()):
+                lines.append(
+                    f"{PREFIX}_api_requests_total"
+                    f"{{{labels(module=module, tenant=tenant, status=status)}}} {count}"
+                )
+
+        for name, attribute, description in (
+            (
+                "api_response_bytes_total",
+                "bytes",
+                "Bytes received from the API.",
+            ),
+            ("api_retries_total", "retries", "API requests retried."),
+            (
+                "api_throttled_total",
+                "throttled",
+                "API requests rejected with 429.",
+            ),
+            (
+                "api_errors_total",
+                "errors",
+                "API requests failing with a 5xx status.",
+            ),
+        ):
+            family(
+                name, "counter", f"{description[:-1]}, per module and tenant."
+            )
+            for (module, tenant), series in sorted(self.series.items()):
+                lines.append(
+                    f"{PREFIX}_{name}{{{labels(module=module, tenant=tenant)}}} "
+                    f"{getattr(series, attribute)}"
+                )
+
+        family(
+            "tasks_total",
+            "counter",
+            "Module runs that returned metrics, per module and result.",
+        )
+        for module, totals in summary["modules"].items():
+            for result, count in (
+                ("ok", totals["tasks"] - totals["failed"]),
+                ("failed", totals["failed"]),
+            ):
+                lines.append(
+                    f"{PREFIX}_tasks_total{{{labels(module=module, result=result)}}} {count}"
+                )
+
+        family(
+            "phase_seconds_total",
+            "counter",
+            "Time spent authenticating, waiting for tokens, listing and writing, per module.",
+        )
+        for module, totals in summary["modules"].items():
+            for phase, seconds in totals["phases"].items():
+                lines.append(
+                    f"{PREFIX}_phase_seconds_total"
+                    f"{{{labels(module=module, phase=phase)}}} {seconds}"
+                )
+
+        playbook = labels(playbook=summary["playbook"] or "")
+        family(
+            "playbook_duration_seconds",
+            "gauge",
+            "Duration of the last playbook run.",
+        )
+        lines.append(
+            f"{PREFIX}_playbook_duration_seconds{{{playbook}}} "
+            f"{summary['duration_seconds']}"
+        )
+        family(
+            "playbook_last_run_timestamp_seconds",
+            "gauge",
+            "Time the last playbook run finished.",
+        )
+        lines.append(
+            f"{PREFIX}_playbook_last_run_timestamp_seconds{{{playbook}}} "
+            f"{summary['finished']}"
+        )
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path, content):
+        """Write a file atomically, so collectors never read a partial file."""
+        path = os.path.abspath(os.path.expanduser(path))
+        try:
+            descriptor, temporary = tempfile.mkstemp(
+                dir=os.path.dirname(path), prefix=".prisma_access_metrics."
+            )
+            with os.fdopen(descriptor, "w") as handle:
+                handle.write(content)
+            os.chmod(temporary, 0o644)
+            os.replace(temporary, path)
+        except OSError as exception_error:
+            self._display.warning(
+                f"Could not write Prisma Access API metrics to {path}: {exception_error}"
+            )
@@ -0,0 +1,116 @@
+"""
+Lookup plugin reading objects from the local SQLite mirror of a Prisma Access tenant.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+
+from ansible.errors import AnsibleLookupError
+from ansible.module_utils._text import to_native
+from ansible.plugins.lookup import LookupBase
+
+from ansible_collections.cdot65.prisma_access.plugins.module_utils.mirror import (
+    Mirror,
+    mirror_path,
+)
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+name: mirror
+
+short_description: Read objects from the local SQLite mirror of a Prisma Access tenant.
+
+version_added: "0.1.9"
+
+description:
+    - Return the configuration of the objects mirrored by the cdot65.prisma_access.mirror_sync module, without
+      contacting the API.
+    - Objects are selected by names, given as terms, and by type, folder, tag and name pattern, every filter given
+      having to match. Without terms, every object matching the other filters is returned.
+    - The mirror is read on the controller. Use C(query) rather than C(lookup) to always get a list.
+
+options:
+    _terms:
+        description:
+            - names of the objects to return
+        required: false
+    folder:
+        description:
+            - only return objects of this folder
+        type: str
+    name_pattern:
+        description:
+            - shell-style pattern, such as C(web-*), matched case-sensitively against the names of the objects
+        type: str
+    path:
+        description:
+            - path of the SQLite database
+            - defaults to C(~/.ansible/cache/cdot65.prisma_access/mirror-<scope>.sqlite)
+        type: path
+    scope:
+        description:
+            - tenant whose mirror is read, when I(path) is not given
+        type: str
+    tag:
+        description:
+            - only return objects carrying this tag
+        type: str
+    type:
+        description:
+            - only return objects of this type
+        type: str
+        choices:
+            - "address"
+            - "address_group"
+            - "ike_gateway"
+            - "ipsec_tunnel"
+            - "remote_network"
+            - "service_connection"
+            - "tag"
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+    - name: Use the address groups tagged web in a template
+      ansible.builtin.debug:
+        msg: "{{ query('cdot65.prisma_access.mirror', type='address_group', tag='web', scope=scope) | map(attribute='name') }}"
+
+    - name: Read two addresses by name
+      ansible.builtin.set_fact:
+        addresses: "{{ query('cdot65.prisma_access.mirror', 'web-1', 'web-2', type='address', scope=scope) }}"
+"""
+
+RETURN = r"""
+_raw:
+    description: configuration of every matching object, with its type under object_type
+    type: list
+    elements: dict
+"""
+
+
+class LookupModule(LookupBase):
+    def run(self, terms, variables=None, **kwargs):
+        self.set_options(var_options=variables, direct=kwargs)
+
+        scope = self.get_option("scope")
+        path = self.get_option("path")
+        if not scope and not path:
+            raise AnsibleLookupError("one of scope or path is required")
+        path = mirror_path(scope, path)
+
+        try:
+            with Mirror(path) as mirror:
+                return mirror.query(
+                    object_type=self.get_option("type"),
+                    names=[to_native(term) for term in terms],
+                    folder=self.get_option("folder"),
+                    tag=self.get_option("tag"),
+                    name_pattern=self.get_option("name_pattern"),
+                )
+        except Exception as exception_error:
+            raise AnsibleLookupError(
+                f"reading the mirror {path} failed: {to_native(exception_error)}"
+            )
@@ -3,26 +3,71 @@ from ansible.module_utils._text import (
 )
 from traceback import format_exc
 from ansible.module_utils.basic import AnsibleModule  # noqa: F401
-from panapi import PanApiSession
+from contextlib import nullcontext
+import os
 import time
+from .metrics import (
+    Metrics,
+    report_metrics,
+)
 
+# token and API endpoints; both can be pointed at a local stand-in of the API,
+# such as tests/mock_server.py, through the environment of the controller
+TOKEN_URL = os.environ.get(
+    "PRISMA_ACCESS_TOKEN_URL",
+    "https://auth.apps.paloaltonetworks.com/am/oauth2/access_token",
+)
+API_URL = os.environ.get("PRISMA_ACCESS_API_URL")
 
-def get_authenticated_session(module):
-    try:
-        # create an authenticated session object
-        auth = module.params.get("provider")
-        session = PanApiSession()
+
+def create_session(auth, metrics=None):
+    """Return an authenticated session for a single provider (tenant).
+
+    Unlike get_authenticated_session, errors are raised to the caller so that
+    modules working with several tenants can record a failure per tenant.
+    When given, metrics records every request of the session, labelled with
+    the tenant, and the time spent authenticating and waiting for the token
+    to become valid.
+    """
+    # the SDK is imported on first use, keeping it out of the startup of every module
+    from panapi import PanApiSession
+    from panapi.config import PanObject
+
+    if API_URL:
+        PanObject._base_url = API_URL.rstrip("/")
+
+    # oauthlib refuses plain HTTP token endpoints, which only a local stand-in uses
+    if TOKEN_URL.startswith("http://"):
+        os.environ.setdefault("OAUTHLIB_INSECURE_TRANSPORT", "1")
+
+    # create an authenticated session object
+    session = PanApiSession()
+    if metrics:
+        metrics.attach(session, auth["scope"], TOKEN_URL)
+
+    with metrics.phase("auth") if metrics else nullcontext():
         session.authenticate(
             client_id=auth["client_id"],
             client_secret=auth["client_secret"],
             scope=f'profile tsg_id:{auth["scope"]} email',
-            token_url="https://auth.apps.paloaltonetworks.com/am/oauth2/access_token",
+            token_url=TOKEN_URL,
         )
 
-        # jwt isn't a float, causing an error of the token not being valid yet
+    # jwt isn't a float, causing an error of the token not being valid yet
+    with metrics.phase("wait") if metrics else nullcontext():
         time.sleep(1.1)
 
-        return session
+    return session
+
+
+def get_authenticated_session(module):
+    metrics = None
+    if module.params.get("metrics"):
+        metrics = Metrics()
+        report_metrics(module, metrics)
+
+    try:
+        return create_session(module.params.get("provider"), metrics)
 
     except Exception as exception_error:
         module.fail_json(msg=to_native(exception_error), exception=format_exc())
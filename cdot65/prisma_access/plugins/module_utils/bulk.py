@@ -0,0 +1,319 @@
+"""
+Helpers for applying many objects, across one or many tenants, in a single module run.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+__metaclass__ = type
+
+# number of objects requested per page when listing a folder
+PAGE_SIZE = 200
+
+# keys whose values the API never returns in clear text
+SECRET_KEYS = ("key", "secret")
+
+# keys holding lists whose order the API does not preserve, compared as sets
+UNORDERED_KEYS = ("members", "static", "subnets", "tag")
+
+# serializes token refreshes between threads sharing a session
+REAUTHENTICATE_LOCK = threading.Lock()
+
+
+class RateLimiter:
+    """Token bucket limiting the number of API calls per second.
+
+    A rate of zero (or None) disables limiting. The limiter is thread safe, but
+    each tenant is expected to get its own instance so one busy tenant does not
+    slow down the others.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate or 0
+        self.capacity = burst or max(1, int(self.rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available."""
+        if not self.rate:
+            return
+
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated) * self.rate,
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                time.sleep((1 - self.tokens) / self.rate)
+
+
+def fan_out(func, items, max_workers):
+    """Call func on every item concurrently, returning results in input order."""
+    if not items:
+        return []
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(items)))
+    ) as executor:
+        return list(executor.map(func, items))
+
+
+def stream_fan_out(func, items, max_workers):
+    """Call func on every item of an iterable concurrently, yielding results in input order.
+
+    Items are consumed lazily and at most twice max_workers of them are in
+    flight at any time, so iterables of any length run in constant memory.
+    """
+    max_workers = max(1, max_workers)
+    pending = deque()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def strip_none(config):
+    """Return a copy of an Ansible suboption dictionary without unset keys."""
+    return {key: value for key, value in config.items() if value is not None}
+
+
+def send(
+    session,
+    method,
+    object_class,
+    folder,
+    payload=None,
+    object_id=None,
+    params=None,
+):
+    """Issue a single API call for an object type and return the response.
+
+    Unlike the SDK's methods, the response is returned instead of being stored
+    on the session, so one session can safely be shared between threads. A
+    folder of None is left out of the query, for tenant-wide endpoints.
+    """
+    with REAUTHENTICATE_LOCK:
+        if session.is_expired:
+            session.reauthenticate()
+
+    url = object_class._base_url + object_class._endpoint
+    if object_id:
+        url = f"{url}/{object_id}"
+
+    params = dict(params or {})
+    if folder is not None:
+        params["folder"] = folder
+
+    return session.request(
+        method,
+        url,
+        params=params,
+        json=payload,
+    )
+
+
+def iter_pages(session, object_class, folder, limiter=None):
+    """Yield the configuration of every object of a type within a folder, one page at a time.
+
+    Pages are requested as they are consumed, so a folder of any size is
+    walked holding a single page in memory.
+    """
+    offset = 0
+
+    while True:
+        if limiter:
+            limiter.acquire()
+
+        response = send(
+            session,
+            "GET",
+            object_class,
+            folder,
+            params={"limit": PAGE_SIZE, "offset": offset},
+        )
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Did not receive proper response: {response.text}"
+            )
+
+        result = response.json()
+        page = result.get("data", [])
+        if page:
+            yield page
+
+        offset += len(page)
+        if not page or offset >= result.get("total", offset):
+            return
+
+
+def list_objects(session, object_class, folder, limiter=None):
+    """Return every object of a type within a folder, following pagination.
+
+    The SDK's list() only returns the first page of results, which is not
+    enough once a folder holds more objects than the API's default limit.
+    """
+    return [
+        object_class(**config)
+        for page in iter_pages(session, object_class, folder, limiter)
+        for config in page
+    ]
+
+
+def differs(desired, current):
+    """Return True when a live object does not match the desired configuration.
+
+    Only the keys set in the desired configuration are compared, recursively,
+    so values the API fills in on its own are not seen as differences. Lists of
+    members, subnets and tags are compared regardless of order. Secrets are
+    never returned in clear text and are ignored.
+    """
+    live = dict(vars(current))
+    for key in ("folder", "id"):
+        live.pop(key, None)
+
+    desired = {
+        key: value
+        for key, value in desired.items()
+        if key not in ("folder", "id")
+    }
+    return _differs(desired, live)
+
+
+def _differs(desired, live):
+    for key, value in desired.items():
+        if value is None or key in SECRET_KEYS:
+            continue
+        if isinstance(value, dict) and isinstance(live.get(key), dict):
+            if _differs(value, live[key]):
+                return True
+        elif key in UNORDERED_KEYS and isinstance(value, list):
+            if sorted(value) != sorted(live.get(key) or []):
+                return True
+        elif live.get(key) != value:
+            return True
+    return False
+
+
+def plan_object(desired, current, state):
+    """Return the result applying an object would have, without calling the API, for check mode."""
+    result = {"name": desired["name"], "folder": desired["folder"]}
+    if state == "absent":
+        result["result"] = "absent" if current is None else "deleted"
+    elif current is None:
+        result["result"] = "created"
+    elif differs(desired, current):
+        result["result"] = "updated"
+    else:
+        result["result"] = "unchanged"
+    return result
+
+
+def apply_object(session, object_class, desired, current, state, limiter=None):
+    """Converge a single object and return a result dictionary describing the outcome."""
+    result = {"name": desired["name"], "folder": desired["folder"]}
+
+    if state == "absent":
+        if current is None:
+            result["result"] = "absent"
+            return result
+
+        operation, method, expected_code = "deleted", "DELETE", 200
+        payload, object_id = None, current.id
+    elif current is None:
+        operation, method, expected_code = "created", "POST", 201
+        payload, object_id = desired, None
+    elif differs(desired, current):
+        operation, method, expected_code = "updated", "PUT", 200
+        payload, object_id = desired, current.id
+    else:
+        result["result"] = "unchanged"
+        return result
+
+    if limiter:
+        limiter.acquire()
+
+    response = send(
+        session,
+        method,
+        object_class,
+        desired["folder"],
+        payload=payload,
+        object_id=object_id,
+    )
+
+    if response.status_code != expected_code:
+        result["result"] = "failed"
+        result["msg"] = f"Did not receive proper response: {response.text}"
+    else:
+        result["result"] = operation
+        if operation == "created":
+            result["id"] = response.json().get("id")
+
+    return result
+
+
+def reconcile(
+    session,
+    object_class,
+    desired_objects,
+    state,
+    limiter=None,
+    on_result=None,
+):
+    """Converge a list of objects of one type within a single tenant.
+
+    Each folder is listed once, and every desired object is compared against
+    that listing instead of listing the folder again per object. When given,
+    on_result is called with each desired object and its result as soon as
+    the object has been applied.
+    """
+    folders = {}
+    for desired in desired_objects:
+        folders.setdefault(desired["folder"], []).append(desired)
+
+    results = []
+    for folder, members in folders.items():
+        existing = {
+            each.name: each
+            for each in list_objects(session, object_class, folder, limiter)
+        }
+        for desired in members:
+            result = apply_object(
+                session,
+                object_class,
+                desired,
+                existing.get(desired["name"]),
+                state,
+                limiter,
+            )
+            if on_result:
+                on_result(desired, result)
+            results.append(result)
+
+    return results
+
+
+def summarize(results):
+    """Count object results by outcome."""
+    summary = {}
+    for each in results:
+        summary[each["result"]] = summary.get(each["result"], 0) + 1
+    return summary
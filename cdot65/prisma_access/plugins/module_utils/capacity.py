@@ -0,0 +1,193 @@
+"""
+Cached view of the bandwidth allocations and SPNs remote networks can be placed on.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import fcntl
+import json
+import os
+import tempfile
+import time
+
+from contextlib import contextmanager
+
+from .bulk import list_objects, send
+
+__metaclass__ = type
+
+# seconds a capacity snapshot is reused before it is fetched again
+CACHE_TTL = 300
+
+# directory on the controller holding one snapshot per tenant
+CACHE_DIR = os.path.join("~", ".ansible", "cache", "cdot65.prisma_access")
+
+
+def fetch_capacity(session, limiter=None):
+    """Fetch the locations, bandwidth allocations and remote networks of a tenant.
+
+    Returns a snapshot mapping every compute region to its aggregate region,
+    every aggregate region to its allocation, and every SPN to the number of
+    remote networks placed on it.
+    """
+    from panapi.config.network import (
+        BandwidthAllocation,
+        Location,
+        RemoteNetwork,
+    )
+
+    if limiter:
+        limiter.acquire()
+    response = send(session, "GET", Location, None)
+    if response.status_code != 200:
+        raise RuntimeError(f"Did not receive proper response: {response.text}")
+    locations = response.json()
+    if isinstance(locations, dict):
+        locations = locations.get("data", [])
+
+    allocations = {}
+    for each in list_objects(session, BandwidthAllocation, None, limiter):
+        allocations[each.name] = {
+            "allocated_bandwidth": getattr(each, "allocated_bandwidth", None),
+            "spn_name_list": list(getattr(each, "spn_name_list", None) or []),
+        }
+
+    spn_load = {}
+    for each in list_objects(
+        session, RemoteNetwork, "Remote Networks", limiter
+    ):
+        spn_name = getattr(each, "spn_name", None)
+        if spn_name:
+            spn_load[spn_name] = spn_load.get(spn_name, 0) + 1
+
+    return {
+        "fetched": time.time(),
+        "regions": {
+            each["value"]: each.get("aggregate_region") or each.get("region")
+            for each in locations
+            if each.get("value")
+        },
+        "allocations": allocations,
+        "spn_load": spn_load,
+    }
+
+
+class CapacityCache:
+    """Capacity snapshot of a tenant, kept on the controller for a limited time.
+
+    Every task of a play runs in its own process, so the snapshot is stored in
+    a file named after the tenant rather than in memory. The file is replaced
+    atomically, and a missing, unreadable or expired file is fetched again.
+    Writes hold an exclusive lock on a file next to it, so placements recorded
+    by concurrent forks are not lost.
+    """
+
+    def __init__(self, scope, ttl=CACHE_TTL, directory=CACHE_DIR):
+        self.ttl = ttl
+        self.path = os.path.join(
+            os.path.expanduser(directory), f"capacity-{scope}.json"
+        )
+
+    def read(self):
+        """Return the cached snapshot, or None when it is missing or expired."""
+        try:
+            with open(self.path, encoding="utf-8") as stream:
+                snapshot = json.load(stream)
+        except (OSError, ValueError):
+            return None
+        if time.time() - snapshot.get("fetched", 0) > self.ttl:
+            return None
+        return snapshot
+
+    @contextmanager
+    def locked(self):
+        """Hold an exclusive lock on the snapshot of the tenant."""
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        with open(f"{self.path}.lock", "a", encoding="utf-8") as stream:
+            fcntl.flock(stream, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(stream, fcntl.LOCK_UN)
+
+    def write(self, snapshot):
+        """Replace the cached snapshot."""
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=directory)
+        with os.fdopen(descriptor, "w", encoding="utf-8") as stream:
+            json.dump(snapshot, stream)
+        os.replace(temporary, self.path)
+
+    def get(self, session, limiter=None, refresh=False):
+        """Return the snapshot, fetching it when the cached one cannot be used."""
+        snapshot = None if refresh else self.read()
+        if snapshot is None:
+            snapshot = fetch_capacity(session, limiter)
+            with self.locked():
+                self.write(snapshot)
+        return snapshot
+
+    def check(self, session, region, spn_name=None, limiter=None):
+        """Return the snapshot and the placement error, or None.
+
+        A cached snapshot that rejects the placement is fetched again once,
+        so an allocation changed within the TTL does not fail the check.
+        """
+        snapshot = self.read()
+        if snapshot is not None:
+            error = check_placement(snapshot, region, spn_name)
+            if error is None:
+                return snapshot, None
+
+        snapshot = self.get(session, limiter, refresh=True)
+        return snapshot, check_placement(snapshot, region, spn_name)
+
+    def record_placement(self, snapshot, spn_name):
+        """Count a remote network created on an SPN, so later picks see it.
+
+        The count is added to the cached snapshot as it is once the lock is
+        held, which may include placements recorded by other forks since
+        this one read it.
+        """
+        with self.locked():
+            current = self.read() or snapshot
+            current["spn_load"][spn_name] = (
+                current["spn_load"].get(spn_name, 0) + 1
+            )
+            self.write(current)
+        snapshot["spn_load"] = current["spn_load"]
+
+
+def check_placement(snapshot, region, spn_name=None):
+    """Return an error message when a remote network cannot be placed, or None."""
+    if region not in snapshot["regions"]:
+        return f"Region {region} is not a Prisma Access location"
+
+    aggregate_region = snapshot["regions"][region]
+    allocation = snapshot["allocations"].get(aggregate_region)
+    if not allocation or not allocation["spn_name_list"]:
+        return f"No bandwidth is allocated to {aggregate_region}, the aggregate region of {region}"
+
+    if spn_name and spn_name not in allocation["spn_name_list"]:
+        return f"SPN {spn_name} is not allocated to {aggregate_region}; choose one of {', '.join(allocation['spn_name_list'])}"
+
+    return None
+
+
+def fewest_networks_spn(snapshot, region):
+    """Return the SPN of a region with the fewest remote networks, the first by name on a tie.
+
+    The API reports the bandwidth allocated to an aggregate region, shared by
+    all of its SPNs, but not the bandwidth used by each remote network, so the
+    SPNs are balanced on the number of remote networks placed on them.
+    """
+    allocation = snapshot["allocations"][snapshot["regions"][region]]
+    return min(
+        sorted(allocation["spn_name_list"]),
+        key=lambda spn_name: snapshot["spn_load"].get(spn_name, 0),
+    )
@@ -0,0 +1,234 @@
+"""
+Compiler of the tag filters of dynamic address groups, evaluated against a tag index of addresses.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import re
+
+__metaclass__ = type
+
+# quoted tags, parentheses, and bare words, which are operators or unquoted tags
+TOKEN = re.compile(
+    r"""\s*(?:(?P<quoted>'[^']*'|"[^"]*")|(?P<paren>[()])|(?P<word>[^\s()'"]+))"""
+)
+
+OPERATORS = ("and", "or", "not")
+
+
+def tokenize(expression):
+    """Return the tokens of a filter as (kind, value, offset) tuples, kind being tag, operator or a parenthesis."""
+    tokens = []
+    offset = 0
+    expression = expression.rstrip()
+    while offset < len(expression):
+        match = TOKEN.match(expression, offset)
+        if not match:
+            raise ValueError(
+                f"unexpected {expression[offset:].lstrip()[:1]!r} at offset {offset} of the filter"
+            )
+        start = match.start(match.lastgroup)
+        if match.group("quoted"):
+            tokens.append(("tag", match.group("quoted")[1:-1], start))
+        elif match.group("paren"):
+            tokens.append((match.group("paren"), None, start))
+        elif match.group("word").lower() in OPERATORS:
+            tokens.append(("operator", match.group("word").lower(), start))
+        else:
+            tokens.append(("tag", match.group("word"), start))
+        offset = match.end()
+    return tokens
+
+
+class DynamicFilter:
+    """Tag filter of a dynamic address group, such as C('web' and ('prod' or 'dr') and not 'retired').
+
+    The filter is parsed once, by recursive descent with not binding tighter
+    than and, and and tighter than or, into a tree of closures. Evaluating it
+    against a TagIndex combines the bitsets of the tags with integer and, or
+    and xor, so every object is matched at once rather than one at a time.
+    """
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.tags = set()
+        self.tokens = tokenize(expression)
+        self.position = 0
+        if not self.tokens:
+            raise ValueError("the filter is empty")
+
+        self.evaluator, self.text = self.parse_or()
+        if self.position < len(self.tokens):
+            kind, value, offset = self.tokens[self.position]
+            raise ValueError(
+                f"unexpected {value or kind!r} at offset {offset} of the filter"
+            )
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return (None, None, len(self.expression))
+
+    def parse_or(self):
+        evaluator, text = self.parse_and()
+        operands = [(evaluator, text)]
+        while self.peek()[:2] == ("operator", "or"):
+            self.position += 1
+            operands.append(self.parse_and())
+        if len(operands) == 1:
+            return evaluator, text
+
+        evaluators = [each for each, _text in operands]
+
+        def any_of(index):
+            result = 0
+            for each in evaluators:
+                result |= each(index)
+            return result
+
+        return any_of, " or ".join(text for _each, text in operands)
+
+    def parse_and(self):
+        evaluator, text = self.parse_not()
+        operands = [(evaluator, text)]
+        while self.peek()[:2] == ("operator", "and"):
+            self.position += 1
+            operands.append(self.parse_not())
+        if len(operands) == 1:
+            return evaluator, text
+
+        evaluators = [each for each, _text in operands]
+
+        def all_of(index):
+            result = evaluators[0](index)
+            for each in evaluators[1:]:
+                if not result:
+                    break
+                result &= each(index)
+            return result
+
+        return all_of, " and ".join(text for _each, text in operands)
+
+    def parse_not(self):
+        if self.peek()[:2] == ("operator", "not"):
+            self.position += 1
+            evaluator, text = self.parse_not()
+
+            def none_of(index):
+                return index.universe ^ evaluator(index)
+
+            return none_of, f"not {text}"
+        return self.parse_operand()
+
+    def parse_operand(self):
+        kind, value, offset = self.peek()
+        if kind == "(":
+            self.position += 1
+            evaluator, text = self.parse_or()
+            if self.peek()[0] != ")":
+                raise ValueError(
+                    f"missing ')' at offset {self.peek()[2]} of the filter"
+                )
+            self.position += 1
+            return evaluator, f"({text})"
+
+        if kind == "tag":
+            self.position += 1
+            self.tags.add(value)
+
+            def tagged(index):
+                return index.postings.get(value, 0)
+
+            return tagged, f"'{value}'"
+
+        if kind is None:
+            raise ValueError("the filter ends where a tag was expected")
+        raise ValueError(
+            f"expected a tag at offset {offset} of the filter, not {value or kind!r}"
+        )
+
+    def evaluate(self, index):
+        """Return the bitset of the objects of a TagIndex matching the filter."""
+        return self.evaluator(index)
+
+
+def bitset(positions):
+    """Return an integer with the bits of the given positions set."""
+    positions = list(positions)
+    if not positions:
+        return 0
+    bits = bytearray(max(positions) // 8 + 1)
+    for each in positions:
+        bits[each >> 3] |= 1 << (each & 7)
+    return int.from_bytes(bits, "little")
+
+
+class TagIndex:
+    """Posting lists of tags over a set of objects, each a bitset of the positions of the objects carrying the tag.
+
+    Only the objects carrying one of the tags a filter refers to get a bit of
+    their own. Every other object carries none of them, so a filter matches
+    either all or none of them, and they share the last bit. The index is
+    therefore as large as the posting lists rather than the tenant.
+    """
+
+    def __init__(self, tagged, size=None):
+        tagged = list(tagged)
+        self.keys = sorted(set(key for _tag, key in tagged))
+        self.positions = dict(
+            (key, position) for position, key in enumerate(self.keys)
+        )
+        self.size = len(self.keys) if size is None else size
+
+        # bit shared by the objects carrying none of the indexed tags
+        self.rest = self.size - len(self.keys)
+        self.rest_bit = 1 << len(self.keys) if self.rest else 0
+        self.universe = ((1 << len(self.keys)) - 1) | self.rest_bit
+
+        postings = {}
+        for tag, key in tagged:
+            postings.setdefault(tag, []).append(self.positions[key])
+        self.postings = dict(
+            (tag, bitset(each)) for tag, each in postings.items()
+        )
+
+    def __len__(self):
+        return self.size
+
+    def count(self, bits):
+        """Return the number of objects whose bits are set."""
+        matched = bin(bits).count("1")
+        if bits & self.rest_bit:
+            matched += self.rest - 1
+        return matched
+
+    def members(self, bits, limit=None, keys=None):
+        """Return the keys of the objects whose bits are set, in key order, at most limit of them.
+
+        When the objects carrying none of the indexed tags match, their keys
+        are taken from keys, an iterable of the keys of every object in key
+        order, read no further than limit objects.
+        """
+        members = []
+        if bits & self.rest_bit:
+            if keys is None:
+                raise ValueError(
+                    "the keys of every object are needed to list the objects without indexed tags"
+                )
+            for key in keys:
+                if limit is not None and len(members) >= limit:
+                    break
+                position = self.positions.get(key)
+                if position is None or bits >> position & 1:
+                    members.append(key)
+            return members
+
+        digits = bin(bits)[:1:-1]
+        position = digits.find("1")
+        while position != -1 and (limit is None or len(members) < limit):
+            members.append(self.keys[position])
+            position = digits.find("1", position + 1)
+        return members
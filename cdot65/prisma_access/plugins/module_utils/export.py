@@ -0,0 +1,124 @@
+"""
+Streaming export of the configuration of a tenant to a JSONL file on the controller.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import gzip
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .bulk import iter_pages
+from .fingerprint import canonicalize
+from .mirror import object_class
+
+__metaclass__ = type
+
+# marks the end of a listing in the queue of pages
+DONE = object()
+
+
+def open_export(path, compress=False):
+    """Open the temporary file an export is written to, compressed with gzip if requested.
+
+    The export is only moved to its path once complete, by finish_export, so a
+    failed run never replaces the previous export.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if compress:
+        # level 6 compresses about as well as the default 9, several times faster
+        return gzip.open(
+            f"{path}.part", "wt", encoding="utf-8", compresslevel=6
+        )
+    return open(f"{path}.part", "w", encoding="utf-8")
+
+
+def finish_export(path):
+    """Move a complete export to its path, replacing the previous one."""
+    os.replace(f"{path}.part", path)
+
+
+def abort_export(path):
+    """Remove the temporary file of a failed export."""
+    try:
+        os.remove(f"{path}.part")
+    except OSError:
+        pass
+
+
+def record(object_type, config):
+    """Return the line of an object in an export: its canonical configuration, with its type under object_type."""
+    return canonicalize(dict(config, object_type=object_type)) + "\n"
+
+
+def export_listings(session, listings, stream, limiter=None, max_workers=8):
+    """List every (object type, folder) pair concurrently and write its objects to a stream, one per line.
+
+    Workers hand pages over to the calling thread, which alone writes to the
+    stream, through a queue holding at most twice max_workers pages, so
+    memory stays constant whatever the size of the tenant. Objects of
+    different listings are interleaved in the file. Returns the number of
+    objects written per listing, in the order of the listings.
+    """
+    max_workers = max(1, min(max_workers, len(listings) or 1))
+    pages = queue.Queue(maxsize=max_workers * 2)
+    stop = threading.Event()
+
+    def hand_over(item):
+        # give up once the writer stopped, rather than blocking on a full queue forever
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def walk(index):
+        object_type, folder = listings[index]
+        try:
+            for page in iter_pages(
+                session, object_class(object_type), folder, limiter
+            ):
+                if stop.is_set():
+                    return
+                hand_over((index, page))
+        except Exception as exception_error:
+            hand_over((index, exception_error))
+        else:
+            hand_over((index, DONE))
+
+    counts = [0] * len(listings)
+    remaining = len(listings)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for index in range(len(listings)):
+            executor.submit(walk, index)
+
+        try:
+            while remaining:
+                index, page = pages.get()
+                if page is DONE:
+                    remaining -= 1
+                    continue
+                if isinstance(page, Exception):
+                    object_type, folder = listings[index]
+                    raise RuntimeError(
+                        f"listing {object_type} objects of {folder} failed: {page}"
+                    ) from page
+
+                object_type = listings[index][0]
+                stream.write(
+                    "".join(record(object_type, config) for config in page)
+                )
+                counts[index] += len(page)
+        finally:
+            stop.set()
+
+    return counts
@@ -0,0 +1,29 @@
+"""
+Helpers for producing stable fingerprints of object configurations.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import hashlib
+import json
+
+__metaclass__ = type
+
+
+def canonicalize(config):
+    """Return a canonical JSON representation of a configuration dictionary.
+
+    Keys are sorted and whitespace removed so that equivalent dictionaries
+    always serialize, and therefore hash, identically.
+    """
+    return json.dumps(
+        config, sort_keys=True, separators=(",", ":"), default=str
+    )
+
+
+def fingerprint(config):
+    """Return the SHA-256 hex digest of a configuration dictionary."""
+    return hashlib.sha256(canonicalize(config).encode("utf-8")).hexdigest()
@@ -0,0 +1,155 @@
+"""
+Local store of the desired state of objects and the remote state last confirmed for it.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import os
+import sqlite3
+import time
+
+from .bulk import send
+from .fingerprint import fingerprint
+
+__metaclass__ = type
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    tenant TEXT NOT NULL,
+    type TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    state TEXT NOT NULL,
+    desired TEXT NOT NULL,
+    id TEXT,
+    remote TEXT,
+    confirmed REAL NOT NULL,
+    PRIMARY KEY (tenant, type, folder, name)
+) WITHOUT ROWID;
+"""
+
+
+def read_remote(session, object_class, folder, object_id=None, name=None):
+    """Return the configuration of a single object, read by id or else by name, or None if it does not exist.
+
+    A single object is requested, however many the folder holds, which makes
+    this the cheap check of whether an object changed since it was confirmed.
+    """
+    params = None if object_id else {"name": name}
+    response = send(
+        session,
+        "GET",
+        object_class,
+        folder,
+        object_id=object_id,
+        params=params,
+    )
+    session.response = response
+    if response.status_code == 404:
+        return None
+    if response.status_code != 200:
+        raise RuntimeError(f"Did not receive proper response: {response.text}")
+
+    body = response.json()
+    if object_id:
+        return body
+    return next(iter(body.get("data") or []), None)
+
+
+class FingerprintStore:
+    """Fingerprints of the desired state of objects, with the remote state confirmed to match it.
+
+    An entry is written once a module run brought an object to its desired
+    state, recording the fingerprint of the input, the id of the object and
+    the fingerprint of the configuration the API returned, or no id for
+    objects confirmed absent. A later run with the same input only has to
+    read that one object back, by id or by name, and finds nothing to do if
+    its fingerprint did not change; anything else goes through the usual
+    lookup. The database is in WAL mode with a busy timeout, so the forks of
+    a play can share a store.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.connection = sqlite3.connect(self.path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    @staticmethod
+    def key(tenant, object_type, state, desired):
+        """Return the identity of an object within the store, with the state and fingerprint of its input."""
+        return (
+            str(tenant),
+            object_type,
+            desired["folder"],
+            desired["name"],
+            state,
+            fingerprint(desired),
+        )
+
+    def lookup(self, key):
+        """Return the id and remote fingerprint confirmed for the same input, or None."""
+        tenant, object_type, folder, name, state, digest = key
+        row = self.connection.execute(
+            "SELECT state, desired, id, remote FROM fingerprints "
+            "WHERE tenant = ? AND type = ? AND folder = ? AND name = ?",
+            (tenant, object_type, folder, name),
+        ).fetchone()
+        if not row or row[0] != state or row[1] != digest:
+            return None
+        return row[2], row[3]
+
+    def verify(self, key, session, object_class):
+        """Return whether the input and the object are as last confirmed, with the configuration the API returned.
+
+        Objects confirmed absent are verified by name and come back with a
+        configuration of None while they remain absent.
+        """
+        known = self.lookup(key)
+        if known is None:
+            return False, None
+        object_id, remote = known
+
+        folder, name = key[2], key[3]
+        if object_id:
+            config = read_remote(session, object_class, folder, object_id)
+        else:
+            config = read_remote(session, object_class, folder, name=name)
+        if config is None:
+            return remote is None, None
+        return remote is not None and fingerprint(config) == remote, config
+
+    def confirm(self, key, config=None):
+        """Record that an object matches its input, as the configuration the API returned or absent when None."""
+        tenant, object_type, folder, name, state, digest = key
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO fingerprints "
+                "(tenant, type, folder, name, state, desired, id, remote, confirmed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    tenant,
+                    object_type,
+                    folder,
+                    name,
+                    state,
+                    digest,
+                    config.get("id") if config else None,
+                    fingerprint(config) if config else None,
+                    time.time(),
+                ),
+            )
@@ -0,0 +1,98 @@
+"""
+Append-only checkpoint journal used to resume interrupted bulk runs.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+import threading
+import time
+
+from .fingerprint import fingerprint
+
+__metaclass__ = type
+
+# results that prove an operation reached the desired state
+CONFIRMED_RESULTS = ("absent", "created", "deleted", "unchanged", "updated")
+
+
+class Journal:
+    """Checkpoint journal written as one JSON document per line.
+
+    Every applied operation is appended together with the fingerprint of the
+    desired configuration. When a run is resumed, operations whose tenant,
+    type, folder, name, state and fingerprint match a confirmed entry are
+    skipped; anything else, including objects whose input changed since the
+    journal was written, is verified against the API as usual.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.confirmed = set()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(tenant, object_type, state, desired):
+        """Return the identity of an operation within the journal."""
+        return (
+            tenant,
+            object_type,
+            desired["folder"],
+            desired["name"],
+            state,
+            fingerprint(desired),
+        )
+
+    def load(self):
+        """Read the confirmed operations of a previous run, if any."""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # the last line may be incomplete if the run was killed
+                    continue
+                if entry.get("result") in CONFIRMED_RESULTS:
+                    self.confirmed.add(
+                        (
+                            entry["tenant"],
+                            entry["type"],
+                            entry["folder"],
+                            entry["name"],
+                            entry["operation"],
+                            entry["fingerprint"],
+                        )
+                    )
+
+    def is_confirmed(self, key):
+        """Return True if an operation was confirmed by a previous run."""
+        return key in self.confirmed
+
+    def record(self, key, result):
+        """Append the outcome of an operation to the journal."""
+        tenant, object_type, folder, name, operation, digest = key
+        entry = {
+            "ts": time.time(),
+            "tenant": tenant,
+            "type": object_type,
+            "folder": folder,
+            "name": name,
+            "operation": operation,
+            "fingerprint": digest,
+            "result": result,
+        }
+
+        with self.lock:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            with open(self.path, "a", encoding="utf-8") as journal:
+                journal.write(json.dumps(entry, sort_keys=True) + "\n")
+                journal.flush()
@@ -0,0 +1,28 @@
+"""
+Helpers for deciding how modules look up existing objects.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+# fragments of the API's error body when an object with the same name exists
+NAME_CONFLICT_MARKERS = (
+    "name not unique",
+    "object already exists",
+    "already exists",
+)
+
+
+def is_name_conflict(response):
+    """Return True if a create was rejected because the name is already in use."""
+    if response.status_code == 409:
+        return True
+    if response.status_code != 400:
+        return False
+
+    text = response.text.lower()
+    return any(marker in text for marker in NAME_CONFLICT_MARKERS)
@@ -0,0 +1,157 @@
+"""
+Helpers for changing the static members of address groups, and for sharding large ones.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import hashlib
+import re
+
+__metaclass__ = type
+
+
+def merge_members(members, members_add=None, members_remove=None):
+    """Return members with members_add appended and members_remove left out, without duplicates.
+
+    The existing order is kept, so applying the same additions and removals
+    twice returns the same list.
+    """
+    removed = set(members_remove or [])
+    merged = []
+    seen = set()
+    for member in list(members or []) + list(members_add or []):
+        if member not in removed and member not in seen:
+            seen.add(member)
+            merged.append(member)
+    return merged
+
+
+def member_changes(members, merged):
+    """Return the members added to and removed from a group by a merge."""
+    before = set(members or [])
+    after = set(merged)
+    return (
+        [member for member in merged if member not in before],
+        [member for member in members or [] if member not in after],
+    )
+
+
+def jump_hash(key, buckets):
+    """Return the bucket of an integer key among a number of buckets, by jump consistent hashing.
+
+    Going from n to n + 1 buckets only moves the keys landing in the new
+    bucket, about 1 / (n + 1) of them; every other key keeps its bucket.
+    """
+    bucket, jump = -1, 0
+    while jump < buckets:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        jump = int((bucket + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return bucket
+
+
+def member_key(member):
+    """Return the integer a member is hashed by, the same on every run and every host."""
+    return int.from_bytes(
+        hashlib.sha256(member.encode("utf-8")).digest()[:8], "big"
+    )
+
+
+def shard_name(name, level, index):
+    """Return the name of a child group: leaves at level 0, the groups holding them above."""
+    if level == 0:
+        return f"{name}-shard-{index}"
+    return f"{name}-shard-l{level}-{index}"
+
+
+def shard_level(name, candidate):
+    """Return the level of a child group of a sharded group, 0 for leaves, or None if the group is not one."""
+    match = re.match(rf"{re.escape(name)}-shard-(?:l(\d+)-)?\d+\Z", candidate)
+    if not match:
+        return None
+    return int(match.group(1) or 0)
+
+
+def leaf_count(name, names):
+    """Return the number of leaves a sharded group has, from the names of the groups of its folder.
+
+    Leaves left empty by the hash are not created, so the count is taken
+    from the highest leaf index rather than the number of leaves.
+    """
+    pattern = re.compile(rf"{re.escape(name)}-shard-(\d+)\Z")
+    indexes = [
+        int(match.group(1))
+        for match in (pattern.match(each) for each in names)
+        if match
+    ]
+    return max(indexes) + 1 if indexes else 0
+
+
+def assign_leaves(members, leaves):
+    """Return the members of every leaf, sorted, assigning each member to a leaf by jump consistent hashing."""
+    buckets = [[] for _ in range(leaves)]
+    for member in members:
+        buckets[jump_hash(member_key(member), leaves)].append(member)
+    return [sorted(each) for each in buckets]
+
+
+def plan_shards(name, members, shard_size, live_leaves=0):
+    """Return the child groups of a group holding more members than shard_size, and the members of the group.
+
+    Members are spread over leaves by jump consistent hashing, so a member
+    stays in its leaf as long as the number of leaves does not change, and
+    adding or removing a member only changes its own leaf. The number of
+    leaves of the live group is kept while no leaf overflows and they are at
+    least a quarter full; otherwise the leaves are sized to be about half
+    full, leaving room to grow before they have to change again. Leaves are
+    then dealt out over as few groups as hold them, level after level, into a
+    balanced tree whose top level becomes the members of the group.
+
+    Child groups are returned as levels, bottom-up, each a list of (name,
+    members) pairs, so the groups of a level only hold groups of the levels
+    before it. Leaves the hash leaves empty are left out. A group with no
+    more members than shard_size has no child groups and holds its members
+    directly.
+    """
+    if shard_size < 2:
+        raise ValueError("groups must hold at least 2 members to be sharded")
+    members = merge_members(members)
+    if len(members) <= shard_size:
+        return [], members
+
+    leaves = live_leaves
+    buckets = assign_leaves(members, leaves) if leaves > 1 else None
+    if (
+        not buckets
+        or max(len(each) for each in buckets) > shard_size
+        or len(members) < leaves * shard_size // 4
+    ):
+        leaves = max(2, -(-len(members) * 2 // shard_size))
+        buckets = assign_leaves(members, leaves)
+        while max(len(each) for each in buckets) > shard_size:
+            leaves += 1
+            buckets = assign_leaves(members, leaves)
+
+    levels = []
+    level = [
+        (shard_name(name, 0, index), bucket)
+        for index, bucket in enumerate(buckets)
+        if bucket
+    ]
+    depth = 0
+    while len(level) > shard_size:
+        levels.append(level)
+        depth += 1
+        parents = -(-len(level) // shard_size)
+        level = [
+            (
+                shard_name(name, depth, index),
+                [each for each, _members in level[index::parents]],
+            )
+            for index in range(parents)
+        ]
+    levels.append(level)
+    return levels, [each for each, _members in level]
@@ -0,0 +1,140 @@
+"""
+Timings and call counts of the API requests made by a module run.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+__metaclass__ = type
+
+# phase a request belongs to, by method
+PHASES = {
+    "GET": "list",
+    "DELETE": "write",
+    "PATCH": "write",
+    "POST": "write",
+    "PUT": "write",
+}
+
+# path segments identifying a single object, replaced so requests group by endpoint
+OBJECT_ID = re.compile(r"^([0-9a-f]{8}-[0-9a-f-]{27}|[0-9]+)$", re.IGNORECASE)
+
+
+def endpoint(url):
+    """Return the path of a request URL, with object ids replaced by {id}."""
+    return "/".join(
+        "{id}" if OBJECT_ID.match(segment) else segment
+        for segment in urlsplit(url).path.split("/")
+    )
+
+
+class Metrics:
+    """Records every API request of a module run, and the time spent per phase.
+
+    Requests are recorded by a requests response hook, so calls made by the
+    SDK and by the collection's own helpers are both seen, from any thread.
+    Authentication is timed as a whole, as it also covers fetching the JWKS.
+    The fixed wait for the token to become valid is reported apart, as the
+    wait phase, so it does not hide the time of the token exchange.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = []
+        self.phases = dict(
+            (phase, {"calls": 0, "ms": 0.0})
+            for phase in ("auth", "list", "wait", "write")
+        )
+        self.timed = set()
+
+    def attach(self, session, tenant=None, token_url=None):
+        """Record the requests of a session, labelled with its tenant."""
+
+        def hook(response, *args, **kwargs):
+            request = response.request
+            url = request.url.split("?")[0]
+            phase = (
+                "auth"
+                if url == token_url
+                else PHASES.get(request.method, "write")
+            )
+            record = {
+                "method": request.method,
+                "endpoint": endpoint(url),
+                "status": response.status_code,
+                "bytes": len(response.content or b""),
+                "ms": round(response.elapsed.total_seconds() * 1000, 3),
+                "phase": phase,
+            }
+            if tenant is not None:
+                record["tenant"] = tenant
+
+            # attempts urllib3 retried on its own before this response
+            retries = getattr(
+                getattr(response.raw, "retries", None), "history", None
+            )
+            if retries:
+                record["retries"] = len(retries)
+
+            with self.lock:
+                self.requests.append(record)
+                self.phases[phase]["calls"] += 1
+                # the token requests of a timed authentication are part of its total already
+                if not (
+                    phase == "auth" and threading.get_ident() in self.timed
+                ):
+                    self.phases[phase]["ms"] += record["ms"]
+            return response
+
+        session.hooks["response"].append(hook)
+
+    @contextmanager
+    def phase(self, name):
+        """Add the wall-clock time of a block to the total of a phase."""
+        started = time.monotonic()
+        with self.lock:
+            self.timed.add(threading.get_ident())
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.timed.discard(threading.get_ident())
+                self.phases[name]["ms"] += (time.monotonic() - started) * 1000
+
+    def summary(self):
+        """Return the recorded requests and the totals per phase."""
+        with self.lock:
+            return {
+                "calls": len(self.requests),
+                "bytes": sum(each["bytes"] for each in self.requests),
+                "phases": dict(
+                    (
+                        phase,
+                        {
+                            "calls": totals["calls"],
+                            "ms": round(totals["ms"], 3),
+                        },
+                    )
+                    for phase, totals in self.phases.items()
+                ),
+                "requests": list(self.requests),
+            }
+
+
+def report_metrics(module, metrics):
+    """Return the metrics under the metrics key of the module's result, whether it exits or fails."""
+    for name in ("exit_json", "fail_json"):
+
+        def wrapper(*args, _method=getattr(module, name), **kwargs):
+            kwargs["metrics"] = metrics.summary()
+            return _method(*args, **kwargs)
+
+        setattr(module, name, wrapper)
@@ -0,0 +1,353 @@
+"""
+Local SQLite mirror of the configuration of a tenant.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import hashlib
+import importlib
+import json
+import os
+import sqlite3
+import time
+
+from .fingerprint import canonicalize
+
+__metaclass__ = type
+
+# directory on the controller holding one mirror per tenant
+MIRROR_DIR = os.path.join("~", ".ansible", "cache", "cdot65.prisma_access")
+
+# folders listed by default, per kind of object
+OBJECT_FOLDERS = (
+    "Shared",
+    "Mobile Users",
+    "Remote Networks",
+    "Service Connections",
+)
+TUNNEL_FOLDERS = ("Remote Networks", "Service Connections")
+
+# object types mirrored, with the SDK module and class, and the folders listed by default
+MIRROR_TYPES = {
+    "address": ("objects", "Address", OBJECT_FOLDERS),
+    "address_group": ("objects", "AddressGroup", OBJECT_FOLDERS),
+    "tag": ("objects", "Tag", OBJECT_FOLDERS),
+    "ike_gateway": ("network", "IKEGateway", TUNNEL_FOLDERS),
+    "ipsec_tunnel": ("network", "IPSecTunnel", TUNNEL_FOLDERS),
+    "remote_network": ("network", "RemoteNetwork", ("Remote Networks",)),
+    "service_connection": (
+        "network",
+        "ServiceConnection",
+        ("Service Connections",),
+    ),
+}
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    type TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    id TEXT,
+    fingerprint TEXT NOT NULL,
+    config TEXT NOT NULL,
+    PRIMARY KEY (type, folder, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS objects_name ON objects (name, type);
+CREATE INDEX IF NOT EXISTS objects_folder ON objects (folder, type);
+
+CREATE TABLE IF NOT EXISTS tags (
+    tag TEXT NOT NULL,
+    type TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (tag, type, folder, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_object ON tags (type, folder, name);
+
+CREATE TABLE IF NOT EXISTS listings (
+    type TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    synced REAL NOT NULL,
+    objects INTEGER NOT NULL,
+    PRIMARY KEY (type, folder)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+
+def mirror_path(scope, path=None):
+    """Return the path of the mirror of a tenant, the default one unless a path is given."""
+    if not path:
+        path = os.path.join(MIRROR_DIR, f"mirror-{scope}.sqlite")
+    return os.path.expanduser(path)
+
+
+def object_class(object_type):
+    """Return the SDK class of a mirrored object type, importing the SDK on first use."""
+    module, name, _folders = MIRROR_TYPES[object_type]
+    return getattr(importlib.import_module(f"panapi.config.{module}"), name)
+
+
+class Mirror:
+    """Objects of a tenant, keyed by (type, folder, name), with their tags indexed.
+
+    Every listing of an object type in a folder is applied as a whole: the
+    fingerprint of each object is compared to the mirrored one, so only the
+    objects added, changed or removed since the previous sync are written.
+    The database is in WAL mode, so reads are never blocked by a sync.
+    """
+
+    def __init__(self, path, create=False):
+        if not create and not os.path.exists(path):
+            raise FileNotFoundError(
+                f"No mirror at {path}; run mirror_sync first"
+            )
+        if create:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=30)
+        if create:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def claim(self, tenant):
+        """Record the tenant of a new mirror, refusing a mirror of another tenant."""
+        row = self.connection.execute(
+            "SELECT value FROM metadata WHERE key = 'tenant'"
+        ).fetchone()
+        if row and row[0] != str(tenant):
+            raise ValueError(
+                f"{self.path} mirrors tenant {row[0]}, not {tenant}"
+            )
+        if not row:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT INTO metadata (key, value) VALUES ('tenant', ?)",
+                    (str(tenant),),
+                )
+
+    def analyze(self):
+        """Refresh the statistics the query planner uses to pick the name, folder and tag indexes."""
+        self.connection.execute("ANALYZE")
+        self.connection.commit()
+
+    def synced(self, object_type, folder):
+        """Return the time a listing was last synced, or None."""
+        row = self.connection.execute(
+            "SELECT synced FROM listings WHERE type = ? AND folder = ?",
+            (object_type, folder),
+        ).fetchone()
+        return row[0] if row else None
+
+    def apply(self, object_type, folder, configs, check_mode=False):
+        """Bring a listing in line with the objects the API returned, and return the counts of what changed."""
+        cursor = self.connection.cursor()
+        current = dict(
+            cursor.execute(
+                "SELECT name, fingerprint FROM objects WHERE type = ? AND folder = ?",
+                (object_type, folder),
+            )
+        )
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        try:
+            for config in configs:
+                text = canonicalize(config)
+                digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                name = config["name"]
+
+                previous = current.pop(name, None)
+                if previous == digest:
+                    counts["unchanged"] += 1
+                    continue
+                counts["added" if previous is None else "updated"] += 1
+
+                cursor.execute(
+                    "INSERT OR REPLACE INTO objects (type, folder, name, id, fingerprint, config) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        object_type,
+                        folder,
+                        name,
+                        config.get("id"),
+                        digest,
+                        text,
+                    ),
+                )
+                cursor.execute(
+                    "DELETE FROM tags WHERE type = ? AND folder = ? AND name = ?",
+                    (object_type, folder, name),
+                )
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO tags (tag, type, folder, name) VALUES (?, ?, ?, ?)",
+                    [
+                        (tag, object_type, folder, name)
+                        for tag in config.get("tag") or []
+                    ],
+                )
+
+            # what the listing no longer returns was deleted from the tenant
+            for name in current:
+                counts["removed"] += 1
+                for table in ("objects", "tags"):
+                    cursor.execute(
+                        f"DELETE FROM {table} WHERE type = ? AND folder = ? AND name = ?",
+                        (object_type, folder, name),
+                    )
+
+            cursor.execute(
+                "INSERT OR REPLACE INTO listings (type, folder, synced, objects) VALUES (?, ?, ?, ?)",
+                (
+                    object_type,
+                    folder,
+                    time.time(),
+                    counts["added"] + counts["updated"] + counts["unchanged"],
+                ),
+            )
+        except BaseException:
+            self.connection.rollback()
+            raise
+
+        if check_mode:
+            self.connection.rollback()
+        else:
+            self.connection.commit()
+        return counts
+
+    def query(
+        self,
+        object_type=None,
+        names=None,
+        folder=None,
+        tag=None,
+        name_pattern=None,
+    ):
+        """Return the mirrored objects matching every filter given, as configuration dictionaries.
+
+        Each object also carries its type under object_type. The name pattern
+        is a glob, matched case-sensitively.
+        """
+        clauses = []
+        params = []
+        if object_type:
+            clauses.append("objects.type = ?")
+            params.append(object_type)
+        if names:
+            clauses.append(
+                f"objects.name IN ({', '.join('?' for _ in names)})"
+            )
+            params.extend(names)
+        if folder:
+            clauses.append("objects.folder = ?")
+            params.append(folder)
+        if name_pattern:
+            clauses.append("objects.name GLOB ?")
+            params.append(name_pattern)
+
+        sql = "SELECT objects.type, objects.config FROM objects"
+        if tag:
+            # joined from the tag index, so only the objects carrying the tag are read
+            sql += (
+                " JOIN tags ON tags.type = objects.type AND tags.folder = objects.folder"
+                " AND tags.name = objects.name"
+            )
+            clauses.append("tags.tag = ?")
+            params.append(tag)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY objects.type, objects.folder, objects.name"
+
+        return [
+            dict(json.loads(config), object_type=each_type)
+            for each_type, config in self.connection.execute(sql, params)
+        ]
+
+    def objects(self, object_types=None):
+        """Yield the type, folder, name and canonical configuration of every mirrored object, in key order.
+
+        The rows are read in the order of the primary key, so the objects are
+        streamed sorted without an extra sort.
+        """
+        sql = "SELECT type, folder, name, config FROM objects"
+        params = list(object_types or [])
+        if params:
+            sql += f" WHERE type IN ({', '.join('?' for _ in params)})"
+        yield from self.connection.execute(
+            sql + " ORDER BY type, folder, name", params
+        )
+
+    def keys(self, object_type, folders=None):
+        """Yield the folder and name of every mirrored object of a type, in key order."""
+        sql = "SELECT folder, name FROM objects WHERE type = ?"
+        params = [object_type]
+        if folders:
+            sql += f" AND folder IN ({', '.join('?' for _ in folders)})"
+            params.extend(folders)
+        yield from self.connection.execute(
+            sql + " ORDER BY folder, name", params
+        )
+
+    def count(self, object_type, folders=None):
+        """Return the number of mirrored objects of a type."""
+        sql = "SELECT COUNT(*) FROM objects WHERE type = ?"
+        params = [object_type]
+        if folders:
+            sql += f" AND folder IN ({', '.join('?' for _ in folders)})"
+            params.extend(folders)
+        return self.connection.execute(sql, params).fetchone()[0]
+
+    def tagged(self, object_type, tags, folders=None):
+        """Yield every tag given with the folder and name of each mirrored object of a type carrying it."""
+        tags = list(tags)
+        if not tags:
+            return
+        sql = (
+            "SELECT tag, folder, name FROM tags WHERE type = ?"
+            f" AND tag IN ({', '.join('?' for _ in tags)})"
+        )
+        params = [object_type] + tags
+        if folders:
+            sql += f" AND folder IN ({', '.join('?' for _ in folders)})"
+            params.extend(folders)
+        for tag, folder, name in self.connection.execute(sql, params):
+            yield tag, (folder, name)
+
+    def listings(self, object_type=None):
+        """Return the time every listing was last synced and the number of objects it holds."""
+        sql = "SELECT type, folder, synced, objects FROM listings"
+        params = []
+        if object_type:
+            sql += " WHERE type = ?"
+            params.append(object_type)
+        return [
+            {
+                "type": each_type,
+                "folder": folder,
+                "synced": synced,
+                "objects": objects,
+            }
+            for each_type, folder, synced, objects in self.connection.execute(
+                sql + " ORDER BY type, folder", params
+            )
+        ]
@@ -0,0 +1,189 @@
+"""
+Builders turning module parameters into IKE gateway, IPsec tunnel and connection configurations.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from ipaddress import ip_network
+
+__metaclass__ = type
+
+
+def canonical_subnets(subnets):
+    """Return subnets in canonical notation, without duplicates, in their original order.
+
+    Equivalent notations, such as 10.1.0.1/24 and 10.1.0.0/24 or an expanded
+    and a compressed IPv6 prefix, are reduced to the same string so they do
+    not show up as changes. Raises ValueError on an invalid prefix.
+    """
+    canonical = []
+    for subnet in subnets or []:
+        try:
+            prefix = str(ip_network(subnet.strip(), strict=False))
+        except ValueError:
+            raise ValueError(f"Invalid subnet {subnet}")
+        if prefix not in canonical:
+            canonical.append(prefix)
+    return canonical
+
+
+def merge_subnets(subnets, subnets_add=None, subnets_remove=None):
+    """Return subnets with subnets_add appended and subnets_remove left out.
+
+    The existing order is kept, so applying the same additions and removals
+    twice returns the same list.
+    """
+    removed = canonical_subnets(subnets_remove)
+    return [
+        subnet
+        for subnet in canonical_subnets(
+            list(subnets or []) + list(subnets_add or [])
+        )
+        if subnet not in removed
+    ]
+
+
+def ike_gateway_config(params):
+    """Return the configuration of an IKE gateway.
+
+    Raises ValueError when the authentication method or peer address is not
+    specified.
+    """
+    # `authentication`, `peer_address`, and `protocol_common` are generated below
+    ike_gateway = {
+        "name": params["name"],
+        "folder": params["folder"],
+        "local_address": {"interface": "vlan"},
+        "peer_id": params["peer_id"],
+        "protocol": params["protocol"],
+        "authentication": {},
+        "peer_address": {},
+        "protocol_common": {},
+    }
+
+    # update the configuration with the selected authentication schema
+    authentication = params["authentication"]
+
+    if authentication["pre_shared_key"]:
+        ike_gateway["authentication"]["pre_shared_key"] = {
+            "key": authentication["pre_shared_key"]
+        }
+    elif authentication["certificate"]:
+        ike_gateway["authentication"]["certificate"] = authentication[
+            "certificate"
+        ]
+    else:
+        raise ValueError("Authentication method not specified")
+
+    # update the configuration with the selected peer_address
+    peer_address = params["peer_address"]
+    if peer_address["ip"]:
+        ike_gateway["peer_address"]["ip"] = peer_address["ip"]
+    elif peer_address["fqdn"] or peer_address["dynamic"]:
+        ike_gateway["peer_address"]["dynamic"] = {}
+    else:
+        raise ValueError("Peer address not specified")
+
+    if params["protocol_common"]:
+        # if protocol_common parameters are specified, use them to update the ike_gateway dictionary
+        common = params["protocol_common"]
+        if common["nat_traversal"]:
+            ike_gateway["protocol_common"]["nat_traversal"] = {
+                "enable": common["nat_traversal"]["enable"]
+            }
+        if common["fragmentation"]:
+            ike_gateway["protocol_common"]["fragmentation"] = {
+                "enable": common["fragmentation"]["enable"]
+            }
+    else:
+        # if no protocol_common parameters are specified, use default values
+        ike_gateway["protocol_common"] = {
+            "nat_traversal": {"enable": True},
+            "fragmentation": {"enable": False},
+        }
+
+    return ike_gateway
+
+
+def ipsec_tunnel_config(params):
+    """Return the configuration of an IPsec tunnel."""
+    return {
+        "name": params["name"],
+        "folder": params["folder"],
+        # "tunnel_interface": params["tunnel_interface"],
+        "auto_key": params["auto_key"],
+        "anti_replay": params["anti_replay"],
+        "tunnel_monitor": params["tunnel_monitor"],
+    }
+
+
+def remote_network_config(params):
+    """Return the configuration of a remote network.
+
+    Raises ValueError on an invalid subnet.
+    """
+    remote_network = {
+        "name": params["name"],
+        "folder": params["folder"],
+        "license_type": params["license_type"],
+        "protocol": params["protocol"],
+        "region": params["region"],
+    }
+
+    # optional parameters are only added if they are declared in the playbook
+    for key in (
+        "ecmp_load_balancing",
+        "ecmp_tunnels",
+        "ipsec_tunnel",
+        "secondary_ipsec_tunnel",
+        "spn_name",
+    ):
+        if params[key]:
+            remote_network[key] = params[key]
+
+    subnets = merge_subnets(
+        params["subnets"],
+        params.get("subnets_add"),
+        params.get("subnets_remove"),
+    )
+    if subnets:
+        remote_network["subnets"] = subnets
+
+    return remote_network
+
+
+def service_connection_config(params):
+    """Return the configuration of a service connection.
+
+    Raises ValueError on an invalid subnet.
+    """
+    service_connection = {
+        "name": params["name"],
+        "folder": params["folder"],
+        "ipsec_tunnel": params["ipsec_tunnel"],
+        "region": params["region"],
+        "subnets": merge_subnets(
+            params["subnets"],
+            params.get("subnets_add"),
+            params.get("subnets_remove"),
+        ),
+    }
+
+    # optional parameters are only added if they are declared in the playbook
+    for key in (
+        "backup_sc",
+        "bgp_peer",
+        "nat_pool",
+        "no_export_community",
+        "protocol",
+        "qos",
+        "secondary_ipsec_tunnel",
+        "source_nat",
+    ):
+        if params[key]:
+            service_connection[key] = params[key]
+
+    return service_connection
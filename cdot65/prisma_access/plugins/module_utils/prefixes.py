@@ -0,0 +1,48 @@
+"""
+Detection of overlapping IPv4 and IPv6 prefixes.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from ipaddress import ip_network
+
+__metaclass__ = type
+
+
+def parse_prefix(prefix):
+    """Return the network of a prefix, ignoring host bits. Raises ValueError on an invalid prefix."""
+    return ip_network(prefix.strip(), strict=False)
+
+
+def find_overlaps(entries):
+    """Yield an (outer, inner) pair for every two entries whose prefixes overlap.
+
+    entries is an iterable of (network, owner) pairs. Two prefixes are either
+    disjoint or one contains the other, so once the entries are sorted by
+    address family, first address and prefix length, the entries containing
+    a prefix are exactly those left on a stack of enclosing prefixes. This
+    takes O(n log n) time for the sort, plus the number of overlaps found;
+    outer is the containing (or equal) prefix.
+    """
+    stack = []
+    for entry in sorted(
+        entries,
+        key=lambda entry: (
+            entry[0].version,
+            int(entry[0].network_address),
+            entry[0].prefixlen,
+        ),
+    ):
+        network = entry[0]
+        while stack and (
+            stack[-1][0].version != network.version
+            or int(stack[-1][0].broadcast_address)
+            < int(network.network_address)
+        ):
+            stack.pop()
+        for outer in stack:
+            yield outer, entry
+        stack.append(entry)
@@ -0,0 +1,157 @@
+"""
+Optional cProfile and tracemalloc profiling of a module run.
+
+Profiling is requested with the profile option of a module, or for every
+module through the environment:
+
+    PRISMA_ACCESS_PROFILE=cprofile,tracemalloc   profilers to run, or "all"
+    PRISMA_ACCESS_PROFILE_DIR=/var/tmp/profiles  directory receiving the files
+    PRISMA_ACCESS_PROFILE_NAME=onboarding        name the files are keyed by
+
+Without a name, the files are keyed by the names of the module and of the
+object it manages. Modules are not told the name of their task, so profiles
+are only keyed by task when its name is repeated as the profile name.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import os
+import re
+import time
+
+__metaclass__ = type
+
+PROFILE_TOOLS = ("cprofile", "tracemalloc")
+
+# default directory of the profiles, on the host running the module
+PROFILE_DIR = "~/.ansible/profiles/cdot65.prisma_access"
+
+# number of entries of the text reports
+REPORT_LINES = 40
+
+
+def profile_settings(module_name, params):
+    """Return the profilers, directory and file prefix requested for a run, or None.
+
+    The module option takes precedence over the environment. The parameters
+    are the raw, unvalidated ones, as profiling starts before the module
+    validates its arguments.
+    """
+    option = params.get("profile") if isinstance(params, dict) else None
+    option = option if isinstance(option, dict) else {}
+
+    tools = option.get("tools")
+    if tools is None and option:
+        tools = ["cprofile"]
+    if tools is None:
+        tools = [
+            each.strip().lower()
+            for each in os.environ.get("PRISMA_ACCESS_PROFILE", "").split(",")
+            if each.strip()
+        ]
+        if "all" in tools:
+            tools = list(PROFILE_TOOLS)
+    tools = [each for each in PROFILE_TOOLS if each in (tools or [])]
+    if not tools:
+        return None
+
+    directory = option.get("directory") or os.environ.get(
+        "PRISMA_ACCESS_PROFILE_DIR", PROFILE_DIR
+    )
+    name = option.get("name") or os.environ.get("PRISMA_ACCESS_PROFILE_NAME")
+    if not name:
+        name = "-".join(
+            str(each) for each in (module_name, params.get("name")) if each
+        )
+
+    # runs of the same task, such as loop items, each get files of their own
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or module_name
+    prefix = f"{name}-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+    return tools, os.path.expanduser(directory), prefix
+
+
+def run_profiled(main):
+    """Run a module's main function, profiled when requested.
+
+    The profiles are written once the module has exited, whether it
+    succeeded or failed, and never change its result.
+    """
+    module_name = os.path.splitext(
+        os.path.basename(main.__code__.co_filename)
+    )[0]
+    try:
+        from ansible.module_utils.basic import _load_params
+
+        settings = profile_settings(module_name, _load_params())
+    except Exception:
+        settings = None
+
+    if not settings:
+        return main()
+
+    tools, directory, prefix = settings
+    profiler = None
+
+    if "tracemalloc" in tools:
+        import tracemalloc
+
+        tracemalloc.start(25)
+    if "cprofile" in tools:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    try:
+        return main()
+    finally:
+        if profiler:
+            profiler.disable()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, prefix)
+            # the memory snapshot is taken first, before writing the stats allocates any
+            if "tracemalloc" in tools:
+                write_tracemalloc(path)
+            if profiler:
+                write_cprofile(profiler, path)
+        except Exception:
+            # the module has already returned its result; a profile is never worth failing it
+            pass
+
+
+def write_cprofile(profiler, path):
+    """Write the binary stats, for pstats or snakeviz, and a report sorted by cumulative time."""
+    import pstats
+
+    profiler.dump_stats(path + ".prof")
+    with open(path + ".cprofile.txt", "w") as report:
+        stats = pstats.Stats(profiler, stream=report)
+        stats.sort_stats("cumulative").print_stats(REPORT_LINES)
+
+
+def write_tracemalloc(path):
+    """Write the snapshot, for tracemalloc.Snapshot.load, and a report of the largest allocation sites."""
+    import tracemalloc
+
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(
+                False, "<frozen importlib._bootstrap_external>"
+            ),
+        )
+    )
+    tracemalloc.stop()
+
+    snapshot.dump(path + ".tracemalloc")
+    with open(path + ".tracemalloc.txt", "w") as report:
+        report.write(f"current: {current / 1024:.1f} KiB\n")
+        report.write(f"peak: {peak / 1024:.1f} KiB\n\n")
+        for stat in snapshot.statistics("lineno")[:REPORT_LINES]:
+            report.write(f"{stat}\n")
@@ -0,0 +1,93 @@
+"""
+Streaming readers for object records stored in CSV or JSONL files on the controller.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import csv
+import gzip
+import json
+
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+
+__metaclass__ = type
+
+# file formats records can be read from
+FORMATS = ("csv", "jsonl")
+
+
+def detect_format(path, file_format="auto"):
+    """Return the format of a records file, guessing it from the extension when set to auto."""
+    if file_format != "auto":
+        return file_format
+    path = path.lower()
+    if path.endswith(".gz"):
+        path = path[: -len(".gz")]
+    return "csv" if path.endswith(".csv") else "jsonl"
+
+
+def open_records(path):
+    """Open a records file for reading as text, decompressing it when its name ends with .gz."""
+    if path.lower().endswith(".gz"):
+        return gzip.open(path, "rt", newline="", encoding="utf-8")
+    return open(path, newline="", encoding="utf-8")
+
+
+def read_records(path, file_format="auto"):
+    """Yield a (line number, record) pair for every record of a CSV or JSONL file.
+
+    Records are read one at a time, so files of any size are processed in
+    constant memory. Empty CSV cells are left out of the record, and blank or
+    commented (#) JSONL lines are skipped. Files compressed with gzip, such
+    as the exports of the tenant_export module, are decompressed as they are
+    read. Raises ValueError on a malformed record.
+    """
+    file_format = detect_format(path, file_format)
+
+    with open_records(path) as stream:
+        if file_format == "csv":
+            reader = csv.DictReader(stream)
+            for row in reader:
+                if None in row:
+                    raise ValueError(
+                        f"{path} line {reader.line_num}: more fields than columns"
+                    )
+                yield reader.line_num, {
+                    key.strip(): value.strip()
+                    for key, value in row.items()
+                    if value is not None and value.strip()
+                }
+            return
+
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exception_error:
+                raise ValueError(
+                    f"{path} line {line_number}: {exception_error}"
+                )
+            if not isinstance(record, dict):
+                raise ValueError(
+                    f"{path} line {line_number}: record is not an object"
+                )
+            yield line_number, record
+
+
+def validate_record(argument_spec, record, **constraints):
+    """Validate a record against a module argument spec.
+
+    Returns the validated parameters, with defaults applied and values such as
+    comma separated lists converted to their declared type, and a list of
+    error messages, which is empty when the record is valid. Constraints such
+    as mutually_exclusive and required_one_of are passed on to the validator.
+    """
+    result = ArgumentSpecValidator(argument_spec, **constraints).validate(
+        record
+    )
+    return result.validated_parameters, result.error_messages
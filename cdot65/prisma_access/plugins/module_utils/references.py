@@ -0,0 +1,158 @@
+"""
+Pre-resolution of the names network objects use to reference each other.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .bulk import list_objects
+
+__metaclass__ = type
+
+# folder whose objects are inherited by every other folder
+SHARED_FOLDER = "Shared"
+
+
+class ReferenceResolver:
+    """Name indexes of the objects referenced by IPsec tunnels and connections.
+
+    Every object type is listed at most once per folder for the lifetime of
+    the resolver, so many references can be validated in a single batch
+    before anything is written.
+    """
+
+    def __init__(self, session, limiter=None):
+        self.session = session
+        self.limiter = limiter
+        self.indexes = {}
+
+    def index(self, object_class, folder):
+        """Return the name index of an object type within a folder."""
+        key = (object_class, folder)
+        if key not in self.indexes:
+            self.indexes[key] = {
+                each.name: each
+                for each in list_objects(
+                    self.session, object_class, folder, self.limiter
+                )
+            }
+        return self.indexes[key]
+
+    def resolve(self, object_class, folder, name):
+        """Return the object a name refers to, looking in Shared as well."""
+        found = self.index(object_class, folder).get(name)
+        if found is None and folder != SHARED_FOLDER:
+            try:
+                found = self.index(object_class, SHARED_FOLDER).get(name)
+            except RuntimeError:
+                # not every object type can live in the Shared folder
+                self.indexes[(object_class, SHARED_FOLDER)] = {}
+        return found
+
+    def add(self, object_class, folder, obj):
+        """Record an object created during the run so later references resolve."""
+        self.index(object_class, folder)[obj.name] = obj
+
+    def remove(self, object_class, folder, name):
+        """Forget an object deleted during the run."""
+        self.index(object_class, folder).pop(name, None)
+
+    def unresolved(self, references):
+        """Return a message for every reference that does not resolve.
+
+        references is an iterable of (label, object_class, folder, name).
+        """
+        return [
+            f"{label} '{name}' does not exist in folder '{folder}'"
+            for label, object_class, folder, name in references
+            if self.resolve(object_class, folder, name) is None
+        ]
+
+
+def ike_gateway_references(ike_gateway):
+    """Return the references of an IKE gateway configuration."""
+    from panapi.config.network import IKECryptoProfile
+
+    references = []
+    for version in ("ikev1", "ikev2"):
+        profile = (ike_gateway.get("protocol") or {}).get(version) or {}
+        if profile.get("ike_crypto_profile"):
+            references.append(
+                (
+                    "IKE crypto profile",
+                    IKECryptoProfile,
+                    ike_gateway["folder"],
+                    profile["ike_crypto_profile"],
+                )
+            )
+    return references
+
+
+def ipsec_tunnel_references(ipsec_tunnel):
+    """Return the references of an IPsec tunnel configuration."""
+    from panapi.config.network import IKEGateway, IPSecCryptoProfile
+
+    auto_key = ipsec_tunnel.get("auto_key") or {}
+    references = [
+        ("IKE gateway", IKEGateway, ipsec_tunnel["folder"], each["name"])
+        for each in auto_key.get("ike_gateway") or []
+    ]
+    if auto_key.get("ipsec_crypto_profile"):
+        references.append(
+            (
+                "IPsec crypto profile",
+                IPSecCryptoProfile,
+                ipsec_tunnel["folder"],
+                auto_key["ipsec_crypto_profile"],
+            )
+        )
+    return references
+
+
+def connection_references(connection):
+    """Return the references of a remote network or service connection."""
+    from panapi.config.network import IPSecTunnel
+
+    folder = connection["folder"]
+    names = [
+        connection.get("ipsec_tunnel"),
+        connection.get("secondary_ipsec_tunnel"),
+    ]
+
+    ecmp_tunnels = connection.get("ecmp_tunnels") or []
+    if isinstance(ecmp_tunnels, dict):
+        ecmp_tunnels = [ecmp_tunnels]
+    names.extend(each.get("ipsec_tunnel") for each in ecmp_tunnels)
+
+    return [
+        ("IPsec tunnel", IPSecTunnel, folder, name) for name in names if name
+    ]
+
+
+def dependency_levels(nodes, edges):
+    """Group nodes into levels that can each be processed concurrently.
+
+    edges is an iterable of (before, after) pairs, meaning that before must be
+    processed in an earlier level than after; edges to nodes outside of nodes
+    are ignored. Raises ValueError if the edges contain a cycle.
+    """
+    nodes = set(nodes)
+    blockers = {node: set() for node in nodes}
+    for before, after in edges:
+        if before in nodes and after in nodes:
+            blockers[after].add(before)
+
+    levels = []
+    while blockers:
+        level = [node for node, waiting in blockers.items() if not waiting]
+        if not level:
+            raise ValueError("The references between objects contain a cycle")
+        for node in level:
+            del blockers[node]
+        for waiting in blockers.values():
+            waiting.difference_update(level)
+        levels.append(level)
+
+    return levels
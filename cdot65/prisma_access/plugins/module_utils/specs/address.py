@@ -0,0 +1,104 @@
+"""
+Argument spec of the address module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+
+__metaclass__ = type
+
+
+def address_spec():
+    """Return the address object spec."""
+    return dict(
+        description=dict(
+            max_length=1023,
+            required=True,
+            type="str",
+        ),
+        fingerprint_store=dict(
+            required=False,
+            type="path",
+        ),
+        folder=dict(
+            required=True,
+            choices=[
+                "GlobalProtect",
+                "Mobile Users",
+                "Remote Networks",
+                "Service Connections",
+                "Shared",
+            ],
+            type="str",
+        ),
+        fqdn=dict(
+            required=False,
+            type="str",
+        ),
+        ip_netmask=dict(
+            required=False,
+            type="str",
+        ),
+        ip_range=dict(
+            required=False,
+            type="str",
+        ),
+        ip_wildcard=dict(
+            required=False,
+            type="str",
+        ),
+        lookup_strategy=dict(
+            choices=["create_first", "list_first"],
+            default="list_first",
+            required=False,
+            type="str",
+        ),
+        metrics=metrics_spec(),
+        name=dict(
+            max_length=63,
+            required=True,
+            type="str",
+        ),
+        profile=profile_spec(),
+        provider=provider_spec(),
+        state=dict(
+            required=True,
+            choices=["absent", "present"],
+            type="str",
+        ),
+        tag=dict(
+            elements="str",
+            max_items=64,
+            required=False,
+            type="list",
+        ),
+    )
+
+
+def address_record_spec():
+    """Return the spec of an address record read from a file.
+
+    Records use the options of the address module, without the module-level
+    options; the folder defaults to the module's folder.
+    """
+    spec = address_spec()
+    for key in (
+        "fingerprint_store",
+        "lookup_strategy",
+        "metrics",
+        "profile",
+        "provider",
+        "state",
+    ):
+        spec.pop(key)
+    spec["description"]["required"] = False
+    spec["folder"]["required"] = False
+    return spec
@@ -0,0 +1,138 @@
+"""
+Argument spec of the address_group module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+
+__metaclass__ = type
+
+
+def address_group_spec():
+    """Return the address groups object spec."""
+    return dict(
+        description=dict(
+            max_length=1023,
+            required=True,
+            type="str",
+        ),
+        dynamic=dict(
+            required=False,
+            type="dict",
+            options=dict(
+                filter=dict(
+                    required=True,
+                    type="str",
+                ),
+            ),
+        ),
+        fingerprint_store=dict(
+            required=False,
+            type="path",
+        ),
+        folder=dict(
+            required=True,
+            choices=[
+                "GlobalProtect",
+                "Mobile Users",
+                "Remote Networks",
+                "Service Connections",
+                "Shared",
+            ],
+            type="str",
+        ),
+        lookup_strategy=dict(
+            choices=["create_first", "list_first"],
+            default="list_first",
+            required=False,
+            type="str",
+        ),
+        members_add=dict(
+            elements="str",
+            required=False,
+            type="list",
+        ),
+        members_remove=dict(
+            elements="str",
+            required=False,
+            type="list",
+        ),
+        metrics=metrics_spec(),
+        name=dict(
+            max_length=63,
+            required=True,
+            type="str",
+        ),
+        profile=profile_spec(),
+        provider=provider_spec(),
+        shard=dict(
+            options=dict(
+                max_members=dict(
+                    default=64,
+                    required=False,
+                    type="int",
+                ),
+                max_workers=dict(
+                    default=8,
+                    required=False,
+                    type="int",
+                ),
+                rate_limit=dict(
+                    default=5.0,
+                    required=False,
+                    type="float",
+                ),
+            ),
+            required=False,
+            type="dict",
+        ),
+        state=dict(
+            required=True,
+            choices=["absent", "present"],
+            type="str",
+        ),
+        static=dict(
+            elements="str",
+            max_items=64,
+            required=False,
+            type="list",
+        ),
+        tag=dict(
+            elements="str",
+            max_items=64,
+            required=False,
+            type="list",
+        ),
+    )
+
+
+def address_group_record_spec():
+    """Return the spec of an address group record read from a file.
+
+    Records use the options of the address_group module, without the
+    module-level options; the folder defaults to the module's folder.
+    """
+    spec = address_group_spec()
+    for key in (
+        "fingerprint_store",
+        "lookup_strategy",
+        "members_add",
+        "members_remove",
+        "metrics",
+        "profile",
+        "provider",
+        "shard",
+        "state",
+    ):
+        spec.pop(key)
+    spec["description"]["required"] = False
+    spec["folder"]["required"] = False
+    return spec
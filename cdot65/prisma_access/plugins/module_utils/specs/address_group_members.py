@@ -0,0 +1,76 @@
+"""
+Argument spec of the address_group_members module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+
+__metaclass__ = type
+
+
+def address_group_members_spec():
+    """Return the address group members spec."""
+    folder_choices = [
+        "GlobalProtect",
+        "Mobile Users",
+        "Remote Networks",
+        "Service Connections",
+        "Shared",
+    ]
+    return dict(
+        folder=dict(
+            choices=folder_choices,
+            default="Shared",
+            required=False,
+            type="str",
+        ),
+        groups=dict(
+            elements="dict",
+            options=dict(
+                folder=dict(
+                    choices=folder_choices,
+                    required=False,
+                    type="str",
+                ),
+                members_add=dict(
+                    elements="str",
+                    required=False,
+                    type="list",
+                ),
+                members_remove=dict(
+                    elements="str",
+                    required=False,
+                    type="list",
+                ),
+                name=dict(
+                    max_length=63,
+                    required=True,
+                    type="str",
+                ),
+            ),
+            required=True,
+            required_one_of=[["members_add", "members_remove"]],
+            type="list",
+        ),
+        max_workers=dict(
+            default=8,
+            required=False,
+            type="int",
+        ),
+        metrics=metrics_spec(),
+        profile=profile_spec(),
+        provider=provider_spec(),
+        rate_limit=dict(
+            default=5.0,
+            required=False,
+            type="float",
+        ),
+    )
@@ -0,0 +1,52 @@
+"""
+Argument spec of the address_group_preview module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    profile_spec,
+    scope_provider_spec,
+)
+
+__metaclass__ = type
+
+
+def address_group_preview_spec():
+    """Return the address group preview spec."""
+    return dict(
+        filter=dict(
+            required=False,
+            type="str",
+        ),
+        folder=dict(
+            required=False,
+            type="str",
+        ),
+        group=dict(
+            required=False,
+            type="str",
+        ),
+        max_age=dict(
+            required=False,
+            type="int",
+        ),
+        max_members=dict(
+            default=1000,
+            required=False,
+            type="int",
+        ),
+        path=dict(
+            required=False,
+            type="path",
+        ),
+        profile=profile_spec(),
+        provider=scope_provider_spec(),
+        scope=dict(
+            required=False,
+            type="str",
+        ),
+    )
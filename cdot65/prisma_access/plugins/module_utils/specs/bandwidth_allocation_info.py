@@ -0,0 +1,40 @@
+"""
+Argument spec of the bandwidth_allocation_info module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+
+__metaclass__ = type
+
+
+def bandwidth_allocation_info_spec():
+    """Return the bandwidth allocation info spec."""
+    return dict(
+        cache_ttl=dict(
+            default=300,
+            required=False,
+            type="int",
+        ),
+        metrics=metrics_spec(),
+        profile=profile_spec(),
+        provider=provider_spec(),
+        refresh=dict(
+            default=False,
+            required=False,
+            type="bool",
+        ),
+        regions=dict(
+            elements="str",
+            required=False,
+            type="list",
+        ),
+    )
@@ -0,0 +1,181 @@
+"""
+Argument spec of the bulk_objects module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_options,
+)
+
+__metaclass__ = type
+
+
+def bulk_objects_spec():
+    """Return the bulk objects spec."""
+    folder = dict(
+        required=False,
+        choices=[
+            "GlobalProtect",
+            "Mobile Users",
+            "Remote Networks",
+            "Service Connections",
+            "Shared",
+        ],
+        type="str",
+    )
+    return dict(
+        address_groups=dict(
+            elements="dict",
+            mutually_exclusive=[["dynamic", "static"]],
+            options=dict(
+                description=dict(
+                    max_length=1023,
+                    required=False,
+                    type="str",
+                ),
+                dynamic=dict(
+                    required=False,
+                    type="dict",
+                    options=dict(
+                        filter=dict(
+                            required=True,
+                            type="str",
+                        ),
+                    ),
+                ),
+                folder=folder,
+                name=dict(
+                    max_length=63,
+                    required=True,
+                    type="str",
+                ),
+                static=dict(
+                    elements="str",
+                    max_items=64,
+                    required=False,
+                    type="list",
+                ),
+                tag=dict(
+                    elements="str",
+                    max_items=64,
+                    required=False,
+                    type="list",
+                ),
+            ),
+            required=False,
+            type="list",
+        ),
+        addresses=dict(
+            elements="dict",
+            mutually_exclusive=[
+                ["fqdn", "ip_netmask", "ip_range", "ip_wildcard"]
+            ],
+            options=dict(
+                description=dict(
+                    max_length=1023,
+                    required=False,
+                    type="str",
+                ),
+                folder=folder,
+                fqdn=dict(
+                    required=False,
+                    type="str",
+                ),
+                ip_netmask=dict(
+                    required=False,
+                    type="str",
+                ),
+                ip_range=dict(
+                    required=False,
+                    type="str",
+                ),
+                ip_wildcard=dict(
+                    required=False,
+                    type="str",
+                ),
+                name=dict(
+                    max_length=63,
+                    required=True,
+                    type="str",
+                ),
+                tag=dict(
+                    elements="str",
+                    max_items=64,
+                    required=False,
+                    type="list",
+                ),
+            ),
+            required=False,
+            type="list",
+        ),
+        folder=dict(
+            required=False,
+            choices=[
+                "GlobalProtect",
+                "Mobile Users",
+                "Remote Networks",
+                "Service Connections",
+                "Shared",
+            ],
+            default="Shared",
+            type="str",
+        ),
+        journal=dict(
+            required=False,
+            type="path",
+        ),
+        max_workers=dict(
+            default=8,
+            required=False,
+            type="int",
+        ),
+        metrics=metrics_spec(),
+        profile=profile_spec(),
+        providers=dict(
+            elements="dict",
+            options=provider_options(),
+            required=True,
+            type="list",
+        ),
+        rate_limit=dict(
+            default=5.0,
+            required=False,
+            type="float",
+        ),
+        resume=dict(
+            default=False,
+            required=False,
+            type="bool",
+        ),
+        state=dict(
+            required=True,
+            choices=["absent", "present"],
+            type="str",
+        ),
+        tags=dict(
+            elements="dict",
+            options=dict(
+                color=dict(
+                    required=False,
+                    type="str",
+                ),
+                comments=dict(
+                    required=False,
+                    type="str",
+                ),
+                folder=folder,
+                name=dict(
+                    required=True,
+                    type="str",
+                ),
+            ),
+            required=False,
+            type="list",
+        ),
+    )
@@ -0,0 +1,76 @@
+"""
+Argument spec of the bulk_remote_networks module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+
+__metaclass__ = type
+
+
+def bulk_remote_networks_spec():
+    """Return the bulk remote networks spec."""
+    return dict(
+        folder=dict(
+            default="Remote Networks",
+            required=False,
+            type="str",
+        ),
+        format=dict(
+            choices=[
+                "auto",
+                "csv",
+                "jsonl",
+            ],
+            default="auto",
+            required=False,
+            type="str",
+        ),
+        max_errors=dict(
+            default=50,
+            required=False,
+            type="int",
+        ),
+        max_workers=dict(
+            default=8,
+            required=False,
+            type="int",
+        ),
+        metrics=metrics_spec(),
+        path=dict(
+            required=True,
+            type="path",
+        ),
+        profile=profile_spec(),
+        provider=provider_spec(),
+        rate_limit=dict(
+            default=5.0,
+            required=False,
+            type="float",
+        ),
+        report=dict(
+            required=False,
+            type="path",
+        ),
+        state=dict(
+            required=True,
+            choices=[
+                "absent",
+                "present",
+            ],
+            type="str",
+        ),
+        validate_references=dict(
+            default=False,
+            required=False,
+            type="bool",
+        ),
+    )
@@ -0,0 +1,84 @@
+"""
+Options shared by the argument specs of every module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+def provider_options():
+    """Return the credentials of a tenant."""
+    return dict(
+        client_id=dict(
+            required=True,
+            type="str",
+        ),
+        client_secret=dict(
+            no_log=True,
+            required=True,
+            type="str",
+        ),
+        scope=dict(
+            required=True,
+            type="str",
+        ),
+    )
+
+
+def provider_spec():
+    """Return the provider option, the tenant a module works with."""
+    return dict(
+        required=True,
+        type="dict",
+        options=provider_options(),
+    )
+
+
+def scope_provider_spec():
+    """Return the provider option of modules reading local files, which only use the scope of the tenant."""
+    options = provider_options()
+    for each in options.values():
+        each["required"] = False
+    return dict(
+        required=False,
+        type="dict",
+        options=options,
+    )
+
+
+def metrics_spec():
+    """Return the metrics option, returning the API requests of a run."""
+    return dict(
+        default=False,
+        required=False,
+        type="bool",
+    )
+
+
+def profile_spec():
+    """Return the profile option, profiling a run with cProfile or tracemalloc."""
+    return dict(
+        options=dict(
+            directory=dict(
+                required=False,
+                type="path",
+            ),
+            name=dict(
+                required=False,
+                type="str",
+            ),
+            tools=dict(
+                choices=["cprofile", "tracemalloc"],
+                default=["cprofile"],
+                elements="str",
+                required=False,
+                type="list",
+            ),
+        ),
+        required=False,
+        type="dict",
+    )
@@ -0,0 +1,42 @@
+"""
+Argument spec of the config_push module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+
+__metaclass__ = type
+
+
+def config_push_spec():
+    """Return the address object spec."""
+    return dict(
+        description=dict(
+            max_length=1023,
+            required=False,
+            type="str",
+        ),
+        folders=dict(
+            choices=[
+                "Mobile Users",
+                "Mobile Users Container",
+                "Mobile Users Explicit Proxy",
+                "Remote Networks",
+                "Service Connections",
+            ],
+            elements="str",
+            required=True,
+            type="list",
+        ),
+        metrics=metrics_spec(),
+        profile=profile_spec(),
+        provider=provider_spec(),
+    )
@@ -0,0 +1,228 @@
+"""
+Argument spec of the ike_gateway module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+
+__metaclass__ = type
+
+
+def ike_gateway_spec():
+    """Return the IKE gateway object spec."""
+    return dict(
+        authentication=dict(
+            options=dict(
+                certificate=dict(
+                    options=dict(
+                        allow_id_payload_mismatch=dict(
+                            required=False,
+                            type="bool",
+                        ),
+                        certificate_profile=dict(
+                            required=False,
+                            type="str",
+                        ),
+                        local_certificate=dict(
+                            options=dict(
+                                local_certificate_name=dict(
+                                    required=False,
+                                    type="str",
+                                ),
+                            ),
+                            required=False,
+                            type="dict",
+                        ),
+                        strict_validation_revocation=dict(
+                            required=False,
+                            type="bool",
+                        ),
+                        use_management_as_source=dict(
+                            required=False,
+                            type="bool",
+                        ),
+                    ),
+                    required=False,
+                    type="dict",
+                ),
+                pre_shared_key=dict(
+                    required=False,
+                    type="str",
+                ),
+            ),
+            required=True,
+            type="dict",
+        ),
+        folder=dict(
+            choices=[
+                "Mobile Users",
+                "Mobile Users Container",
+                "Mobile Users Explicit Proxy",
+                "Remote Networks",
+                "Service Connections",
+                "Shared",
+            ],
+            required=True,
+            type="str",
+        ),
+        local_id=dict(
+            options=dict(
+                id=dict(
+                    required=False,
+                    type="str",
+                ),
+                type=dict(
+                    required=False,
+                    type="str",
+                ),
+            ),
+            required=False,
+            type="dict",
+        ),
+        metrics=metrics_spec(),
+        name=dict(
+            max_length=63,
+            required=True,
+            type="str",
+        ),
+        peer_address=dict(
+            options=dict(
+                dynamic=dict(
+                    required=False,
+                    type="bool",
+                ),
+                fqdn=dict(
+                    max_length=255,
+                    required=False,
+                    type="str",
+                ),
+                ip=dict(
+                    required=False,
+                    type="str",
+                ),
+            ),
+            required=True,
+            type="dict",
+        ),
+        peer_id=dict(
+            options=dict(
+                id=dict(
+                    max_length=1024,
+                    required=True,
+                    type="str",
+                ),
+                type=dict(
+                    choices=[
+                        "ipaddr",
+                        "keyid",
+                        "fqdn",
+                        "ufqdn",
+                    ],
+                    required=True,
+                    type="str",
+                ),
+            ),
+            required=True,
+            type="dict",
+        ),
+        profile=profile_spec(),
+        protocol=dict(
+            options=dict(
+                ikev1=dict(
+                    options=dict(
+                        dpd=dict(
+                            options=dict(
+                                enable=dict(
+                                    required=False,
+                                    type="bool",
+                                ),
+                            ),
+                            required=False,
+                            type="dict",
+                        ),
+                        ike_crypto_profile=dict(
+                            required=False,
+                            type="str",
+                        ),
+                    ),
+                    required=False,
+                    type="dict",
+                ),
+                ikev2=dict(
+                    options=dict(
+                        dpd=dict(
+                            options=dict(
+                                enable=dict(
+                                    required=False,
+                                    type="bool",
+                                ),
+                            ),
+                            required=False,
+                            type="dict",
+                        ),
+                        ike_crypto_profile=dict(
+                            required=False,
+                            type="str",
+                        ),
+                    ),
+                    required=False,
+                    type="dict",
+                ),
+                version=dict(
+                    choices=[
+                        "ikev2-preferred",
+                        "ikev1",
+                        "ikev2",
+                    ],
+                    required=False,
+                    type="str",
+                ),
+            ),
+            required=True,
+            type="dict",
+        ),
+        protocol_common=dict(
+            required=False,
+            type="dict",
+            options=dict(
+                fragmentation=dict(
+                    required=False,
+                    type="dict",
+                    options=dict(
+                        enable=dict(
+                            required=False,
+                            type="bool",
+                        ),
+                    ),
+                ),
+                nat_traversal=dict(
+                    required=False,
+                    type="dict",
+                    options=dict(
+                        enable=dict(
+                            required=False,
+                            type="bool",
+                        ),
+                    ),
+                ),
+                passive_mode=dict(
+                    required=False,
+                    type="bool",
+                ),
+            ),
+        ),
+        provider=provider_spec(),
+        state=dict(
+            required=True,
+            choices=["absent", "present"],
+            type="str",
+        ),
+    )
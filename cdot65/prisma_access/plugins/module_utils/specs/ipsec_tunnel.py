@@ -0,0 +1,98 @@
+"""
+Argument spec of the ipsec_tunnel module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+
+__metaclass__ = type
+
+
+def ipsec_tunnel_spec():
+    """Return the IPsec Tunnel object spec."""
+    return dict(
+        anti_replay=dict(
+            default=False,
+            required=False,
+            type="bool",
+        ),
+        auto_key=dict(
+            options=dict(
+                ike_gateway=dict(
+                    elements="dict",
+                    options=dict(
+                        name=dict(
+                            required=True,
+                            type="str",
+                        ),
+                    ),
+                    required=True,
+                    type="list",
+                ),
+                ipsec_crypto_profile=dict(
+                    required=True,
+                    type="str",
+                ),
+            ),
+            required=True,
+            type="dict",
+        ),
+        folder=dict(
+            choices=[
+                "Mobile Users",
+                "Mobile Users Container",
+                "Mobile Users Explicit Proxy",
+                "Remote Networks",
+                "Service Connections",
+                "Shared",
+            ],
+            required=True,
+            type="str",
+        ),
+        metrics=metrics_spec(),
+        name=dict(
+            max_length=63,
+            required=True,
+            type="str",
+        ),
+        profile=profile_spec(),
+        provider=provider_spec(),
+        state=dict(
+            choices=["absent", "present"],
+            required=True,
+            type="str",
+        ),
+        tunnel_interface=dict(
+            default="tunnel",
+            required=False,
+            type="str",
+        ),
+        tunnel_monitor=dict(
+            options=dict(
+                enable=dict(
+                    default=False,
+                    required=False,
+                    type="bool",
+                ),
+                destination_ip=dict(
+                    required=False,
+                    type="str",
+                ),
+            ),
+            required=True,
+            type="dict",
+        ),
+        validate_references=dict(
+            default=False,
+            required=False,
+            type="bool",
+        ),
+    )
@@ -0,0 +1,60 @@
+"""
+Argument spec of the mirror_info module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    profile_spec,
+    scope_provider_spec,
+)
+from .mirror_sync import (
+    MIRROR_TYPE_CHOICES,
+)
+
+__metaclass__ = type
+
+
+def mirror_info_spec():
+    """Return the mirror info spec."""
+    return dict(
+        folder=dict(
+            required=False,
+            type="str",
+        ),
+        max_age=dict(
+            required=False,
+            type="int",
+        ),
+        name_pattern=dict(
+            required=False,
+            type="str",
+        ),
+        names=dict(
+            elements="str",
+            required=False,
+            type="list",
+        ),
+        path=dict(
+            required=False,
+            type="path",
+        ),
+        profile=profile_spec(),
+        provider=scope_provider_spec(),
+        scope=dict(
+            required=False,
+            type="str",
+        ),
+        tag=dict(
+            required=False,
+            type="str",
+        ),
+        type=dict(
+            choices=MIRROR_TYPE_CHOICES,
+            required=False,
+            type="str",
+        ),
+    )
@@ -0,0 +1,66 @@
+"""
+Argument spec of the mirror_sync module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+
+__metaclass__ = type
+
+MIRROR_TYPE_CHOICES = [
+    "address",
+    "address_group",
+    "ike_gateway",
+    "ipsec_tunnel",
+    "remote_network",
+    "service_connection",
+    "tag",
+]
+
+
+def mirror_sync_spec():
+    """Return the mirror sync spec."""
+    return dict(
+        folders=dict(
+            elements="str",
+            required=False,
+            type="list",
+        ),
+        max_age=dict(
+            default=0,
+            required=False,
+            type="int",
+        ),
+        max_workers=dict(
+            default=8,
+            required=False,
+            type="int",
+        ),
+        metrics=metrics_spec(),
+        path=dict(
+            required=False,
+            type="path",
+        ),
+        profile=profile_spec(),
+        provider=provider_spec(),
+        rate_limit=dict(
+            default=5.0,
+            required=False,
+            type="float",
+        ),
+        types=dict(
+            choices=MIRROR_TYPE_CHOICES,
+            default=MIRROR_TYPE_CHOICES,
+            elements="str",
+            required=False,
+            type="list",
+        ),
+    )
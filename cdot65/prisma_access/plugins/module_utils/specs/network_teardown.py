@@ -0,0 +1,65 @@
+"""
+Argument spec of the network_teardown module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+
+__metaclass__ = type
+
+
+def network_teardown_spec():
+    """Return the network teardown spec."""
+    return dict(
+        cascade=dict(
+            default=True,
+            required=False,
+            type="bool",
+        ),
+        folders=dict(
+            choices=[
+                "Remote Networks",
+                "Service Connections",
+            ],
+            default=["Remote Networks", "Service Connections"],
+            elements="str",
+            required=False,
+            type="list",
+        ),
+        max_workers=dict(
+            default=8,
+            required=False,
+            type="int",
+        ),
+        metrics=metrics_spec(),
+        name_patterns=dict(
+            elements="str",
+            required=False,
+            type="list",
+        ),
+        names=dict(
+            elements="str",
+            required=False,
+            type="list",
+        ),
+        profile=profile_spec(),
+        provider=provider_spec(),
+        rate_limit=dict(
+            default=5.0,
+            required=False,
+            type="float",
+        ),
+        tags=dict(
+            elements="str",
+            required=False,
+            type="list",
+        ),
+    )
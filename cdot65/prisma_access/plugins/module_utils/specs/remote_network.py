@@ -0,0 +1,302 @@
+"""
+Argument spec of the remote_network module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+
+__metaclass__ = type
+
+
+def remote_network_spec():
+    """Return the tag object spec."""
+    return dict(
+        auto_spn=dict(
+            default=False,
+            required=False,
+            type="bool",
+        ),
+        bgp_peer=dict(
+            options=dict(
+                local_ip_address=dict(
+                    type="str",
+                    required=False,
+                ),
+                peer_ip_address=dict(
+                    type="str",
+                    required=False,
+                ),
+                secret=dict(
+                    type="str",
+                    required=False,
+                ),
+            ),
+            required=False,
+            type="dict",
+        ),
+        ecmp_load_balancing=dict(
+            choices=[
+                "enable",
+                "disable",
+            ],
+            required=False,
+            type="str",
+        ),
+        ecmp_tunnels=dict(
+            required=False,
+            type="dict",
+            options=dict(
+                do_not_export_routes=dict(
+                    required=False,
+                    type="bool",
+                ),
+                ipsec_tunnel=dict(
+                    required=True,
+                    type="str",
+                ),
+                local_ip_address=dict(
+                    required=False,
+                    type="str",
+                ),
+                name=dict(
+                    required=True,
+                    type="str",
+                ),
+                originate_default_route=dict(
+                    required=False,
+                    type="bool",
+                ),
+                peer_as=dict(
+                    required=False,
+                    type="str",
+                ),
+                peer_ip_address=dict(
+                    required=False,
+                    type="str",
+                ),
+                peering_type=dict(
+                    choices=[
+                        "exchange-v4-over-v4",
+                        "exchange-v4-v6-over-v4",
+                        "exchange-v4-over-v4-v6-over-v6",
+                        "exchange-v6-over-v6",
+                    ],
+                    required=False,
+                    type="str",
+                ),
+                secret=dict(
+                    required=False,
+                    type="str",
+                ),
+                summarize_mobile_user_routes=dict(
+                    required=False,
+                    type="bool",
+                ),
+            ),
+        ),
+        folder=dict(
+            required=True,
+            choices=[
+                "GlobalProtect",
+                "Mobile Users",
+                "Remote Networks",
+                "Service Connections",
+                "Shared",
+            ],
+            type="str",
+        ),
+        ipsec_tunnel=dict(
+            required=False,
+            type="str",
+        ),
+        license_type=dict(
+            default="FWAAS-AGGREGATE",
+            choices=[
+                "FWAAS-AGGREGATE",
+            ],
+            required=False,
+            type="str",
+        ),
+        metrics=metrics_spec(),
+        name=dict(
+            max_length=63,
+            required=True,
+            type="str",
+        ),
+        profile=profile_spec(),
+        protocol=dict(
+            required=False,
+            type="dict",
+            options=dict(
+                bgp=dict(
+                    required=False,
+                    type="dict",
+                    options=dict(
+                        do_not_export_routes=dict(
+                            default=True,
+                            required=False,
+                            type="bool",
+                        ),
+                        enable=dict(
+                            required=False,
+                            type="bool",
+                        ),
+                        local_ip_address=dict(
+                            required=False,
+                            type="str",
+                        ),
+                        originate_default_route=dict(
+                            default=False,
+                            required=False,
+                            type="bool",
+                        ),
+                        peer_as=dict(
+                            required=False,
+                            type="str",
+                        ),
+                        peer_ip_address=dict(
+                            required=False,
+                            type="str",
+                        ),
+                        peering_type=dict(
+                            choices=[
+                                "exchange-v4-over-v4",
+                                "exchange-v4-v6-over-v4",
+                                "exchange-v4-over-v4-v6-over-v6",
+                                "exchange-v6-over-v6",
+                            ],
+                            required=False,
+                            type="str",
+                        ),
+                        secret=dict(
+                            required=False,
+                            type="str",
+                        ),
+                        summarize_mobile_user_routes=dict(
+                            required=False,
+                            type="bool",
+                        ),
+                    ),
+                ),
+            ),
+        ),
+        provider=provider_spec(),
+        region=dict(
+            choices=[
+                "af-south-1",
+                "ap-northeast-1",
+                "ap-northeast-2",
+                "ap-south-1",
+                "ap-southeast-1",
+                "ap-southeast-2",
+                "asia-east1",
+                "asia-east2",
+                "asia-northeast2",
+                "asia-south1",
+                "asia-south2",
+                "asia-southeast1",
+                "asia-southeast2",
+                "australia-southeast1",
+                "australia-southeast2",
+                "ca-central-1",
+                "europe-north1",
+                "europe-southwest1",
+                "europe-west1",
+                "europe-west3",
+                "europe-west4",
+                "europe-west6",
+                "europe-west8",
+                "europe-west9",
+                "eu-central-1",
+                "eu-west-1",
+                "eu-west-2",
+                "eu-west-3",
+                "me-south-1",
+                "me-west1",
+                "northamerica-northeast2",
+                "sa-east-1",
+                "southamerica-east1",
+                "southamerica-west1",
+                "us-central1",
+                "us-east-1",
+                "us-east1",
+                "us-east-2",
+                "us-east4",
+                "us-south1",
+                "us-west-1",
+                "us-west1",
+                "us-west-2",
+            ],
+            required=True,
+            type="str",
+        ),
+        secondary_ipsec_tunnel=dict(
+            required=False,
+            type="str",
+        ),
+        spn_name=dict(
+            required=False,
+            type="str",
+        ),
+        subnets=dict(
+            required=False,
+            type="list",
+            elements="str",
+        ),
+        subnets_add=dict(
+            elements="str",
+            required=False,
+            type="list",
+        ),
+        subnets_remove=dict(
+            elements="str",
+            required=False,
+            type="list",
+        ),
+        state=dict(
+            required=True,
+            choices=["absent", "present"],
+            type="str",
+        ),
+        validate_placement=dict(
+            default=False,
+            required=False,
+            type="bool",
+        ),
+        validate_references=dict(
+            default=False,
+            required=False,
+            type="bool",
+        ),
+    )
+
+
+def remote_network_record_spec():
+    """Return the spec of a remote network record read from a file.
+
+    Records use the options of the remote_network module, without the
+    module-level options; the folder defaults to the module's folder.
+    """
+    spec = remote_network_spec()
+    for key in (
+        "auto_spn",
+        "metrics",
+        "profile",
+        "provider",
+        "state",
+        "subnets_add",
+        "subnets_remove",
+        "validate_placement",
+        "validate_references",
+    ):
+        spec.pop(key, None)
+    spec["folder"]["required"] = False
+    return spec
@@ -0,0 +1,248 @@
+"""
+Argument spec of the service_connection module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+
+__metaclass__ = type
+
+
+def service_connection_spec():
+    """Return the Service Connection object spec."""
+    return dict(
+        backup_sc=dict(
+            required=False,
+            type="str",
+        ),
+        bgp_peer=dict(
+            required=False,
+            type="dict",
+            options=dict(
+                local_ip_address=dict(
+                    required=False,
+                    type="str",
+                ),
+                local_ipv6_address=dict(
+                    required=False,
+                    type="str",
+                ),
+                peer_ip_address=dict(
+                    required=False,
+                    type="str",
+                ),
+                peer_ipv6_address=dict(
+                    required=False,
+                    type="str",
+                ),
+                same_as_primary=dict(
+                    required=False,
+                    type="bool",
+                ),
+                secret=dict(
+                    required=False,
+                    type="str",
+                ),
+            ),
+        ),
+        folder=dict(
+            choices=[
+                "Mobile Users",
+                "Mobile Users Container",
+                "Mobile Users Explicit Proxy",
+                "Remote Networks",
+                "Service Connections",
+                "Shared",
+            ],
+            required=True,
+            type="str",
+        ),
+        ipsec_tunnel=dict(
+            max_length=63,
+            required=True,
+            type="str",
+        ),
+        metrics=metrics_spec(),
+        name=dict(
+            max_length=63,
+            required=True,
+            type="str",
+        ),
+        nat_pool=dict(
+            required=False,
+            type="str",
+        ),
+        no_export_community=dict(
+            required=False,
+            type="str",
+            choices=[
+                "Disabled",
+                "Enabled-In",
+                "Enabled-Out",
+                "Enabled-Both",
+            ],
+        ),
+        profile=profile_spec(),
+        protocol=dict(
+            required=False,
+            type="dict",
+            options=dict(
+                bgp=dict(
+                    required=False,
+                    type="dict",
+                    options=dict(
+                        do_not_export_routes=dict(
+                            required=False,
+                            type="bool",
+                        ),
+                        enable=dict(
+                            required=False,
+                            type="bool",
+                        ),
+                        fast_failover=dict(
+                            required=False,
+                            type="bool",
+                        ),
+                        local_ip_address=dict(
+                            required=False,
+                            type="str",
+                        ),
+                        originate_default_route=dict(
+                            required=False,
+                            type="bool",
+                        ),
+                        peer_as=dict(
+                            required=False,
+                            type="str",
+                        ),
+                        peer_ip_address=dict(
+                            required=False,
+                            type="str",
+                        ),
+                        secret=dict(
+                            required=False,
+                            type="str",
+                        ),
+                        summarize_mobile_user_routes=dict(
+                            required=False,
+                            type="bool",
+                        ),
+                    ),
+                ),
+            ),
+        ),
+        qos=dict(
+            required=False,
+            type="dict",
+            options=dict(
+                enable=dict(
+                    required=False,
+                    type="bool",
+                ),
+                qos_profile=dict(
+                    required=False,
+                    type="str",
+                ),
+            ),
+        ),
+        onboarding_type=dict(
+            choices=[
+                "classic",
+            ],
+            default="classic",
+            required=False,
+            type="str",
+        ),
+        provider=provider_spec(),
+        region=dict(
+            choices=[
+                "af-south-1",
+                "ap-northeast-1",
+                "ap-northeast-2",
+                "ap-south-1",
+                "ap-southeast-1",
+                "ap-southeast-2",
+                "asia-east1",
+                "asia-east2",
+                "asia-northeast2",
+                "asia-south1",
+                "asia-south2",
+                "asia-southeast1",
+                "asia-southeast2",
+                "australia-southeast1",
+                "australia-southeast2",
+                "ca-central-1",
+                "europe-north1",
+                "europe-southwest1",
+                "europe-west1",
+                "europe-west3",
+                "europe-west4",
+                "europe-west6",
+                "europe-west8",
+                "europe-west9",
+                "eu-central-1",
+                "eu-west-1",
+                "eu-west-2",
+                "eu-west-3",
+                "me-south-1",
+                "me-west1",
+                "northamerica-northeast2",
+                "sa-east-1",
+                "southamerica-east1",
+                "southamerica-west1",
+                "us-central1",
+                "us-east-1",
+                "us-east1",
+                "us-east-2",
+                "us-east4",
+                "us-south1",
+                "us-west-1",
+                "us-west1",
+                "us-west-2",
+            ],
+            required=True,
+            type="str",
+        ),
+        secondary_ipsec_tunnel=dict(
+            required=False,
+            type="str",
+        ),
+        source_nat=dict(
+            required=False,
+            type="bool",
+        ),
+        state=dict(
+            choices=["absent", "present"],
+            required=True,
+            type="str",
+        ),
+        subnets=dict(
+            elements="str",
+            max_items=64,
+            required=False,
+            type="list",
+        ),
+        subnets_add=dict(
+            elements="str",
+            required=False,
+            type="list",
+        ),
+        subnets_remove=dict(
+            elements="str",
+            required=False,
+            type="list",
+        ),
+        validate_references=dict(
+            default=False,
+            required=False,
+            type="bool",
+        ),
+    )
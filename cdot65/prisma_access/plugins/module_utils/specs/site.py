@@ -0,0 +1,152 @@
+"""
+Argument spec of the site module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+from .ike_gateway import (
+    ike_gateway_spec,
+)
+from .ipsec_tunnel import (
+    ipsec_tunnel_spec,
+)
+from .remote_network import (
+    remote_network_spec,
+)
+from .service_connection import (
+    service_connection_spec,
+)
+
+__metaclass__ = type
+
+
+# options of the modules' specs that are set for the whole task rather than per object
+MODULE_OPTIONS = (
+    "auto_spn",
+    "folder",
+    "lookup_strategy",
+    "metrics",
+    "profile",
+    "provider",
+    "state",
+    "subnets_add",
+    "subnets_remove",
+    "validate_placement",
+    "validate_references",
+)
+
+
+def object_spec(spec, optional=()):
+    """Return the options of an object of a site, and the names of those it requires with state=present.
+
+    Every option is left optional in the argument spec, so that a site can
+    be deleted with nothing but its name; the options an object requires are
+    checked when the site is built for state=present.
+    """
+    for key in MODULE_OPTIONS:
+        spec.pop(key, None)
+    required = sorted(
+        key
+        for key, option in spec.items()
+        if option.get("required") and key not in optional
+    )
+    for option in spec.values():
+        option["required"] = False
+    return spec, required
+
+
+def site_objects():
+    """Return the options of each kind of object a site is made of, with the names of those required to create it.
+
+    The options of each object are taken from the spec of the module
+    managing that object, without the module-level options. Names become
+    optional as they default to names derived from the site.
+    """
+    ipsec_tunnel, ipsec_tunnel_required = object_spec(
+        ipsec_tunnel_spec(), ["name"]
+    )
+    ipsec_tunnel["auto_key"]["options"]["ike_gateway"]["required"] = False
+
+    # a site always creates its service connection, so subnets are needed
+    service_connection, service_connection_required = object_spec(
+        service_connection_spec(),
+        ["ipsec_tunnel", "name"],
+    )
+
+    return dict(
+        ike_gateway=object_spec(ike_gateway_spec(), ["name"]),
+        ipsec_tunnel=(ipsec_tunnel, ipsec_tunnel_required),
+        remote_network=object_spec(remote_network_spec(), ["name"]),
+        service_connection=(
+            service_connection,
+            sorted(set(service_connection_required) | {"subnets"}),
+        ),
+    )
+
+
+def site_spec():
+    """Return the site spec."""
+    objects = dict(
+        (kind, dict(options=spec, required=False, type="dict"))
+        for kind, (spec, _required) in site_objects().items()
+    )
+
+    return dict(
+        max_workers=dict(
+            default=8,
+            required=False,
+            type="int",
+        ),
+        metrics=metrics_spec(),
+        profile=profile_spec(),
+        provider=provider_spec(),
+        rate_limit=dict(
+            default=5.0,
+            required=False,
+            type="float",
+        ),
+        sites=dict(
+            elements="dict",
+            mutually_exclusive=[["remote_network", "service_connection"]],
+            required_one_of=[["remote_network", "service_connection"]],
+            options=dict(
+                folder=dict(
+                    choices=[
+                        "Remote Networks",
+                        "Service Connections",
+                    ],
+                    required=False,
+                    type="str",
+                ),
+                ike_gateway=objects["ike_gateway"],
+                ipsec_tunnel=objects["ipsec_tunnel"],
+                name=dict(
+                    max_length=63,
+                    required=True,
+                    type="str",
+                ),
+                remote_network=objects["remote_network"],
+                service_connection=objects["service_connection"],
+            ),
+            required=True,
+            type="list",
+        ),
+        state=dict(
+            required=True,
+            choices=["absent", "present"],
+            type="str",
+        ),
+        validate_references=dict(
+            default=False,
+            required=False,
+            type="bool",
+        ),
+    )
@@ -0,0 +1,65 @@
+"""
+Argument spec of the snapshot_diff module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    profile_spec,
+)
+from .mirror_sync import (
+    MIRROR_TYPE_CHOICES,
+)
+
+__metaclass__ = type
+
+
+def snapshot_diff_spec():
+    """Return the snapshot diff spec."""
+    snapshot_format = dict(
+        choices=[
+            "auto",
+            "jsonl",
+            "sqlite",
+        ],
+        default="auto",
+        required=False,
+        type="str",
+    )
+    return dict(
+        after=dict(
+            required=True,
+            type="path",
+        ),
+        after_format=snapshot_format,
+        before=dict(
+            required=True,
+            type="path",
+        ),
+        before_format=snapshot_format,
+        ignore_keys=dict(
+            default=["id"],
+            elements="str",
+            required=False,
+            type="list",
+        ),
+        max_differences=dict(
+            default=100,
+            required=False,
+            type="int",
+        ),
+        profile=profile_spec(),
+        report=dict(
+            required=False,
+            type="path",
+        ),
+        types=dict(
+            choices=MIRROR_TYPE_CHOICES,
+            elements="str",
+            required=False,
+            type="list",
+        ),
+    )
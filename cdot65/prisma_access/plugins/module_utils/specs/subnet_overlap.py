@@ -0,0 +1,83 @@
+"""
+Argument spec of the subnet_overlap module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+
+__metaclass__ = type
+
+
+def subnet_overlap_spec():
+    """Return the subnet overlap spec."""
+    return dict(
+        candidates=dict(
+            elements="dict",
+            options=dict(
+                name=dict(
+                    required=True,
+                    type="str",
+                ),
+                subnets=dict(
+                    elements="str",
+                    required=True,
+                    type="list",
+                ),
+                type=dict(
+                    choices=[
+                        "remote_network",
+                        "service_connection",
+                    ],
+                    default="remote_network",
+                    required=False,
+                    type="str",
+                ),
+            ),
+            required=False,
+            type="list",
+        ),
+        fail_on_overlap=dict(
+            default=True,
+            required=False,
+            type="bool",
+        ),
+        format=dict(
+            choices=[
+                "auto",
+                "csv",
+                "jsonl",
+            ],
+            default="auto",
+            required=False,
+            type="str",
+        ),
+        max_results=dict(
+            default=1000,
+            required=False,
+            type="int",
+        ),
+        metrics=metrics_spec(),
+        path=dict(
+            required=False,
+            type="path",
+        ),
+        profile=profile_spec(),
+        provider=provider_spec(),
+        scope=dict(
+            choices=[
+                "all",
+                "candidates",
+            ],
+            default="all",
+            required=False,
+            type="str",
+        ),
+    )
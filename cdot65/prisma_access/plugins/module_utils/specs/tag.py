@@ -0,0 +1,88 @@
+"""
+Argument spec of the tag module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+
+__metaclass__ = type
+
+
+def tag_spec():
+    """Return the tag object spec."""
+    return dict(
+        color=dict(
+            type="str",
+            required=False,
+            default=False,
+        ),
+        comments=dict(
+            type="str",
+            required=False,
+            default=False,
+        ),
+        fingerprint_store=dict(
+            required=False,
+            type="path",
+        ),
+        folder=dict(
+            required=True,
+            choices=[
+                "GlobalProtect",
+                "Mobile Users",
+                "Remote Networks",
+                "Service Connections",
+                "Shared",
+            ],
+            type="str",
+        ),
+        lookup_strategy=dict(
+            choices=["create_first", "list_first"],
+            default="list_first",
+            required=False,
+            type="str",
+        ),
+        metrics=metrics_spec(),
+        name=dict(
+            required=True,
+            type="str",
+        ),
+        profile=profile_spec(),
+        provider=provider_spec(),
+        state=dict(
+            required=True,
+            choices=["absent", "present"],
+            type="str",
+        ),
+    )
+
+
+def tag_record_spec():
+    """Return the spec of a tag record read from a file.
+
+    Records use the options of the tag module, without the module-level
+    options; the folder defaults to the module's folder, and unset colors
+    and comments are left out rather than defaulted.
+    """
+    spec = tag_spec()
+    for key in (
+        "fingerprint_store",
+        "lookup_strategy",
+        "metrics",
+        "profile",
+        "provider",
+        "state",
+    ):
+        spec.pop(key)
+    for key in ("color", "comments"):
+        spec[key].pop("default")
+    spec["folder"]["required"] = False
+    return spec
@@ -0,0 +1,58 @@
+"""
+Argument spec of the tenant_export module.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from .common import (
+    metrics_spec,
+    profile_spec,
+    provider_spec,
+)
+from .mirror_sync import (
+    MIRROR_TYPE_CHOICES,
+)
+
+__metaclass__ = type
+
+
+def tenant_export_spec():
+    """Return the tenant export spec."""
+    return dict(
+        compress=dict(
+            required=False,
+            type="bool",
+        ),
+        folders=dict(
+            elements="str",
+            required=False,
+            type="list",
+        ),
+        max_workers=dict(
+            default=8,
+            required=False,
+            type="int",
+        ),
+        metrics=metrics_spec(),
+        path=dict(
+            required=True,
+            type="path",
+        ),
+        profile=profile_spec(),
+        provider=provider_spec(),
+        rate_limit=dict(
+            default=5.0,
+            required=False,
+            type="float",
+        ),
+        types=dict(
+            choices=MIRROR_TYPE_CHOICES,
+            default=MIRROR_TYPE_CHOICES,
+            elements="str",
+            required=False,
+            type="list",
+        ),
+    )
@@ -6,15 +6,24 @@ from __future__ import absolute_import, division, print_function
 from traceback import format_exc
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils._text import to_native
-from ..module_utils.api_spec import (
-    PrismaAccessSpec,
+from ..module_utils.specs.address import (
+    address_spec,
 )
 from ..module_utils.authenticate import (
     get_authenticated_session,
 )
-
-# Prisma Access SDK
-from panapi.config.objects import Address
+from ..module_utils.bulk import (
+    differs,
+)
+from ..module_utils.fingerprint_store import (
+    FingerprintStore,
+)
+from ..module_utils.lookup import (
+    is_name_conflict,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
 
 __metaclass__ = type
 
@@ -34,6 +43,16 @@ options:
             - Description of the address object.
         required: false
         type: str
+    fingerprint_store:
+        description:
+            - path on the controller of a SQLite store recording the fingerprint of the input of every task and the
+              fingerprint of the object the API returned once the task was confirmed
+            - when the input did not change since, the object is read back by id, or by name when it was confirmed
+              absent, and the module exits unchanged without listing the folder if it did not change either;
+              otherwise the object is looked up as usual and the store updated
+            - the store can be shared by every task and fork of a play
+        required: false
+        type: path
     folder:
         choices:
           - "Shared"
@@ -66,11 +85,63 @@ options:
             - wildcard formatted ip address
         required: false
         type: str
+    lookup_strategy:
+        description:
+            - how to find out whether the object already exists
+            - C(list_first) lists the folder before deciding to create the object
+            - C(create_first) attempts the create directly and only lists the folder if the name is already in use,
+              saving an API call per object on greenfield loads
+            - with either strategy, an existing object that does not match the options is updated
+        required: false
+        default: 'list_first'
+        choices:
+          - 'create_first'
+          - 'list_first'
+        type: str
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
     name:
         description:
             - Value of the address object's name
         required: true
         type: str
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
     state:
         description:
             - declare whether you want the resource to exist or be deleted
@@ -95,6 +166,7 @@ EXAMPLES = r"""
         description: "this is an example description"
         folder: "Service Connections"
         ip_netmask: "100.10.254.0/24"
+        lookup_strategy: "create_first"
         name: "Ansible Test"
         state: "present"
         tag: "Automation"
@@ -137,6 +209,20 @@ EXAMPLES = r"""
         name: "Ansible Test"
         state: "present"
 
+    - name: Converge address objects, skipping the folder listing for the ones unchanged since the last run
+      cdot65.prisma_access.address:
+        provider:
+          client_id: "{{ client_id }}"
+          client_secret: "{{ client_secret }}"
+          scope: "{{ scope }}"
+        description: "{{ item.description }}"
+        fingerprint_store: "~/.ansible/cache/cdot65.prisma_access/fingerprints.sqlite"
+        folder: "Shared"
+        ip_netmask: "{{ item.ip_netmask }}"
+        name: "{{ item.name }}"
+        state: "present"
+      loop: "{{ addresses }}"
+
 """
 
 
@@ -151,7 +237,10 @@ def main():
 
     Raises an exception if an error occurs during the module's execution.
     """
-    module = AnsibleModule(argument_spec=PrismaAccessSpec.address_spec())
+    module = AnsibleModule(argument_spec=address_spec())
+
+    # Prisma Access SDK, imported once the arguments have been validated
+    from panapi.config.objects import Address
 
     # -------------------------------------------------------------------------------------------------------------- #
     # 1. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed
@@ -200,6 +289,43 @@ def main():
         # Create an Address object with the address dictionary
         address = Address(**address)
 
+        # With a fingerprint store, an object whose input did not change since its state was last confirmed is only
+        # read back, by id or by name, rather than listing the whole folder
+        store = None
+        if module.params["fingerprint_store"]:
+            store = FingerprintStore(module.params["fingerprint_store"])
+            key = store.key(
+                module.params["provider"]["scope"],
+                "address",
+                module.params["state"],
+                address.payload,
+            )
+            unchanged, config = store.verify(key, session, Address)
+            if unchanged:
+                module.exit_json(
+                    changed=False,
+                    data=config or "Address does not exist, exiting",
+                )
+
+        # With the create_first strategy the Address is created without listing the folder first, falling back to
+        # the lookup below only when the API reports that the name is already in use
+        if (
+            module.params["state"] == "present"
+            and module.params["lookup_strategy"] == "create_first"
+        ):
+            address.create(session)
+            if session.response.status_code == 201:
+                if store:
+                    store.confirm(key, session.response.json())
+                module.exit_json(
+                    changed=True,
+                    data=session.response.json(),
+                )
+            if not is_name_conflict(session.response):
+                module.fail_json(
+                    msg=f"Did not receive proper response: {session.response.text}"
+                )
+
         # Check if an Address with the same name already exists
         already_exists = False
         existing_address = address.list(session)
@@ -208,6 +334,8 @@ def main():
             if address.name == each.name:
                 already_exists = True
                 address.id = each.id
+                current = vars(each)
+                found = each
 
         # Check the state parameter to see if the Address should be created or deleted
         if module.params["state"] == "absent":
@@ -218,12 +346,16 @@ def main():
                     module.fail_json(
                         msg=f"Did not receive proper response: {session.response.text}"
                     )
+                if store:
+                    store.confirm(key)
                 # Exit the module with a success message
                 module.exit_json(
                     changed=True,
                     data=session.response.json(),
                 )
             else:
+                if store:
+                    store.confirm(key)
                 # Exit the module with a message saying the Address doesn't exist
                 module.exit_json(
                     changed=False, data="Address does not exist, exiting"
@@ -237,12 +369,31 @@ def main():
                     module.fail_json(
                         msg=f"Did not receive proper response: {session.response.text}"
                     )
+                if store:
+                    store.confirm(key, session.response.json())
+                # Exit the module with a success message
+                module.exit_json(
+                    changed=True,
+                    data=session.response.json(),
+                )
+            elif differs(address.payload, found):
+                # Update the Address when it does not match the desired configuration, which is also how a name
+                # conflict of the create_first strategy is converged
+                address.update(session)
+                if session.response.status_code != 200:
+                    module.fail_json(
+                        msg=f"Did not receive proper response: {session.response.text}"
+                    )
+                if store:
+                    store.confirm(key, session.response.json())
                 # Exit the module with a success message
                 module.exit_json(
                     changed=True,
                     data=session.response.json(),
                 )
             else:
+                if store:
+                    store.confirm(key, current)
                 # Exit the module with a message saying the Address already exists
                 module.exit_json(
                     changed=False,
@@ -255,4 +406,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main)
@@ -6,15 +6,36 @@ from __future__ import absolute_import, division, print_function
 from traceback import format_exc
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils._text import to_native
-from ..module_utils.api_spec import (
-    PrismaAccessSpec,
+from ..module_utils.specs.address_group import (
+    address_group_spec,
 )
 from ..module_utils.authenticate import (
     get_authenticated_session,
 )
-
-# Prisma Access SDK
-from panapi.config.objects import AddressGroup
+from ..module_utils.bulk import (
+    RateLimiter,
+    apply_object,
+    differs,
+    fan_out,
+    list_objects,
+    summarize,
+)
+from ..module_utils.fingerprint_store import (
+    FingerprintStore,
+)
+from ..module_utils.lookup import (
+    is_name_conflict,
+)
+from ..module_utils.members import (
+    leaf_count,
+    member_changes,
+    merge_members,
+    plan_shards,
+    shard_level,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
 
 __metaclass__ = type
 
@@ -43,6 +64,16 @@ options:
             filter:
                 required: True
                 type: str
+    fingerprint_store:
+        description:
+            - path on the controller of a SQLite store recording the fingerprint of the input of every task and the
+              fingerprint of the object the API returned once the task was confirmed
+            - when the input did not change since, the object is read back by id, or by name when it was confirmed
+              absent, and the module exits unchanged without listing the folder if it did not change either;
+              otherwise the object is looked up as usual and the store updated
+            - the store can be shared by every task and fork of a play
+        required: false
+        type: path
     folder:
         choices:
           - "Shared"
@@ -55,11 +86,113 @@ options:
             - declare where the object should reside.
         required: true
         type: str
+    lookup_strategy:
+        description:
+            - how to find out whether the object already exists
+            - C(list_first) lists the folder before deciding to create the object
+            - C(create_first) attempts the create directly and only lists the folder if the name is already in use,
+              saving an API call per object on greenfield loads
+            - with either strategy, an existing object that does not match the options is updated
+            - I(members_add) and I(members_remove) always list the folder first, as they change the live members
+        required: false
+        default: 'list_first'
+        choices:
+          - 'create_first'
+          - 'list_first'
+        type: str
+    members_add:
+        description:
+            - addresses added to the static members of the group, without replacing them
+            - the group is created with these members when it does not exist
+            - mutually exclusive with I(static) and I(dynamic), and only accepted with I(state=present)
+        required: false
+        type: list
+        elements: str
+    members_remove:
+        description:
+            - addresses removed from the static members of the group
+            - mutually exclusive with I(static) and I(dynamic), and only accepted with I(state=present)
+        required: false
+        type: list
+        elements: str
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
     name:
         description:
             - Value of the address group object's name
         required: true
         type: str
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
+    shard:
+        description:
+            - spread the I(static) members of the group over child groups of at most I(shard.max_members) members,
+              named after the group with a C(-shard-<n>) suffix, the group holding the child groups instead
+            - members are assigned to child groups by a consistent hash of their names, so adding or removing a few
+              members only changes the child groups holding them; the folder is listed once and only the child
+              groups whose members changed are written, several of them concurrently
+            - when there are more child groups than I(shard.max_members), they are themselves held by groups named
+              with a C(-shard-l<level>-<n>) suffix, forming a balanced tree
+            - child groups no longer needed are deleted, and with I(state=absent) the group and all of its child
+              groups are deleted
+            - mutually exclusive with I(dynamic), I(members_add), I(members_remove) and I(fingerprint_store)
+        required: false
+        type: dict
+        suboptions:
+            max_members:
+                description:
+                    - maximum number of members of a group; a group with no more members than this holds them
+                      directly
+                required: false
+                default: 64
+                type: int
+            max_workers:
+                description:
+                    - number of child groups written concurrently
+                required: false
+                default: 8
+                type: int
+            rate_limit:
+                description:
+                    - maximum number of API calls per second; 0 disables limiting
+                required: false
+                default: 5.0
+                type: float
     state:
         description:
             - declare whether you want the resource to exist or be deleted
@@ -71,6 +204,7 @@ options:
     static:
         description:
             - declare whether the address group object is static
+            - at most 64 members, unless they are spread over child groups with I(shard)
         required: false
         type: list
 
@@ -110,9 +244,158 @@ EXAMPLES = r"""
           - "ansible-test"
         state: "present"
 
+    - name: Add a web server to an existing address group without replacing its members
+      cdot65.prisma_access.address_group:
+        provider:
+          client_id: "{{ client_id }}"
+          client_secret: "{{ client_secret }}"
+          scope: "{{ scope }}"
+        name: "AnsibleTestGroupStatic"
+        folder: "Service Connections"
+        description: "This is just a test"
+        members_add:
+          - "web-03"
+        members_remove:
+          - "web-01"
+        state: "present"
+
+    - name: Spread thousands of addresses over child groups of at most 64 members
+      cdot65.prisma_access.address_group:
+        provider:
+          client_id: "{{ client_id }}"
+          client_secret: "{{ client_secret }}"
+          scope: "{{ scope }}"
+        name: "AnsibleTestGroupLarge"
+        folder: "Shared"
+        description: "This is just a test"
+        static: "{{ blocklist_addresses }}"
+        shard:
+          max_members: 64
+        state: "present"
+
 """
 
 
+def apply_shards(module, session, object_class, address_group):
+    """Converge a static address group whose members are spread over child groups, returning a result per group.
+
+    The folder is listed once. Child groups are written level by level,
+    bottom-up, so that every group only refers to groups that exist, then
+    the group itself, and the child groups no longer needed are deleted last,
+    top-down. Groups whose members are the same, in any order, are left
+    untouched.
+    """
+    shard = module.params["shard"]
+    name, folder = address_group["name"], address_group["folder"]
+    limiter = RateLimiter(shard["rate_limit"])
+
+    existing = dict(
+        (each.name, each)
+        for each in list_objects(session, object_class, folder, limiter)
+    )
+    stale = dict(
+        (each, shard_level(name, each))
+        for each in existing
+        if shard_level(name, each) is not None
+    )
+
+    def desired_group(config):
+        # keep the live order of members that did not change, so the group is not rewritten
+        current = existing.get(config["name"])
+        live = getattr(current, "static", None) or []
+        if current is not None and set(live) == set(config["static"]):
+            config = dict(config, static=live)
+        return config, current
+
+    def converge(item):
+        (config, current), state = item
+        result = apply_object(
+            session, object_class, config, current, state, limiter
+        )
+        if state == "present":
+            result["members"] = len(config["static"])
+        return result
+
+    results = []
+    if module.params["state"] == "present":
+        levels, members = plan_shards(
+            name,
+            address_group["static"],
+            shard["max_members"],
+            leaf_count(name, existing),
+        )
+        for level in levels:
+            for child_name, _members in level:
+                if len(child_name) > 63:
+                    raise ValueError(
+                        f"{child_name} is longer than 63 characters; shorten the name of the group"
+                    )
+
+        for level in levels:
+            results.extend(
+                fan_out(
+                    converge,
+                    [
+                        (
+                            desired_group(
+                                {
+                                    "description": f"Shard of address group {name}",
+                                    "folder": folder,
+                                    "name": child_name,
+                                    "static": child_members,
+                                }
+                            ),
+                            "present",
+                        )
+                        for child_name, child_members in level
+                    ],
+                    shard["max_workers"],
+                )
+            )
+            if any(result["result"] == "failed" for result in results):
+                return results
+
+            for child_name, _members in level:
+                stale.pop(child_name, None)
+
+        config = dict(
+            (key, value)
+            for key, value in address_group.items()
+            if value is not None
+        )
+        results.append(
+            converge((desired_group(dict(config, static=members)), "present"))
+        )
+        if results[-1]["result"] == "failed":
+            return results
+    else:
+        results.append(
+            converge(((address_group, existing.get(name)), "absent"))
+        )
+        if results[-1]["result"] == "failed":
+            return results
+
+    # delete the groups holding other child groups before the groups they hold
+    for level in sorted(set(stale.values()), reverse=True):
+        results.extend(
+            fan_out(
+                converge,
+                [
+                    (
+                        ({"folder": folder, "name": each}, existing[each]),
+                        "absent",
+                    )
+                    for each in sorted(stale)
+                    if stale[each] == level
+                ],
+                shard["max_workers"],
+            )
+        )
+        if any(result["result"] == "failed" for result in results):
+            return results
+    return results
+
+
 def main():
     """This is the main function that contains the logic for creating, modifying,
         and deleting an Address Group on the Prisma Access platform.
@@ -124,7 +407,30 @@ def main():
 
     Raises an exception if an error occurs during the module's execution.
     """
-    module = AnsibleModule(argument_spec=PrismaAccessSpec.address_group_spec())
+    module = AnsibleModule(
+        argument_spec=address_group_spec(),
+        mutually_exclusive=[
+            ["dynamic", "members_add"],
+            ["dynamic", "members_remove"],
+            ["static", "members_add"],
+            ["static", "members_remove"],
+            ["shard", "dynamic"],
+            ["shard", "fingerprint_store"],
+            ["shard", "members_add"],
+            ["shard", "members_remove"],
+        ],
+    )
+
+    # member additions and removals change a live group, they must never delete it
+    if module.params["state"] != "present" and (
+        module.params["members_add"] or module.params["members_remove"]
+    ):
+        module.fail_json(
+            msg="members_add and members_remove require state=present"
+        )
+
+    # Prisma Access SDK, imported once the arguments have been validated
+    from panapi.config.objects import AddressGroup
 
     # -------------------------------------------------------------------------------------------------------------- #
     # 1. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed
@@ -157,18 +463,99 @@ def main():
         address_group["static"] = module.params["static"]
     elif module.params["dynamic"]:
         address_group["dynamic"] = module.params["dynamic"]
-    else:
+    elif module.params["members_add"] or module.params["members_remove"]:
+        # merged into the members of the live group below, or its only members when the group is created
+        address_group["static"] = merge_members(
+            [], module.params["members_add"], module.params["members_remove"]
+        )
+    elif not module.params["shard"] or module.params["state"] == "present":
+        # a sharded group and its child groups are deleted by name alone
         module.fail_json(
             msg="Must define either static or dynamic address group"
         )
 
     # -------------------------------------------------------------------------------------------------------------- #
-    # 4. create an instance of the "AddressGroup" class using the address_group dictionary.                          #
+    # 4. With shard, converge the group together with the child groups its static members are spread over.          #
+    # -------------------------------------------------------------------------------------------------------------- #
+    if module.params["shard"]:
+        try:
+            results = apply_shards(
+                module, session, AddressGroup, address_group
+            )
+        except Exception as exception_error:
+            module.fail_json(
+                msg=to_native(exception_error), exception=format_exc()
+            )
+
+        summary = summarize(results)
+        failed_records = [
+            result for result in results if result["result"] == "failed"
+        ]
+        changed = any(
+            result["result"] not in ("absent", "unchanged")
+            for result in results
+        )
+        if failed_records:
+            module.fail_json(
+                msg=f"{len(failed_records)} of {len(results)} address groups failed",
+                changed=changed,
+                failed_records=failed_records,
+                groups=results,
+                summary=summary,
+            )
+        module.exit_json(
+            changed=changed,
+            groups=results,
+            summary=summary,
+        )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 5. create an instance of the "AddressGroup" class using the address_group dictionary.                          #
     # -------------------------------------------------------------------------------------------------------------- #
     try:
         # Create an AddressGroup object with the ike_gateway dictionary
         group = AddressGroup(**address_group)
 
+        # With a fingerprint store, an object whose input did not change since its state was last confirmed is only
+        # read back, by id or by name, rather than listing the whole folder
+        store = None
+        if module.params["fingerprint_store"]:
+            store = FingerprintStore(module.params["fingerprint_store"])
+            key = store.key(
+                module.params["provider"]["scope"],
+                "address_group",
+                module.params["state"],
+                group.payload,
+            )
+            unchanged, config = store.verify(key, session, AddressGroup)
+            if unchanged:
+                module.exit_json(
+                    changed=False,
+                    data=config or "Group does not exist, exiting",
+                )
+
+        # With the create_first strategy the AddressGroup is created without listing the folder first, falling back to
+        # the lookup below only when the API reports that the name is already in use. Member additions and removals
+        # are applied to the live members, so they always go through the lookup.
+        if (
+            module.params["state"] == "present"
+            and module.params["lookup_strategy"] == "create_first"
+            and not module.params["members_add"]
+            and not module.params["members_remove"]
+        ):
+            group.create(session)
+            if session.response.status_code == 201:
+                if store:
+                    store.confirm(key, session.response.json())
+                module.exit_json(
+                    changed=True,
+                    data=session.response.json(),
+                )
+            if not is_name_conflict(session.response):
+                module.fail_json(
+                    msg=f"Did not receive proper response: {session.response.text}"
+                )
+
         # Check if an AddressGroup with the same name already exists
         already_exists = False
         existing_address_group = group.list(session)
@@ -177,6 +564,8 @@ def main():
             if group.name == each.name:
                 already_exists = True
                 group.id = each.id
+                current = vars(each)
+                found = each
 
         # Check the state parameter to see if the AddressGroup should be created or deleted
         if module.params["state"] == "absent":
@@ -187,12 +576,16 @@ def main():
                     module.fail_json(
                         msg=f"Did not receive proper response: {session.response.text}"
                     )
+                if store:
+                    store.confirm(key)
                 # Exit the module with a success message
                 module.exit_json(
                     changed=True,
                     data=session.response.json(),
                 )
             else:
+                if store:
+                    store.confirm(key)
                 # Exit the module with a message saying the AddressGroup doesn't exist
                 module.exit_json(
                     changed=False, data="Group does not exist, exiting"
@@ -200,18 +593,76 @@ def main():
 
         else:
             if already_exists is False:
+                if "static" in address_group and not address_group["static"]:
+                    module.fail_json(
+                        msg=f"{group.name} does not exist; members_add is required to create it"
+                    )
                 # Create the AddressGroup if it doesn't exist
                 group.create(session)
                 if session.response.status_code != 201:
                     module.fail_json(
                         msg=f"Did not receive proper response: {session.response.text}"
                     )
+                if store:
+                    store.confirm(key, session.response.json())
+                # Exit the module with a success message
+                module.exit_json(
+                    changed=True,
+                    data=session.response.json(),
+                )
+            elif (
+                module.params["members_add"] or module.params["members_remove"]
+            ):
+                # Apply the member additions and removals to the live members, updating only when they differ
+                if "static" not in current:
+                    module.fail_json(
+                        msg=f"{group.name} is not a static address group"
+                    )
+                members = merge_members(
+                    current["static"],
+                    module.params["members_add"],
+                    module.params["members_remove"],
+                )
+                added, removed = member_changes(current["static"], members)
+                if not added and not removed:
+                    if store:
+                        store.confirm(key, current)
+                    module.exit_json(changed=False, members=members)
+
+                group = AddressGroup(**dict(current, static=members))
+                group.update(session)
+                if session.response.status_code != 200:
+                    module.fail_json(
+                        msg=f"Did not receive proper response: {session.response.text}"
+                    )
+                if store:
+                    store.confirm(key, session.response.json())
+                # Exit the module with a success message
+                module.exit_json(
+                    changed=True,
+                    data=session.response.json(),
+                    members=members,
+                    members_added=added,
+                    members_removed=removed,
+                )
+            elif differs(group.payload, found):
+                # Update the AddressGroup when it does not match the desired configuration, which is also how a name
+                # conflict of the create_first strategy is converged
+                group.update(session)
+                if session.response.status_code != 200:
+                    module.fail_json(
+                        msg=f"Did not receive proper response: {session.response.text}"
+                    )
+                if store:
+                    store.confirm(key, session.response.json())
                 # Exit the module with a success message
                 module.exit_json(
                     changed=True,
                     data=session.response.json(),
                 )
             else:
+                if store:
+                    store.confirm(key, current)
                 # Exit the module with a message saying the AddressGroup already exists
                 module.exit_json(
                     changed=False,
@@ -224,4 +675,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main)
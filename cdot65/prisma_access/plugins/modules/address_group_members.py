@@ -0,0 +1,339 @@
+"""
+Ansible module for adding and removing static members of many address groups in Prisma Access.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+from traceback import format_exc
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils._text import to_native
+from ..module_utils.specs.address_group_members import (
+    address_group_members_spec,
+)
+from ..module_utils.authenticate import (
+    get_authenticated_session,
+)
+from ..module_utils.bulk import (
+    RateLimiter,
+    apply_object,
+    fan_out,
+    list_objects,
+    plan_object,
+    summarize,
+)
+from ..module_utils.members import (
+    member_changes,
+    merge_members,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: address_group_members
+
+short_description: Add and remove static members of many address groups.
+
+version_added: "0.1.9"
+
+description:
+    - Add addresses to and remove addresses from the static members of existing address groups, many groups in a
+      single task, without deleting and recreating groups that policies refer to.
+    - Every folder is listed once, the additions and removals of each group are applied to its live members, and
+      only the groups whose members change are updated, each with a single call, several of them concurrently.
+    - The other settings of the groups, such as their description and tags, are kept.
+    - Supports check mode, reporting the members every group would gain and lose.
+
+options:
+    folder:
+        description:
+            - folder of the groups that do not set their own
+        required: false
+        default: "Shared"
+        type: str
+        choices:
+            - "GlobalProtect"
+            - "Mobile Users"
+            - "Remote Networks"
+            - "Service Connections"
+            - "Shared"
+    groups:
+        description:
+            - address groups to change, each with the members added and removed
+        required: true
+        type: list
+        elements: dict
+        suboptions:
+            folder:
+                description:
+                    - folder of the group, I(folder) by default
+                required: false
+                type: str
+                choices:
+                    - "GlobalProtect"
+                    - "Mobile Users"
+                    - "Remote Networks"
+                    - "Service Connections"
+                    - "Shared"
+            members_add:
+                description:
+                    - addresses added to the static members of the group
+                required: false
+                type: list
+                elements: str
+            members_remove:
+                description:
+                    - addresses removed from the static members of the group
+                required: false
+                type: list
+                elements: str
+            name:
+                description:
+                    - name of the group
+                required: true
+                type: str
+    max_workers:
+        description:
+            - number of groups updated concurrently
+        required: false
+        default: 8
+        type: int
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
+    rate_limit:
+        description:
+            - maximum number of API calls per second; 0 disables limiting
+        required: false
+        default: 5.0
+        type: float
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+    - name: Move the web servers from the old to the new farm
+      cdot65.prisma_access.address_group_members:
+        provider:
+          client_id: "{{ client_id }}"
+          client_secret: "{{ client_secret }}"
+          scope: "{{ scope }}"
+        groups:
+          - name: "web-farm-old"
+            members_remove:
+              - "web-03"
+              - "web-04"
+          - name: "web-farm-new"
+            members_add:
+              - "web-03"
+              - "web-04"
+          - name: "dmz-servers"
+            folder: "Remote Networks"
+            members_add:
+              - "web-04"
+"""
+
+RETURN = r"""
+failed_records:
+    description: result of every group that could not be changed
+    returned: always
+    type: list
+    elements: dict
+groups:
+    description: result of every group, with the members it gained and lost and its number of members
+    returned: always
+    type: list
+    elements: dict
+metrics:
+    description: API requests made by the module and the time spent authenticating, listing and writing
+    returned: when I(metrics) is enabled
+    type: dict
+summary:
+    description: number of groups per result
+    returned: always
+    type: dict
+"""
+
+
+def main():
+    """This is the main function that contains the logic for adding and removing static members of many address
+        groups on the Prisma Access platform.
+
+    It takes no arguments and returns no values.
+
+    It uses the AnsibleModule class to get the module's argument specification and process the results of the
+        module's actions.
+
+    Raises an exception if an error occurs during the module's execution.
+    """
+    module = AnsibleModule(
+        argument_spec=address_group_members_spec(),
+        supports_check_mode=True,
+    )
+
+    # Prisma Access SDK, imported once the arguments have been validated
+    from panapi.config.objects import AddressGroup
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 1. Check that every group is only given once, and collect the folders to list.                                 #
+    # -------------------------------------------------------------------------------------------------------------- #
+    requested = []
+    for each in module.params["groups"]:
+        key = (each["folder"] or module.params["folder"], each["name"])
+        requested.append(key)
+    if len(set(requested)) != len(requested):
+        duplicates = sorted(
+            set(key for key in requested if requested.count(key) > 1)
+        )
+        module.fail_json(
+            msg="address groups given more than once: "
+            + ", ".join(f"{name} of {folder}" for folder, name in duplicates)
+        )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 2. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed  #
+    #    through the Ansible module.                                                                                 #
+    # -------------------------------------------------------------------------------------------------------------- #
+    try:
+        # get the provider parameter from the Ansible module, which includes the authentication credentials
+        session = get_authenticated_session(module)
+
+    except Exception as exception_error:
+        # if an exception occurs during the authentication process, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    limiter = RateLimiter(module.params["rate_limit"])
+
+    try:
+        # ---------------------------------------------------------------------------------------------------------- #
+        # 3. List every folder once.                                                                                 #
+        # ---------------------------------------------------------------------------------------------------------- #
+        existing = {}
+        for folder in sorted(set(folder for folder, _name in requested)):
+            for each in list_objects(session, AddressGroup, folder, limiter):
+                existing[(folder, each.name)] = each
+
+        # ---------------------------------------------------------------------------------------------------------- #
+        # 4. Apply the additions and removals of every group to its live members, updating the groups that change   #
+        #    concurrently.                                                                                           #
+        # ---------------------------------------------------------------------------------------------------------- #
+        def apply(item):
+            (folder, name), params = item
+            current = existing.get((folder, name))
+            result = {"name": name, "folder": folder}
+
+            if current is None:
+                result["result"] = "failed"
+                result["msg"] = f"address group {name} does not exist"
+                return result
+            if getattr(current, "static", None) is None:
+                result["result"] = "failed"
+                result["msg"] = f"{name} is not a static address group"
+                return result
+
+            members = merge_members(
+                current.static, params["members_add"], params["members_remove"]
+            )
+            added, removed = member_changes(current.static, members)
+            desired = dict(vars(current), folder=folder, static=members)
+
+            if not module.check_mode:
+                result.update(
+                    apply_object(
+                        session,
+                        AddressGroup,
+                        desired,
+                        current,
+                        "present",
+                        limiter,
+                    )
+                )
+            else:
+                result.update(plan_object(desired, current, "present"))
+
+            result["members_added"] = added
+            result["members_removed"] = removed
+            result["members"] = len(members)
+            return result
+
+        results = fan_out(
+            apply,
+            list(zip(requested, module.params["groups"])),
+            module.params["max_workers"],
+        )
+
+    except Exception as exception_error:
+        # If an exception occurs, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 5. Count the results.                                                                                          #
+    # -------------------------------------------------------------------------------------------------------------- #
+    summary = summarize(results)
+    failed_records = [
+        result for result in results if result["result"] == "failed"
+    ]
+    changed = bool(summary.get("updated"))
+
+    if failed_records:
+        module.fail_json(
+            msg=f"{len(failed_records)} of {len(results)} address groups failed",
+            changed=changed,
+            failed_records=failed_records,
+            groups=results,
+            summary=summary,
+        )
+
+    module.exit_json(
+        changed=changed,
+        failed_records=failed_records,
+        groups=results,
+        summary=summary,
+    )
+
+
+if __name__ == "__main__":
+    run_profiled(main)
@@ -0,0 +1,304 @@
+"""
+Ansible module for previewing the members of a dynamic address group from the local mirror of a tenant.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+import time
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils._text import to_native
+from ..module_utils.specs.address_group_preview import (
+    address_group_preview_spec,
+)
+from ..module_utils.dynamic_filter import (
+    DynamicFilter,
+    TagIndex,
+)
+from ..module_utils.mirror import (
+    Mirror,
+    mirror_path,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: address_group_preview
+
+short_description: Preview the members of a dynamic address group.
+
+version_added: "0.1.9"
+
+description:
+    - Evaluate the tag filter of a dynamic address group against the addresses of the mirror maintained by the
+      mirror_sync module, returning the number and names of the addresses it matches, without contacting the API.
+    - The filter combines quoted tags with C(and), C(or), C(not) and parentheses, C(not) binding tighter than
+      C(and), and C(and) tighter than C(or). It is compiled once, and evaluated over a bitset per tag built from the
+      tag index of the mirror, so tenants with hundreds of thousands of addresses are previewed in milliseconds.
+    - Either preview a filter before the group is created, or the filter of a dynamic group already in the mirror.
+
+options:
+    filter:
+        description:
+            - tag filter to evaluate, as for the I(dynamic.filter) option of the address_group module
+            - mutually exclusive with I(group)
+        required: false
+        type: str
+    folder:
+        description:
+            - folder of the group; addresses of this folder and of C(Shared) are evaluated
+            - by default addresses of every folder are evaluated
+        required: false
+        type: str
+    group:
+        description:
+            - name of a dynamic address group of the mirror whose filter is evaluated
+            - mutually exclusive with I(filter)
+        required: false
+        type: str
+    max_age:
+        description:
+            - fail when a listing of the addresses, or of the address groups with I(group), was synced more than this
+              number of seconds ago
+        required: false
+        type: int
+    max_members:
+        description:
+            - maximum number of members returned; I(count) always holds the number of addresses matched
+        required: false
+        default: 1000
+        type: int
+    path:
+        description:
+            - path of the SQLite database
+            - defaults to the mirror of the tenant of I(scope) or I(provider)
+        required: false
+        type: path
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
+    provider:
+        description:
+            - tenant whose mirror is read, when neither I(path) nor I(scope) is given; only its scope is used, so
+              its credentials can be left out
+            - accepted so the provider of a play can be shared with this module; reading the mirror makes no API
+              requests
+        required: false
+        type: dict
+    scope:
+        description:
+            - scope of the tenant whose mirror is read, when I(path) is not given, as for the mirror lookup
+        required: false
+        type: str
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+    - name: Preview the web servers a new dynamic group would hold
+      cdot65.prisma_access.address_group_preview:
+        scope: "{{ scope }}"
+        filter: "'web' and ('prod' or 'dr') and not 'retired'"
+        folder: "Shared"
+        max_age: 3600
+      register: preview
+"""
+
+RETURN = r"""
+addresses:
+    description: number of addresses the filter was evaluated against
+    returned: always
+    type: int
+count:
+    description: number of addresses matching the filter
+    returned: always
+    type: int
+database:
+    description: path of the SQLite database
+    returned: always
+    type: str
+filter:
+    description: filter evaluated, normalized with every tag quoted
+    returned: always
+    type: str
+members:
+    description: folder and name of the first I(max_members) addresses matching the filter, sorted by folder and name
+    returned: always
+    type: list
+    elements: dict
+seconds:
+    description: time spent indexing the tags of the filter and evaluating it
+    returned: always
+    type: float
+synced:
+    description: time the oldest listing read was synced, in seconds since the epoch
+    returned: always
+    type: float
+tags:
+    description: number of addresses carrying each tag of the filter
+    returned: always
+    type: dict
+"""
+
+
+def main():
+    """This is the main function that contains the logic for previewing the members of a dynamic address group
+        from the local SQLite mirror of a tenant of the Prisma Access platform.
+
+    It takes no arguments and returns no values.
+
+    It uses the AnsibleModule class to get the module's argument specification and process the results of the
+        module's actions.
+
+    Raises an exception if an error occurs during the module's execution.
+    """
+    module = AnsibleModule(
+        argument_spec=address_group_preview_spec(),
+        mutually_exclusive=[["filter", "group"]],
+        required_one_of=[["filter", "group"], ["path", "provider", "scope"]],
+        supports_check_mode=True,
+    )
+
+    scope = module.params["scope"] or (module.params["provider"] or {}).get(
+        "scope"
+    )
+    if not scope and not module.params["path"]:
+        module.fail_json(msg="scope is required when path is not given")
+    path = mirror_path(scope, module.params["path"])
+    folder = module.params["folder"]
+
+    try:
+        with Mirror(path) as mirror:
+            # ------------------------------------------------------------------------------------------------------ #
+            # 1. Read the filter of the group from the mirror, when previewing an existing group.                    #
+            # ------------------------------------------------------------------------------------------------------ #
+            expression = module.params["filter"]
+            if module.params["group"]:
+                groups = mirror.query(
+                    object_type="address_group",
+                    names=[module.params["group"]],
+                    folder=folder,
+                )
+                if len(groups) != 1:
+                    module.fail_json(
+                        msg=f"{len(groups)} address groups named {module.params['group']} in the mirror; "
+                        "set folder to pick one",
+                        database=path,
+                    )
+                expression = (groups[0].get("dynamic") or {}).get("filter")
+                if not expression:
+                    module.fail_json(
+                        msg=f"address group {module.params['group']} is not dynamic",
+                        database=path,
+                    )
+                folder = groups[0]["folder"]
+
+            # ------------------------------------------------------------------------------------------------------ #
+            # 2. Check that the listings read are recent enough.                                                     #
+            # ------------------------------------------------------------------------------------------------------ #
+            folders = None
+            if folder:
+                folders = sorted({folder, "Shared"})
+
+            listings = [
+                each
+                for each in mirror.listings()
+                if each["type"] == "address"
+                or (module.params["group"] and each["type"] == "address_group")
+            ]
+            if folders:
+                listings = [
+                    each
+                    for each in listings
+                    if each["type"] != "address" or each["folder"] in folders
+                ]
+            synced = min((each["synced"] for each in listings), default=None)
+
+            if synced is None:
+                module.fail_json(
+                    msg=f"{path} holds no listing of addresses; run mirror_sync first",
+                    database=path,
+                )
+            if (
+                module.params["max_age"] is not None
+                and time.time() - synced > module.params["max_age"]
+            ):
+                module.fail_json(
+                    msg=f"{path} was last synced {time.time() - synced:.0f} seconds ago, more than max_age",
+                    database=path,
+                    synced=synced,
+                )
+
+            # ------------------------------------------------------------------------------------------------------ #
+            # 3. Compile the filter, index the addresses carrying its tags, and evaluate it.                         #
+            # ------------------------------------------------------------------------------------------------------ #
+            started = time.monotonic()
+            dynamic_filter = DynamicFilter(expression)
+            index = TagIndex(
+                mirror.tagged("address", dynamic_filter.tags, folders),
+                mirror.count("address", folders),
+            )
+            matched = dynamic_filter.evaluate(index)
+            members = index.members(
+                matched,
+                module.params["max_members"],
+                mirror.keys("address", folders),
+            )
+            seconds = round(time.monotonic() - started, 3)
+
+    except Exception as exception_error:
+        module.fail_json(msg=to_native(exception_error), database=path)
+
+    module.exit_json(
+        changed=False,
+        addresses=len(index),
+        count=index.count(matched),
+        database=path,
+        filter=dynamic_filter.text,
+        members=[
+            {"folder": member_folder, "name": name}
+            for member_folder, name in members
+        ],
+        seconds=seconds,
+        synced=synced,
+        tags=dict(
+            (tag, index.count(index.postings.get(tag, 0)))
+            for tag in sorted(dynamic_filter.tags)
+        ),
+    )
+
+
+if __name__ == "__main__":
+    run_profiled(main)
@@ -0,0 +1,202 @@
+"""
+Ansible module for reporting the bandwidth allocations and SPN load of Prisma Access remote networks.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+from traceback import format_exc
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils._text import to_native
+from ..module_utils.specs.bandwidth_allocation_info import (
+    bandwidth_allocation_info_spec,
+)
+from ..module_utils.authenticate import (
+    get_authenticated_session,
+)
+from ..module_utils.capacity import (
+    CapacityCache,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: bandwidth_allocation_info
+
+short_description: Report bandwidth allocations, SPNs and their load per region.
+
+version_added: "0.1.9"
+
+description:
+    - Report the bandwidth allocated to every aggregate region, the compute regions it covers, its SPNs and the
+      number of remote networks placed on each SPN.
+    - The report is built from the same per-tenant cache on the controller that the remote_network module uses to
+      validate placements, so it is only fetched from the API once per I(cache_ttl).
+
+options:
+    cache_ttl:
+        description:
+            - number of seconds a cached report is reused
+        required: false
+        default: 300
+        type: int
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
+    refresh:
+        description:
+            - fetch the report from the API even when a cached one is still valid
+        required: false
+        default: false
+        type: bool
+    regions:
+        description:
+            - only report these aggregate or compute regions
+        required: false
+        type: list
+        elements: str
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+    - name: Show the SPNs of the us-southeast aggregate region
+      cdot65.prisma_access.bandwidth_allocation_info:
+        provider:
+          client_id: "{{ client_id }}"
+          client_secret: "{{ client_secret }}"
+          scope: "{{ scope }}"
+        regions:
+          - "us-southeast"
+      register: capacity
+"""
+
+RETURN = r"""
+allocations:
+    description: bandwidth allocations, with their compute regions and the number of remote networks on each SPN
+    returned: always
+    type: list
+    elements: dict
+fetched:
+    description: time the report was fetched from the API, in seconds since the epoch
+    returned: always
+    type: float
+metrics:
+    description: API requests made by the module and the time spent authenticating, listing and writing
+    returned: when I(metrics) is enabled
+    type: dict
+"""
+
+
+def main():
+    """This is the main function that contains the logic for reporting the bandwidth allocations of the
+        Prisma Access platform.
+
+    It takes no arguments and returns no values.
+
+    It uses the AnsibleModule class to get the module's argument specification and process the results of the
+        module's actions.
+
+    Raises an exception if an error occurs during the module's execution.
+    """
+    module = AnsibleModule(
+        argument_spec=bandwidth_allocation_info_spec(),
+        supports_check_mode=True,
+    )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 1. Use the cached report when it is recent enough, authenticating only when it has to be fetched.              #
+    # -------------------------------------------------------------------------------------------------------------- #
+    cache = CapacityCache(
+        module.params["provider"]["scope"], ttl=module.params["cache_ttl"]
+    )
+    snapshot = None if module.params["refresh"] else cache.read()
+
+    if snapshot is None:
+        try:
+            # get the provider parameter from the Ansible module, which includes the authentication credentials
+            session = get_authenticated_session(module)
+            snapshot = cache.get(session, refresh=True)
+
+        except Exception as exception_error:
+            # If an exception occurs, fail the module and return an error message
+            module.fail_json(
+                msg=to_native(exception_error), exception=format_exc()
+            )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 2. Report every allocation with its compute regions and SPN load.                                              #
+    # -------------------------------------------------------------------------------------------------------------- #
+    compute_regions = {}
+    for region, aggregate_region in snapshot["regions"].items():
+        compute_regions.setdefault(aggregate_region, []).append(region)
+
+    wanted = set(module.params["regions"] or [])
+    allocations = []
+    for name, allocation in sorted(snapshot["allocations"].items()):
+        regions = sorted(compute_regions.get(name, []))
+        if wanted and name not in wanted and not wanted.intersection(regions):
+            continue
+        allocations.append(
+            {
+                "name": name,
+                "allocated_bandwidth": allocation["allocated_bandwidth"],
+                "regions": regions,
+                "spns": [
+                    {
+                        "name": spn_name,
+                        "remote_networks": snapshot["spn_load"].get(
+                            spn_name, 0
+                        ),
+                    }
+                    for spn_name in allocation["spn_name_list"]
+                ],
+            }
+        )
+
+    module.exit_json(
+        changed=False, allocations=allocations, fetched=snapshot["fetched"]
+    )
+
+
+if __name__ == "__main__":
+    run_profiled(main)
@@ -0,0 +1,544 @@
+"""
+Ansible module for importing tags, addresses and address groups in bulk from a CSV or JSONL file.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+import json
+from traceback import format_exc
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils._text import to_native
+from ..module_utils.specs.bulk_import import (
+    bulk_import_spec,
+)
+from ..module_utils.specs.address import (
+    address_record_spec,
+)
+from ..module_utils.specs.address_group import (
+    address_group_record_spec,
+)
+from ..module_utils.specs.tag import (
+    tag_record_spec,
+)
+from ..module_utils.authenticate import (
+    get_authenticated_session,
+)
+from ..module_utils.bulk import (
+    RateLimiter,
+    apply_object,
+    list_objects,
+    plan_object,
+    stream_fan_out,
+    strip_none,
+)
+from ..module_utils.mirror import (
+    object_class,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+from ..module_utils.records import (
+    read_records,
+    validate_record,
+)
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: bulk_import
+
+short_description: Import tags, addresses and address groups in bulk from a CSV or JSONL file.
+
+version_added: "0.1.9"
+
+description:
+    - Create, update or delete the tags, addresses and address groups described by a CSV or JSONL file on the
+      controller, such as objects migrated from another firewall or an export of the tenant_export module.
+    - Every record uses the options of the tag, address or address_group module, and declares its type under
+      C(object_type) unless I(object_type) is given. In CSV files, list values such as C(tag) are comma separated
+      within a quoted cell, and nested options are written as JSON. The C(id) of exported records is ignored.
+    - The file is streamed, never loaded whole; a first pass validates every record, then the records of each type
+      are applied in dependency order, tags first and address groups last, or the reverse when deleting. Each type
+      is listed once per folder, and records are applied concurrently with at most I(max_workers) in flight.
+    - Invalid records, and records the API refuses, are written to I(rejects) in a format the module reads back, so
+      they can be corrected and imported again.
+    - Supports check mode, reporting what would be created, updated or deleted.
+
+options:
+    folder:
+        description:
+            - folder of the records that do not declare their own
+        required: false
+        default: "Shared"
+        type: str
+    format:
+        description:
+            - format of the file; C(auto) picks CSV for files ending in C(.csv) and JSONL otherwise
+            - files ending in C(.gz) are decompressed as they are read
+        required: false
+        default: "auto"
+        type: str
+        choices:
+            - "auto"
+            - "csv"
+            - "jsonl"
+    max_errors:
+        description:
+            - maximum number of invalid and failed records returned
+        required: false
+        default: 50
+        type: int
+    max_rejects:
+        description:
+            - number of invalid records tolerated; invalid records are skipped and written to I(rejects)
+            - nothing is written to the tenant when more records than this are invalid
+        required: false
+        default: 0
+        type: int
+    max_workers:
+        description:
+            - number of records applied concurrently
+        required: false
+        default: 8
+        type: int
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
+    object_type:
+        description:
+            - type of the records that do not declare their own under C(object_type)
+        required: false
+        type: str
+        choices:
+            - "address"
+            - "address_group"
+            - "tag"
+    path:
+        description:
+            - path on the controller of the CSV or JSONL file
+        required: true
+        type: path
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
+    rate_limit:
+        description:
+            - maximum number of API calls per second; 0 disables limiting
+        required: false
+        default: 5.0
+        type: float
+    rejects:
+        description:
+            - path on the controller of a JSONL file receiving every invalid or failed record, each preceded by a
+              comment giving its line and the reason it was rejected
+        required: false
+        type: path
+    report:
+        description:
+            - path on the controller of a JSONL file receiving the result of every record as soon as it is applied,
+              with the number of records done and in total
+            - follow it with C(tail -f) to watch the progress of a long run
+        required: false
+        type: path
+    state:
+        description:
+            - declare whether you want the objects to exist or be deleted
+        required: true
+        choices:
+          - 'absent'
+          - 'present'
+        type: str
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+    - name: Import the objects migrated from the datacenter firewalls
+      cdot65.prisma_access.bulk_import:
+        provider:
+          client_id: "{{ client_id }}"
+          client_secret: "{{ client_secret }}"
+          scope: "{{ scope }}"
+        path: "files/datacenter-objects.jsonl.gz"
+        report: "/var/tmp/datacenter-objects.report.jsonl"
+        rejects: "/var/tmp/datacenter-objects.rejects.jsonl"
+        max_rejects: 100
+        max_workers: 16
+        state: "present"
+
+    - name: Import a CSV of addresses
+      cdot65.prisma_access.bulk_import:
+        provider:
+          client_id: "{{ client_id }}"
+          client_secret: "{{ client_secret }}"
+          scope: "{{ scope }}"
+        path: "files/addresses.csv"
+        object_type: "address"
+        state: "present"
+"""
+
+RETURN = r"""
+errors:
+    description: first I(max_errors) invalid records, with their line and what is wrong with them
+    returned: always
+    type: list
+    elements: str
+failed_records:
+    description: result of the first I(max_errors) records that could not be applied
+    returned: always
+    type: list
+    elements: dict
+metrics:
+    description: API requests made by the module and the time spent authenticating, listing and writing
+    returned: when I(metrics) is enabled
+    type: dict
+rejected:
+    description: number of invalid records, skipped
+    returned: always
+    type: int
+summary:
+    description: number of records per result
+    returned: always
+    type: dict
+types:
+    description: number of records and their results, per object type
+    returned: always
+    type: list
+    elements: dict
+"""
+
+# object types in the order they are created, with the spec of their records and the constraints between options;
+# deletion uses the reverse order because groups reference addresses and both reference tags
+RECORD_TYPES = (
+    ("tag", tag_record_spec, {}),
+    (
+        "address",
+        address_record_spec,
+        {
+            "mutually_exclusive": [
+                ["fqdn", "ip_netmask", "ip_range", "ip_wildcard"]
+            ],
+            "required_one_of": [
+                ["fqdn", "ip_netmask", "ip_range", "ip_wildcard"]
+            ],
+        },
+    ),
+    (
+        "address_group",
+        address_group_record_spec,
+        {
+            "mutually_exclusive": [["dynamic", "static"]],
+            "required_one_of": [["dynamic", "static"]],
+        },
+    ),
+)
+
+
+def read_configs(module, only=None):
+    """Yield the line number, record, object type, configuration and validation errors of every record of the file.
+
+    When only is given, records of other types are skipped without being
+    validated.
+    """
+    specs = dict(
+        (object_type, (record_spec(), constraints))
+        for object_type, record_spec, constraints in RECORD_TYPES
+    )
+
+    for line_number, record in read_records(
+        module.params["path"], module.params["format"]
+    ):
+        params = dict(record)
+        object_type = (
+            params.pop("object_type", None) or module.params["object_type"]
+        )
+        # exports carry the id of every object, which the API assigns
+        params.pop("id", None)
+        params.setdefault("folder", module.params["folder"])
+
+        if only and object_type != only:
+            continue
+        if object_type not in specs:
+            yield line_number, record, object_type, params, [
+                f"object_type must be one of {', '.join(specs)}, got {object_type}"
+            ]
+            continue
+
+        spec, constraints = specs[object_type]
+        params, errors = validate_record(spec, params, **constraints)
+        yield line_number, record, object_type, strip_none(params), errors
+
+
+def reject(stream, line_number, record, object_type, reasons):
+    """Write a rejected record, preceded by a comment giving its line and the reasons, so it can be imported again."""
+    if object_type:
+        record = dict(record, object_type=object_type)
+    stream.write(f"# line {line_number}: {'; '.join(reasons)}\n")
+    stream.write(json.dumps(record) + "\n")
+
+
+def main():
+    """This is the main function that contains the logic for importing tags, addresses and address groups in bulk
+        on the Prisma Access platform.
+
+    It takes no arguments and returns no values.
+
+    It uses the AnsibleModule class to get the module's argument specification and process the results of the
+        module's actions.
+
+    Raises an exception if an error occurs during the module's execution.
+    """
+    module = AnsibleModule(
+        argument_spec=bulk_import_spec(),
+        supports_check_mode=True,
+    )
+    state = module.params["state"]
+    max_errors = module.params["max_errors"]
+
+    rejects = None
+    if module.params["rejects"]:
+        try:
+            rejects = open(module.params["rejects"], "w", encoding="utf-8")
+        except OSError as exception_error:
+            module.fail_json(msg=to_native(exception_error))
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 1. Stream the file once to validate every record before contacting the API, counting the records of every     #
+    #    type and collecting the folders each type is listed in.                                                    #
+    # -------------------------------------------------------------------------------------------------------------- #
+    errors = []
+    rejected = set()
+    keys = set()
+    types = dict(
+        (object_type, {"records": 0, "folders": set(), "results": {}})
+        for object_type, _record_spec, _constraints in RECORD_TYPES
+    )
+
+    try:
+        for (
+            line_number,
+            record,
+            object_type,
+            config,
+            record_errors,
+        ) in read_configs(module):
+            if not record_errors:
+                key = (object_type, config["folder"], config["name"])
+                if key in keys:
+                    record_errors = [
+                        f"duplicate {object_type} {config['name']}"
+                    ]
+                keys.add(key)
+
+            if record_errors:
+                rejected.add(line_number)
+                if len(errors) < max_errors:
+                    errors.append(
+                        f"line {line_number}: {'; '.join(record_errors)}"
+                    )
+                if rejects:
+                    reject(
+                        rejects,
+                        line_number,
+                        record,
+                        object_type,
+                        record_errors,
+                    )
+                continue
+
+            types[object_type]["records"] += 1
+            types[object_type]["folders"].add(config["folder"])
+
+    except (OSError, ValueError) as exception_error:
+        module.fail_json(msg=to_native(exception_error))
+
+    finally:
+        if rejects:
+            rejects.flush()
+
+    if len(rejected) > module.params["max_rejects"]:
+        if rejects:
+            rejects.close()
+        module.fail_json(
+            msg=f"{len(rejected)} invalid records in {module.params['path']}, more than max_rejects",
+            errors=errors,
+            rejected=len(rejected),
+        )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 2. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed  #
+    #    through the Ansible module.                                                                                 #
+    # -------------------------------------------------------------------------------------------------------------- #
+    try:
+        # get the provider parameter from the Ansible module, which includes the authentication credentials
+        session = get_authenticated_session(module)
+
+    except Exception as exception_error:
+        # if an exception occurs during the authentication process, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    limiter = RateLimiter(module.params["rate_limit"])
+    report = None
+    order = [object_type for object_type, _spec, _constraints in RECORD_TYPES]
+    if state == "absent":
+        order.reverse()
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 3. For every type in dependency order, list its folders once, then stream the file again and apply its         #
+    #    records with a bounded number of them in flight, writing every result to the report as it completes.        #
+    # -------------------------------------------------------------------------------------------------------------- #
+    summary = {}
+    failed_records = []
+    failed = 0
+    done = 0
+    total = sum(each["records"] for each in types.values())
+
+    try:
+        if module.params["report"]:
+            report = open(module.params["report"], "w", encoding="utf-8")
+
+        for object_type in order:
+            if not types[object_type]["records"]:
+                continue
+            sdk_class = object_class(object_type)
+
+            existing = {}
+            for folder in types[object_type]["folders"]:
+                for each in list_objects(session, sdk_class, folder, limiter):
+                    existing[(folder, each.name)] = each
+
+            def apply(item):
+                line_number, record, _type, config, _errors = item
+                current = existing.get((config["folder"], config["name"]))
+
+                if module.check_mode:
+                    result = plan_object(config, current, state)
+                else:
+                    result = apply_object(
+                        session, sdk_class, config, current, state, limiter
+                    )
+
+                result["line"] = line_number
+                result["type"] = object_type
+                return result, record
+
+            records = (
+                item
+                for item in read_configs(module, object_type)
+                if item[0] not in rejected
+            )
+            results = types[object_type]["results"]
+            for result, record in stream_fan_out(
+                apply, records, module.params["max_workers"]
+            ):
+                done += 1
+                results[result["result"]] = (
+                    results.get(result["result"], 0) + 1
+                )
+                summary[result["result"]] = (
+                    summary.get(result["result"], 0) + 1
+                )
+                if result["result"] == "failed":
+                    failed += 1
+                    if len(failed_records) < max_errors:
+                        failed_records.append(result)
+                    if rejects:
+                        reject(
+                            rejects,
+                            result["line"],
+                            record,
+                            object_type,
+                            [result["msg"]],
+                        )
+                if report:
+                    report.write(
+                        json.dumps(dict(result, done=done, total=total)) + "\n"
+                    )
+                    report.flush()
+
+            existing = None
+
+    except Exception as exception_error:
+        # If an exception occurs, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error),
+            exception=format_exc(),
+            summary=summary,
+        )
+
+    finally:
+        for stream in (report, rejects):
+            if stream:
+                stream.close()
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 4. Aggregate the results per type.                                                                             #
+    # -------------------------------------------------------------------------------------------------------------- #
+    changed = any(
+        summary.get(result) for result in ("created", "updated", "deleted")
+    )
+    types = [
+        dict(type=object_type, records=each["records"], **each["results"])
+        for object_type, each in types.items()
+        if each["records"]
+    ]
+
+    if failed:
+        module.fail_json(
+            msg=f"{failed} of {total} records failed",
+            changed=changed,
+            errors=errors,
+            failed_records=failed_records,
+            rejected=len(rejected),
+            summary=summary,
+            types=types,
+        )
+
+    module.exit_json(
+        changed=changed,
+        errors=errors,
+        failed_records=failed_records,
+        rejected=len(rejected),
+        summary=summary,
+        types=types,
+    )
+
+
+if __name__ == "__main__":
+    run_profiled(main)
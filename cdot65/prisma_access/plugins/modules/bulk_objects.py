@@ -0,0 +1,393 @@
+"""
+Ansible module for applying a baseline of objects to many Prisma Access tenants.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+from traceback import format_exc
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils._text import to_native
+from ..module_utils.specs.bulk_objects import (
+    bulk_objects_spec,
+)
+from ..module_utils.authenticate import (
+    create_session,
+)
+from ..module_utils.bulk import (
+    RateLimiter,
+    fan_out,
+    reconcile,
+    strip_none,
+    summarize,
+)
+from ..module_utils.journal import (
+    Journal,
+)
+from ..module_utils.metrics import (
+    Metrics,
+    report_metrics,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: bulk_objects
+
+short_description: Apply a baseline of tags, addresses and address groups to many tenants.
+
+version_added: "0.1.9"
+
+description:
+    - Apply the same set of tag, address and address group objects to one or more Prisma Access tenants.
+    - Tenants are processed concurrently, each with its own authenticated session and API rate limit.
+    - Each object type is listed once per folder and tenant, rather than once per object.
+    - Existing objects that differ from the desired configuration are updated in place.
+    - Every operation can be written to a checkpoint journal so that an interrupted run can be resumed.
+
+options:
+    address_groups:
+        description:
+            - address group objects to apply, using the same keys as the address_group module
+        required: false
+        type: list
+        elements: dict
+    addresses:
+        description:
+            - address objects to apply, using the same keys as the address module
+        required: false
+        type: list
+        elements: dict
+    folder:
+        description:
+            - folder used for objects that do not declare their own
+        required: false
+        default: "Shared"
+        type: str
+    journal:
+        description:
+            - path on the controller of an append-only checkpoint journal recording every operation
+        required: false
+        type: path
+    max_workers:
+        description:
+            - number of tenants processed concurrently
+        required: false
+        default: 8
+        type: int
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
+    providers:
+        description:
+            - credentials of every tenant the objects are applied to
+        required: true
+        type: list
+        elements: dict
+        suboptions:
+            client_id:
+                required: true
+                type: str
+            client_secret:
+                required: true
+                type: str
+            scope:
+                description:
+                    - TSG ID of the tenant
+                required: true
+                type: str
+    rate_limit:
+        description:
+            - maximum number of API calls per second, per tenant; 0 disables limiting
+        required: false
+        default: 5.0
+        type: float
+    resume:
+        description:
+            - skip operations already confirmed in the journal for the same input, only verifying the remainder
+            - tenants without any remaining operation are not contacted at all
+        required: false
+        default: false
+        type: bool
+    state:
+        description:
+            - declare whether you want the objects to exist or be deleted
+        required: true
+        choices:
+          - 'absent'
+          - 'present'
+        type: str
+    tags:
+        description:
+            - tag objects to apply, using the same keys as the tag module
+        required: false
+        type: list
+        elements: dict
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+    - name: Apply baseline objects to every tenant
+      cdot65.prisma_access.bulk_objects:
+        providers: "{{ prisma_tenants }}"
+        folder: "Shared"
+        tags:
+          - name: "ansible-baseline"
+            color: "Lavender"
+            comments: "Managed by Ansible"
+        addresses:
+          - name: "dns-primary"
+            description: "Primary DNS resolver"
+            ip_netmask: "10.0.0.53/32"
+            tag:
+              - "ansible-baseline"
+        address_groups:
+          - name: "dns-servers"
+            description: "DNS resolvers"
+            static:
+              - "dns-primary"
+        max_workers: 10
+        rate_limit: 5
+        state: "present"
+
+    - name: Resume an interrupted onboarding run
+      cdot65.prisma_access.bulk_objects:
+        providers: "{{ prisma_tenants }}"
+        addresses: "{{ onboarding_addresses }}"
+        journal: "/var/tmp/onboarding.journal"
+        resume: true
+        state: "present"
+"""
+
+RETURN = r"""
+metrics:
+    description: API requests made by the module and the time spent authenticating, listing and writing
+    returned: when I(metrics) is enabled
+    type: dict
+tenants:
+    description: result of every tenant, in the order the providers were declared
+    returned: always
+    type: list
+    elements: dict
+"""
+
+
+def object_classes():
+    """Return the object types in the order they are created; deletion uses the reverse order because groups
+        reference addresses and both reference tags.
+
+    The SDK is imported here rather than with the module, once the arguments have been validated.
+    """
+    from panapi.config.objects import Address, AddressGroup, Tag
+
+    return (
+        ("tags", Tag),
+        ("addresses", Address),
+        ("address_groups", AddressGroup),
+    )
+
+
+def apply_tenant(module, provider, desired, journal=None, metrics=None):
+    """Apply every desired object to a single tenant and return its result."""
+    tenant = {"scope": provider["scope"], "failed": False, "objects": []}
+    state = module.params["state"]
+    object_types = object_classes()
+    if state == "absent":
+        object_types = object_types[::-1]
+
+    # when resuming, only the operations not confirmed by the journal remain
+    pending = {}
+    for object_type, _object_class in object_types:
+        pending[object_type] = []
+        for each in desired[object_type]:
+            if module.params["resume"] and journal.is_confirmed(
+                Journal.key(tenant["scope"], object_type, state, each)
+            ):
+                tenant["objects"].append(
+                    {
+                        "name": each["name"],
+                        "folder": each["folder"],
+                        "result": "skipped",
+                        "type": object_type,
+                    }
+                )
+            else:
+                pending[object_type].append(each)
+
+    def checkpoint(object_type):
+        def record(each, result):
+            if journal and result["result"] != "failed":
+                journal.record(
+                    Journal.key(tenant["scope"], object_type, state, each),
+                    result["result"],
+                )
+
+        return record
+
+    try:
+        session = None
+        limiter = RateLimiter(module.params["rate_limit"])
+
+        for object_type, object_class in object_types:
+            if not pending[object_type]:
+                continue
+            if session is None:
+                session = create_session(provider, metrics)
+            for each in reconcile(
+                session,
+                object_class,
+                pending[object_type],
+                state,
+                limiter,
+                checkpoint(object_type),
+            ):
+                each["type"] = object_type
+                tenant["objects"].append(each)
+
+    except Exception as exception_error:
+        tenant["failed"] = True
+        tenant["msg"] = to_native(exception_error)
+
+    tenant["summary"] = summarize(tenant["objects"])
+    tenant["changed"] = any(
+        each["result"] in ("created", "updated", "deleted")
+        for each in tenant["objects"]
+    )
+    if tenant["summary"].get("failed"):
+        tenant["failed"] = True
+        tenant.setdefault("msg", "One or more objects could not be applied")
+
+    return tenant
+
+
+def main():
+    """This is the main function that contains the logic for applying tags, addresses and address groups to several
+        tenants on the Prisma Access platform.
+
+    It takes no arguments and returns no values.
+
+    It uses the AnsibleModule class to get the module's argument specification and process the results of the
+        module's actions.
+
+    Raises an exception if an error occurs during the module's execution.
+    """
+    module = AnsibleModule(argument_spec=bulk_objects_spec())
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 1. Build the desired object set once, filling in the default folder for objects that do not declare one.      #
+    # -------------------------------------------------------------------------------------------------------------- #
+    desired = {}
+    for object_type, _object_class in object_classes():
+        desired[object_type] = []
+        for each in module.params[object_type] or []:
+            config = strip_none(each)
+            config.setdefault("folder", module.params["folder"])
+            desired[object_type].append(config)
+
+    for each in desired["addresses"]:
+        if not any(
+            key in each
+            for key in ("fqdn", "ip_netmask", "ip_range", "ip_wildcard")
+        ):
+            module.fail_json(
+                msg=f"Address {each['name']} must define ip_netmask, ip_range, ip_wildcard, or fqdn"
+            )
+
+    for each in desired["address_groups"]:
+        if "static" not in each and "dynamic" not in each:
+            module.fail_json(
+                msg=f"Address group {each['name']} must define either static or dynamic"
+            )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 2. Load the checkpoint journal of a previous run when resuming.                                                #
+    # -------------------------------------------------------------------------------------------------------------- #
+    journal = None
+    if module.params["journal"]:
+        journal = Journal(module.params["journal"])
+        if module.params["resume"]:
+            journal.load()
+    elif module.params["resume"]:
+        module.fail_json(msg="resume requires a journal")
+
+    metrics = None
+    if module.params["metrics"]:
+        metrics = Metrics()
+        report_metrics(module, metrics)
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 3. Apply the desired objects to every tenant concurrently, each with its own session and rate limit.           #
+    # -------------------------------------------------------------------------------------------------------------- #
+    try:
+        tenants = fan_out(
+            lambda provider: apply_tenant(
+                module, provider, desired, journal, metrics
+            ),
+            module.params["providers"],
+            module.params["max_workers"],
+        )
+
+    except Exception as exception_error:
+        # If an exception occurs, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 4. Aggregate the per-tenant results.                                                                            #
+    # -------------------------------------------------------------------------------------------------------------- #
+    changed = any(each["changed"] for each in tenants)
+    failed = [each["scope"] for each in tenants if each["failed"]]
+
+    if failed:
+        module.fail_json(
+            msg=f"{len(failed)} of {len(tenants)} tenants failed: {', '.join(failed)}",
+            changed=changed,
+            tenants=tenants,
+        )
+
+    module.exit_json(changed=changed, tenants=tenants)
+
+
+if __name__ == "__main__":
+    run_profiled(main)
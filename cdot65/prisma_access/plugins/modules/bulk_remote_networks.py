@@ -0,0 +1,396 @@
+"""
+Ansible module for onboarding remote networks in bulk from a CSV or JSONL file.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+import json
+from traceback import format_exc
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils._text import to_native
+from ..module_utils.specs.bulk_remote_networks import (
+    bulk_remote_networks_spec,
+)
+from ..module_utils.specs.remote_network import (
+    remote_network_record_spec,
+)
+from ..module_utils.authenticate import (
+    get_authenticated_session,
+)
+from ..module_utils.bulk import (
+    RateLimiter,
+    apply_object,
+    list_objects,
+    plan_object,
+    stream_fan_out,
+)
+from ..module_utils.network import (
+    remote_network_config,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+from ..module_utils.records import (
+    read_records,
+    validate_record,
+)
+from ..module_utils.references import (
+    ReferenceResolver,
+    connection_references,
+)
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: bulk_remote_networks
+
+short_description: Onboard remote networks in bulk from a CSV or JSONL file.
+
+version_added: "0.1.9"
+
+description:
+    - Create, update or delete the remote networks described by a CSV or JSONL file on the controller.
+    - Every record uses the options of the remote_network module. In CSV files, list values such as C(subnets) are
+      comma separated within a quoted cell, and nested options are written as JSON.
+    - The file is streamed twice, never loaded whole; the first pass validates every record and counts them per
+      region and SPN, the second applies them concurrently in file order. Nothing is written if any record is
+      invalid.
+    - Records are not reordered by region or SPN; only the results are reported per region and SPN.
+    - The folder is listed once, and references to IPsec tunnels are validated in a single batch.
+    - Supports check mode, reporting what would be created, updated or deleted.
+
+options:
+    folder:
+        description:
+            - folder of the records that do not declare their own
+        required: false
+        default: "Remote Networks"
+        type: str
+    format:
+        description:
+            - format of the file; C(auto) picks CSV for files ending in C(.csv) and JSONL otherwise
+        required: false
+        default: "auto"
+        type: str
+        choices:
+            - "auto"
+            - "csv"
+            - "jsonl"
+    max_errors:
+        description:
+            - maximum number of invalid records reported
+        required: false
+        default: 50
+        type: int
+    max_workers:
+        description:
+            - number of remote networks applied concurrently
+        required: false
+        default: 8
+        type: int
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
+    path:
+        description:
+            - path on the controller of the CSV or JSONL file
+        required: true
+        type: path
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
+    rate_limit:
+        description:
+            - maximum number of API calls per second; 0 disables limiting
+        required: false
+        default: 5.0
+        type: float
+    report:
+        description:
+            - path on the controller of a JSONL file receiving the result of every record as soon as it is applied
+            - follow it with C(tail -f) to watch the progress of a long run
+        required: false
+        type: path
+    state:
+        description:
+            - declare whether you want the remote networks to exist or be deleted
+        required: true
+        choices:
+          - 'absent'
+          - 'present'
+        type: str
+    validate_references:
+        description:
+            - check that the IPsec tunnels referenced by the records exist before writing
+        required: false
+        default: false
+        type: bool
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+    - name: Onboard the branches of an acquisition
+      cdot65.prisma_access.bulk_remote_networks:
+        provider:
+          client_id: "{{ client_id }}"
+          client_secret: "{{ client_secret }}"
+          scope: "{{ scope }}"
+        path: "files/acquisition-branches.csv"
+        report: "/var/tmp/acquisition-branches.report.jsonl"
+        max_workers: 16
+        state: "present"
+"""
+
+RETURN = r"""
+failed_records:
+    description: result of every record that could not be applied
+    returned: always
+    type: list
+    elements: dict
+groups:
+    description: number of records and their results, per region and SPN
+    returned: always
+    type: list
+    elements: dict
+metrics:
+    description: API requests made by the module and the time spent authenticating, listing and writing
+    returned: when I(metrics) is enabled
+    type: dict
+summary:
+    description: number of records per result
+    returned: always
+    type: dict
+"""
+
+
+def read_configs(module):
+    """Yield the line number, configuration and validation errors of every record of the file."""
+    spec = remote_network_record_spec()
+
+    for line_number, record in read_records(
+        module.params["path"], module.params["format"]
+    ):
+        record.setdefault("folder", module.params["folder"])
+        params, errors = validate_record(spec, record)
+        try:
+            config = remote_network_config(params)
+        except ValueError as exception_error:
+            config = params
+            errors = errors + [to_native(exception_error)]
+        yield line_number, config, errors
+
+
+def main():
+    """This is the main function that contains the logic for onboarding remote networks in bulk on the
+        Prisma Access platform.
+
+    It takes no arguments and returns no values.
+
+    It uses the AnsibleModule class to get the module's argument specification and process the results of the
+        module's actions.
+
+    Raises an exception if an error occurs during the module's execution.
+    """
+    module = AnsibleModule(
+        argument_spec=bulk_remote_networks_spec(),
+        supports_check_mode=True,
+    )
+
+    # Prisma Access SDK, imported once the arguments have been validated
+    from panapi.config.network import RemoteNetwork
+
+    state = module.params["state"]
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 1. Stream the file once to validate every record before contacting the API, counting the records of every      #
+    #    region and SPN and collecting the distinct folders and IPsec tunnel references.                             #
+    # -------------------------------------------------------------------------------------------------------------- #
+    errors = []
+    error_count = 0
+    names = set()
+    groups = {}
+    folders = set()
+    references = set()
+
+    try:
+        for line_number, config, record_errors in read_configs(module):
+            key = (config["folder"], config["name"])
+            if key in names:
+                record_errors = record_errors + [
+                    f"duplicate remote network {config['name']}"
+                ]
+            names.add(key)
+
+            if record_errors:
+                error_count += 1
+                if len(errors) < module.params["max_errors"]:
+                    errors.append(
+                        f"line {line_number}: {'; '.join(record_errors)}"
+                    )
+                continue
+
+            group = (config["region"], config.get("spn_name"))
+            groups.setdefault(group, {"records": 0, "results": {}})
+            groups[group]["records"] += 1
+            folders.add(config["folder"])
+            references.update(connection_references(config))
+
+    except (OSError, ValueError) as exception_error:
+        module.fail_json(msg=to_native(exception_error))
+
+    if error_count:
+        module.fail_json(
+            msg=f"{error_count} invalid records in {module.params['path']}",
+            errors=errors,
+        )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 2. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed  #
+    #    through the Ansible module.                                                                                 #
+    # -------------------------------------------------------------------------------------------------------------- #
+    try:
+        # get the provider parameter from the Ansible module, which includes the authentication credentials
+        session = get_authenticated_session(module)
+
+    except Exception as exception_error:
+        # if an exception occurs during the authentication process, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    limiter = RateLimiter(module.params["rate_limit"])
+    report = None
+
+    try:
+        # ---------------------------------------------------------------------------------------------------------- #
+        # 3. List every folder once and validate all IPsec tunnel references in a single batch.                      #
+        # ---------------------------------------------------------------------------------------------------------- #
+        existing = {}
+        for folder in folders:
+            for each in list_objects(session, RemoteNetwork, folder, limiter):
+                existing[(folder, each.name)] = each
+
+        if state == "present" and module.params["validate_references"]:
+            unresolved = ReferenceResolver(session, limiter).unresolved(
+                sorted(references, key=lambda reference: reference[3])
+            )
+            if unresolved:
+                module.fail_json(
+                    msg=f"Unresolved references: {'; '.join(unresolved)}",
+                    unresolved=unresolved,
+                )
+
+        # ---------------------------------------------------------------------------------------------------------- #
+        # 4. Stream the file again and apply the records with a bounded number of them in flight, writing every      #
+        #    result to the report as it completes.                                                                   #
+        # ---------------------------------------------------------------------------------------------------------- #
+        def apply(item):
+            line_number, config, _errors = item
+            current = existing.get((config["folder"], config["name"]))
+
+            if not module.check_mode:
+                result = apply_object(
+                    session, RemoteNetwork, config, current, state, limiter
+                )
+            else:
+                result = plan_object(config, current, state)
+
+            result["line"] = line_number
+            result["region"] = config["region"]
+            result["spn_name"] = config.get("spn_name")
+            return result
+
+        if module.params["report"]:
+            report = open(module.params["report"], "w", encoding="utf-8")
+
+        summary = {}
+        failed_records = []
+        for result in stream_fan_out(
+            apply, read_configs(module), module.params["max_workers"]
+        ):
+            group = groups[(result["region"], result["spn_name"])]["results"]
+            group[result["result"]] = group.get(result["result"], 0) + 1
+            summary[result["result"]] = summary.get(result["result"], 0) + 1
+            if result["result"] == "failed":
+                failed_records.append(result)
+            if report:
+                report.write(json.dumps(result) + "\n")
+                report.flush()
+
+    except Exception as exception_error:
+        # If an exception occurs, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    finally:
+        if report:
+            report.close()
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 5. Aggregate the results per region and SPN.                                                                   #
+    # -------------------------------------------------------------------------------------------------------------- #
+    changed = any(
+        summary.get(result) for result in ("created", "updated", "deleted")
+    )
+    groups = [
+        dict(region=region, spn_name=spn_name, **counts)
+        for (region, spn_name), counts in sorted(
+            groups.items(), key=lambda group: (group[0][0], group[0][1] or "")
+        )
+    ]
+
+    if failed_records:
+        module.fail_json(
+            msg=f"{len(failed_records)} of {sum(summary.values())} remote networks failed",
+            changed=changed,
+            failed_records=failed_records,
+            groups=groups,
+            summary=summary,
+        )
+
+    module.exit_json(
+        changed=changed,
+        failed_records=failed_records,
+        groups=groups,
+        summary=summary,
+    )
+
+
+if __name__ == "__main__":
+    run_profiled(main)
@@ -6,15 +6,15 @@ from __future__ import absolute_import, division, print_function
 from traceback import format_exc
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils._text import to_native
-from ..module_utils.api_spec import (
-    PrismaAccessSpec,
+from ..module_utils.specs.config_push import (
+    config_push_spec,
 )
 from ..module_utils.authenticate import (
     get_authenticated_session,
 )
-
-# Prisma Access SDK
-from panapi.config.management import ConfigVersion
+from ..module_utils.profiling import (
+    run_profiled,
+)
 
 __metaclass__ = type
 
@@ -47,6 +47,45 @@ options:
         elements: "str"
         required: true
         type: list
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
 
 author:
     - Calvin Remsburg (@cdot65)
@@ -87,9 +126,10 @@ def main():
 
     Raises an exception if an error occurs during the module's execution.
     """
-    module = AnsibleModule(
-        argument_spec=PrismaAccessSpec.config_push()
-    )
+    module = AnsibleModule(argument_spec=config_push_spec())
+
+    # Prisma Access SDK, imported once the arguments have been validated
+    from panapi.config.management import ConfigVersion
 
     # -------------------------------------------------------------------------------------------------------------- #
     # 1. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed  #
@@ -136,4 +176,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main)
@@ -6,15 +6,18 @@ from __future__ import absolute_import, division, print_function
 from traceback import format_exc
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils._text import to_native
-from ..module_utils.api_spec import (
-    PrismaAccessSpec,
+from ..module_utils.specs.ike_gateway import (
+    ike_gateway_spec,
 )
 from ..module_utils.authenticate import (
     get_authenticated_session,
 )
-
-# Prisma Access SDK
-from panapi.config.network import IKEGateway
+from ..module_utils.network import (
+    ike_gateway_config,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
 
 __metaclass__ = type
 
@@ -51,6 +54,45 @@ options:
             - Value of the address group object's name
         required: false
         type: dict
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
     state:
         description:
             - declare whether you want the resource to exist or be deleted
@@ -198,7 +240,10 @@ def main():
 
     Raises an exception if an error occurs during the module's execution.
     """
-    module = AnsibleModule(argument_spec=PrismaAccessSpec.ike_gateway_spec())
+    module = AnsibleModule(argument_spec=ike_gateway_spec())
+
+    # Prisma Access SDK, imported once the arguments have been validated
+    from panapi.config.network import IKEGateway
 
     # -------------------------------------------------------------------------------------------------------------- #
     # 1. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed
@@ -213,71 +258,16 @@ def main():
         module.fail_json(msg=to_native(exception_error), exception=format_exc())
 
     # -------------------------------------------------------------------------------------------------------------- #
-    # 2. Create a dictionary representing the configuration settings for an IKE gateway.                             #
-    #    `authentication`, `peer_address`, and `protocol_common` will be generated in the steps below.               #
+    # 2. Build the configuration settings for an IKE gateway from the parameters passed in the playbook.             #
     # -------------------------------------------------------------------------------------------------------------- #
-    ike_gateway = {
-        "name": module.params["name"],
-        "folder": module.params["folder"],
-        "local_address": {"interface": "vlan"},
-        "peer_id": module.params["peer_id"],
-        "protocol": module.params["protocol"],
-        "authentication": {},
-        "peer_address": {},
-        "protocol_common": {},
-    }
-
-    # -------------------------------------------------------------------------------------------------------------- #
-    # 3. Update the IKE gateway configuration dictionary with the selected authentication schema.                    #
-    # -------------------------------------------------------------------------------------------------------------- #
-    authentication = module.params["authentication"]
-
-    if authentication["pre_shared_key"]:
-        ike_gateway["authentication"]["pre_shared_key"] = {
-            "key": authentication["pre_shared_key"]
-        }
-    elif authentication["certificate"]:
-        ike_gateway["authentication"]["certificate"] = authentication[
-            "certificate"
-        ]
-    else:
-        module.fail_json(msg="Authentication method not specified")
-
-    # -------------------------------------------------------------------------------------------------------------- #
-    # 4. The following code updates the IKE gateway configuration dictionary with the selected peer_address.         #
-    # -------------------------------------------------------------------------------------------------------------- #
-    peer_address = module.params["peer_address"]
-    if peer_address["ip"]:
-        ike_gateway["peer_address"]["ip"] = peer_address["ip"]
-    elif peer_address["fqdn"] or peer_address["dynamic"]:
-        ike_gateway["peer_address"]["dynamic"] = {}
-    else:
-        module.fail_json(msg="Peer address not specified")
+    try:
+        ike_gateway = ike_gateway_config(module.params)
 
-    # -------------------------------------------------------------------------------------------------------------- #
-    # 5. The following code overrides the default values for the "protocol_common" dictionary of the IKE gateway     #
-    #    configuration dictionary.                                                                                   #
-    # -------------------------------------------------------------------------------------------------------------- #
-    if module.params["protocol_common"]:
-        # if protocol_common parameters are specified, use them to update the ike_gateway dictionary
-        common = module.params["protocol_common"]
-        if common["nat_traversal"]:
-            ike_gateway["protocol_common"]["nat_traversal"] = {
-                "enable": common["nat_traversal"]["enable"]
-            }
-        if common["fragmentation"]:
-            ike_gateway["protocol_common"]["fragmentation"] = {
-                "enable": common["fragmentation"]["enable"]
-            }
-    else:
-        # if no protocol_common parameters are specified, use default values
-        ike_gateway["protocol_common"] = {
-            "nat_traversal": {"enable": True},
-            "fragmentation": {"enable": False},
-        }
+    except ValueError as exception_error:
+        module.fail_json(msg=to_native(exception_error))
 
     # -------------------------------------------------------------------------------------------------------------- #
-    # 6. create an instance of the "IKEGateway" class using the ike_gateway dictionary.                              #
+    # 3. create an instance of the "IKEGateway" class using the ike_gateway dictionary.                              #
     # -------------------------------------------------------------------------------------------------------------- #
     try:
         # Create an IKEGateway object with the ike_gateway dictionary
@@ -337,4 +327,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main)
@@ -6,15 +6,22 @@ from __future__ import absolute_import, division, print_function
 from traceback import format_exc
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils._text import to_native
-from ..module_utils.api_spec import (
-    PrismaAccessSpec,
+from ..module_utils.specs.ipsec_tunnel import (
+    ipsec_tunnel_spec,
 )
 from ..module_utils.authenticate import (
     get_authenticated_session,
 )
-
-# Prisma Access SDK
-from panapi.config.network import IPSecTunnel
+from ..module_utils.network import (
+    ipsec_tunnel_config,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+from ..module_utils.references import (
+    ReferenceResolver,
+    ipsec_tunnel_references,
+)
 
 __metaclass__ = type
 
@@ -69,6 +76,45 @@ options:
             - declare where the object should reside.
         required: true
         type: str
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
     state:
         description:
             - declare whether you want the resource to exist or be deleted
@@ -99,7 +145,13 @@ options:
                     - destination IP address
                 required: false
                 type: str
-
+    validate_references:
+        description:
+            - check that the IKE gateways and IPsec crypto profile exist before creating the IPsec tunnel
+            - every unresolved name is reported at once, before any write is attempted
+        required: false
+        default: false
+        type: bool
 
 author:
     - Calvin Remsburg (@cdot65)
@@ -229,7 +281,10 @@ def main():
 
     Raises an exception if an error occurs during the module's execution.
     """
-    module = AnsibleModule(argument_spec=PrismaAccessSpec.ipsec_tunnel_spec())
+    module = AnsibleModule(argument_spec=ipsec_tunnel_spec())
+
+    # Prisma Access SDK, imported once the arguments have been validated
+    from panapi.config.network import IPSecTunnel
 
     # -------------------------------------------------------------------------------------------------------------- #
     # 1. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed
@@ -244,16 +299,9 @@ def main():
         module.fail_json(msg=to_native(exception_error), exception=format_exc())
 
     # -------------------------------------------------------------------------------------------------------------- #
-    # 2. Create a dictionary representing the configuration settings for an IPsec tunnel.                             #
+    # 2. Build the configuration settings for an IPsec tunnel from the parameters passed in the playbook.            #
     # -------------------------------------------------------------------------------------------------------------- #
-    ipsec_tunnel = {
-        "name": module.params["name"],
-        "folder": module.params["folder"],
-        # "tunnel_interface": module.params["tunnel_interface"],
-        "auto_key": module.params["auto_key"],
-        "anti_replay": module.params["anti_replay"],
-        "tunnel_monitor": module.params["tunnel_monitor"],
-    }
+    ipsec_tunnel = ipsec_tunnel_config(module.params)
 
     # -------------------------------------------------------------------------------------------------------------- #
     # 3. create an instance of the "IPSecTunnel" class using the ipsec_tunnel dictionary.                              #
@@ -292,6 +340,17 @@ def main():
                 )
         else:
             if already_exists is False:
+                # Validate every name the IPsec tunnel references in a single batch, before attempting the write
+                if module.params["validate_references"]:
+                    unresolved = ReferenceResolver(session).unresolved(
+                        ipsec_tunnel_references(ipsec_tunnel)
+                    )
+                    if unresolved:
+                        module.fail_json(
+                            msg=f"Unresolved references: {'; '.join(unresolved)}",
+                            unresolved=unresolved,
+                        )
+
                 # Create the IPsec tunnel if it doesn't exist
                 tunnel.create(session)
                 if session.response.status_code != 201:
@@ -316,4 +375,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main)
@@ -0,0 +1,233 @@
+"""
+Ansible module for reading objects from the local SQLite mirror of a Prisma Access tenant.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+import time
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils._text import to_native
+from ..module_utils.specs.mirror_info import (
+    mirror_info_spec,
+)
+from ..module_utils.mirror import (
+    Mirror,
+    mirror_path,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: mirror_info
+
+short_description: Read objects from the local SQLite mirror of a tenant.
+
+version_added: "0.1.9"
+
+description:
+    - Read addresses, address groups, tags, IKE gateways, IPsec tunnels, remote networks and service connections
+      from the mirror maintained by the mirror_sync module, without contacting the API.
+    - Objects are selected by type, names, folder, tag and name pattern, every filter given having to match.
+    - The mirror is read on the host running the module, which is the controller for local tasks; the
+      cdot65.prisma_access.mirror lookup reads the same mirror from within templates.
+
+options:
+    folder:
+        description:
+            - only return objects of this folder
+        required: false
+        type: str
+    max_age:
+        description:
+            - fail when a listing of the returned object types was synced more than this number of seconds ago
+        required: false
+        type: int
+    name_pattern:
+        description:
+            - shell-style pattern, such as C(web-*), matched case-sensitively against the names of the objects
+        required: false
+        type: str
+    names:
+        description:
+            - only return objects with these names
+        required: false
+        type: list
+        elements: str
+    path:
+        description:
+            - path of the SQLite database
+            - defaults to the mirror of the tenant of I(scope) or I(provider)
+        required: false
+        type: path
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
+    provider:
+        description:
+            - tenant whose mirror is read, when neither I(path) nor I(scope) is given; only its scope is used, so
+              its credentials can be left out
+            - accepted so the provider of a play can be shared with this module; reading the mirror makes no API
+              requests
+        required: false
+        type: dict
+    scope:
+        description:
+            - scope of the tenant whose mirror is read, when I(path) is not given, as for the mirror lookup
+        required: false
+        type: str
+    tag:
+        description:
+            - only return objects carrying this tag
+        required: false
+        type: str
+    type:
+        description:
+            - only return objects of this type
+        required: false
+        type: str
+        choices:
+            - "address"
+            - "address_group"
+            - "ike_gateway"
+            - "ipsec_tunnel"
+            - "remote_network"
+            - "service_connection"
+            - "tag"
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+    - name: Read the remote networks of the branches from the mirror
+      cdot65.prisma_access.mirror_info:
+        scope: "{{ scope }}"
+        type: "remote_network"
+        name_pattern: "Branch-*"
+        max_age: 3600
+      register: branches
+"""
+
+RETURN = r"""
+database:
+    description: path of the SQLite database
+    returned: always
+    type: str
+objects:
+    description: configuration of every matching object, with its type under object_type
+    returned: always
+    type: list
+    elements: dict
+synced:
+    description: time the oldest listing of the returned object types was synced, in seconds since the epoch
+    returned: always
+    type: float
+"""
+
+
+def main():
+    """This is the main function that contains the logic for reading objects from the local SQLite mirror of a
+        tenant of the Prisma Access platform.
+
+    It takes no arguments and returns no values.
+
+    It uses the AnsibleModule class to get the module's argument specification and process the results of the
+        module's actions.
+
+    Raises an exception if an error occurs during the module's execution.
+    """
+    module = AnsibleModule(
+        argument_spec=mirror_info_spec(),
+        required_one_of=[["path", "provider", "scope"]],
+        supports_check_mode=True,
+    )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 1. Open the mirror and check that the listings of the object types read are recent enough.                     #
+    # -------------------------------------------------------------------------------------------------------------- #
+    scope = module.params["scope"] or (module.params["provider"] or {}).get(
+        "scope"
+    )
+    if not scope and not module.params["path"]:
+        module.fail_json(msg="scope is required when path is not given")
+    path = mirror_path(scope, module.params["path"])
+
+    try:
+        with Mirror(path) as mirror:
+            listings = mirror.listings(module.params["type"])
+            if module.params["folder"]:
+                listings = [
+                    each
+                    for each in listings
+                    if each["folder"] == module.params["folder"]
+                ]
+            synced = min((each["synced"] for each in listings), default=None)
+
+            if synced is None:
+                module.fail_json(
+                    msg=f"{path} holds no listing of the objects requested; run mirror_sync first",
+                    database=path,
+                )
+            if (
+                module.params["max_age"] is not None
+                and time.time() - synced > module.params["max_age"]
+            ):
+                module.fail_json(
+                    msg=f"{path} was last synced {time.time() - synced:.0f} seconds ago, more than max_age",
+                    database=path,
+                    synced=synced,
+                )
+
+            # ------------------------------------------------------------------------------------------------------ #
+            # 2. Select the objects matching every filter given.                                                     #
+            # ------------------------------------------------------------------------------------------------------ #
+            objects = mirror.query(
+                object_type=module.params["type"],
+                names=module.params["names"],
+                folder=module.params["folder"],
+                tag=module.params["tag"],
+                name_pattern=module.params["name_pattern"],
+            )
+
+    except Exception as exception_error:
+        module.fail_json(msg=to_native(exception_error), database=path)
+
+    module.exit_json(
+        changed=False, objects=objects, database=path, synced=synced
+    )
+
+
+if __name__ == "__main__":
+    run_profiled(main)
@@ -0,0 +1,297 @@
+"""
+Ansible module for mirroring the configuration of a Prisma Access tenant into a local SQLite database.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+import time
+from traceback import format_exc
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils._text import to_native
+from ..module_utils.specs.mirror_sync import (
+    mirror_sync_spec,
+)
+from ..module_utils.authenticate import (
+    get_authenticated_session,
+)
+from ..module_utils.bulk import (
+    RateLimiter,
+    list_objects,
+    stream_fan_out,
+)
+from ..module_utils.mirror import (
+    MIRROR_TYPES,
+    Mirror,
+    mirror_path,
+    object_class,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: mirror_sync
+
+short_description: Mirror the configuration of a tenant into a local SQLite database.
+
+version_added: "0.1.9"
+
+description:
+    - Mirror addresses, address groups, tags, IKE gateways, IPsec tunnels, remote networks and service connections
+      into a SQLite database on the host running the module, indexed by name, folder and tag, so playbooks and
+      reports can read them with the mirror_info module or the cdot65.prisma_access.mirror lookup instead of the API.
+    - Every object type is listed once per folder, the folders concurrently. Only the objects added, changed or
+      removed since the previous sync are written, and listings synced less than I(max_age) seconds ago are not
+      listed again at all.
+    - A mirror holds a single tenant; syncing another tenant into it fails.
+    - Supports check mode, returning what would change without writing to the mirror.
+
+options:
+    folders:
+        description:
+            - folders listed for every object type
+            - by default, address groups, addresses and tags are listed in C(Shared), C(Mobile Users),
+              C(Remote Networks) and C(Service Connections), IKE gateways and IPsec tunnels in C(Remote Networks) and
+              C(Service Connections), and remote networks and service connections in their own folder
+        required: false
+        type: list
+        elements: str
+    max_age:
+        description:
+            - number of seconds a listing is considered fresh; fresher listings are not synced again
+            - 0 syncs every listing
+        required: false
+        default: 0
+        type: int
+    max_workers:
+        description:
+            - number of listings fetched concurrently
+        required: false
+        default: 8
+        type: int
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
+    path:
+        description:
+            - path of the SQLite database
+            - defaults to C(~/.ansible/cache/cdot65.prisma_access/mirror-<scope>.sqlite), one per tenant
+        required: false
+        type: path
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
+    rate_limit:
+        description:
+            - maximum number of API calls per second; 0 disables limiting
+        required: false
+        default: 5.0
+        type: float
+    types:
+        description:
+            - object types mirrored
+        required: false
+        default: ["address", "address_group", "ike_gateway", "ipsec_tunnel", "remote_network",
+                  "service_connection", "tag"]
+        type: list
+        elements: str
+        choices:
+            - "address"
+            - "address_group"
+            - "ike_gateway"
+            - "ipsec_tunnel"
+            - "remote_network"
+            - "service_connection"
+            - "tag"
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+    - name: Refresh the mirror of the tenant, at most once every 15 minutes
+      cdot65.prisma_access.mirror_sync:
+        provider:
+          client_id: "{{ client_id }}"
+          client_secret: "{{ client_secret }}"
+          scope: "{{ scope }}"
+        max_age: 900
+
+    - name: Read the addresses tagged web from the mirror
+      ansible.builtin.debug:
+        msg: "{{ query('cdot65.prisma_access.mirror', type='address', tag='web', scope=scope) }}"
+"""
+
+RETURN = r"""
+database:
+    description: path of the SQLite database
+    returned: always
+    type: str
+listings:
+    description: listings synced, with the number of objects added, updated, removed and unchanged in each
+    returned: always
+    type: list
+    elements: dict
+metrics:
+    description: API requests made by the module and the time spent authenticating, listing and writing
+    returned: when I(metrics) is enabled
+    type: dict
+skipped:
+    description: listings not synced because they were synced less than I(max_age) seconds ago
+    returned: always
+    type: list
+    elements: dict
+"""
+
+
+def main():
+    """This is the main function that contains the logic for mirroring the configuration of a tenant of the
+        Prisma Access platform into a local SQLite database.
+
+    It takes no arguments and returns no values.
+
+    It uses the AnsibleModule class to get the module's argument specification and process the results of the
+        module's actions.
+
+    Raises an exception if an error occurs during the module's execution.
+    """
+    module = AnsibleModule(
+        argument_spec=mirror_sync_spec(),
+        supports_check_mode=True,
+    )
+    scope = module.params["provider"]["scope"]
+    path = mirror_path(scope, module.params["path"])
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 1. Open the mirror and select the listings older than max_age, without contacting the API.                     #
+    # -------------------------------------------------------------------------------------------------------------- #
+    try:
+        mirror = Mirror(path, create=True)
+        mirror.claim(scope)
+
+    except (OSError, ValueError) as exception_error:
+        module.fail_json(msg=to_native(exception_error))
+
+    now = time.time()
+    listings = []
+    skipped = []
+    for object_type in module.params["types"]:
+        for folder in module.params["folders"] or MIRROR_TYPES[object_type][2]:
+            synced = mirror.synced(object_type, folder)
+            if synced is not None and now - synced < module.params["max_age"]:
+                skipped.append(
+                    {"type": object_type, "folder": folder, "synced": synced}
+                )
+            else:
+                listings.append((object_type, folder))
+
+    if not listings:
+        mirror.close()
+        module.exit_json(
+            changed=False, listings=[], database=path, skipped=skipped
+        )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 2. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed  #
+    #    through the Ansible module.                                                                                 #
+    # -------------------------------------------------------------------------------------------------------------- #
+    try:
+        # get the provider parameter from the Ansible module, which includes the authentication credentials
+        session = get_authenticated_session(module)
+
+    except Exception as exception_error:
+        # if an exception occurs during the authentication process, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    limiter = RateLimiter(module.params["rate_limit"])
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 3. List the selected listings concurrently and apply each one to the mirror as it arrives, in its own          #
+    #    transaction, so a failure keeps the listings already synced.                                                #
+    # -------------------------------------------------------------------------------------------------------------- #
+    results = []
+    try:
+        for (object_type, folder), objects in zip(
+            listings,
+            stream_fan_out(
+                lambda listing: list_objects(
+                    session, object_class(listing[0]), listing[1], limiter
+                ),
+                listings,
+                module.params["max_workers"],
+            ),
+        ):
+            counts = mirror.apply(
+                object_type,
+                folder,
+                (vars(each) for each in objects),
+                check_mode=module.check_mode,
+            )
+            results.append(dict(counts, type=object_type, folder=folder))
+
+        changed = any(
+            each["added"] or each["updated"] or each["removed"]
+            for each in results
+        )
+        if changed and not module.check_mode:
+            mirror.analyze()
+
+    except Exception as exception_error:
+        # If an exception occurs, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error),
+            exception=format_exc(),
+            listings=results,
+            database=path,
+        )
+
+    finally:
+        mirror.close()
+
+    module.exit_json(
+        changed=changed,
+        listings=results,
+        database=path,
+        skipped=skipped,
+    )
+
+
+if __name__ == "__main__":
+    run_profiled(main)
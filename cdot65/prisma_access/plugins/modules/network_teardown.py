@@ -0,0 +1,382 @@
+"""
+Ansible module for tearing down connections, IPsec tunnels and IKE gateways in Prisma Access.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+from fnmatch import fnmatchcase
+from traceback import format_exc
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils._text import to_native
+from ..module_utils.specs.network_teardown import (
+    network_teardown_spec,
+)
+from ..module_utils.authenticate import (
+    get_authenticated_session,
+)
+from ..module_utils.bulk import (
+    RateLimiter,
+    apply_object,
+    fan_out,
+    list_objects,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+from ..module_utils.references import (
+    connection_references,
+    dependency_levels,
+    ipsec_tunnel_references,
+)
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: network_teardown
+
+short_description: Delete connections, IPsec tunnels and IKE gateways in dependency order.
+
+version_added: "0.1.9"
+
+description:
+    - Select remote networks, service connections, IPsec tunnels and IKE gateways by name, name pattern or tag.
+    - With I(cascade), the IPsec tunnels and IKE gateways used by the selected objects are deleted as well, unless an
+      object that is not being deleted still references them.
+    - The objects are deleted in reverse dependency order, connections first and IKE gateways last, with every level
+      deleted concurrently.
+    - Supports check mode, returning the levels that would be deleted.
+
+options:
+    cascade:
+        description:
+            - also delete the IPsec tunnels and IKE gateways only referenced by the selected objects
+        required: false
+        default: true
+        type: bool
+    folders:
+        description:
+            - folders searched for objects to delete
+        required: false
+        default: ["Remote Networks", "Service Connections"]
+        type: list
+        elements: str
+        choices:
+            - "Remote Networks"
+            - "Service Connections"
+    max_workers:
+        description:
+            - number of objects deleted concurrently within a level
+        required: false
+        default: 8
+        type: int
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
+    name_patterns:
+        description:
+            - shell-style patterns, such as C(Branch-*), selecting objects by name
+        required: false
+        type: list
+        elements: str
+    names:
+        description:
+            - names of the objects to delete
+            - the name of a site created by the site module selects its connection, and with it the whole site
+        required: false
+        type: list
+        elements: str
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
+    rate_limit:
+        description:
+            - maximum number of API calls per second; 0 disables limiting
+        required: false
+        default: 5.0
+        type: float
+    tags:
+        description:
+            - select objects carrying any of these tags
+        required: false
+        type: list
+        elements: str
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+    - name: Decommission every branch whose name starts with Branch-
+      cdot65.prisma_access.network_teardown:
+        provider:
+          client_id: "{{ client_id }}"
+          client_secret: "{{ client_secret }}"
+          scope: "{{ scope }}"
+        folders:
+          - "Remote Networks"
+        name_patterns:
+          - "Branch-*"
+        max_workers: 16
+"""
+
+RETURN = r"""
+levels:
+    description: objects deleted (or that would be deleted in check mode), one list per dependency level
+    returned: always
+    type: list
+    elements: list
+metrics:
+    description: API requests made by the module and the time spent authenticating, listing and writing
+    returned: when I(metrics) is enabled
+    type: dict
+"""
+
+
+def object_classes():
+    """Return the object types that can be torn down, keyed by the label used in results.
+
+    The SDK is imported here rather than with the module, once the arguments have been validated.
+    """
+    from panapi.config.network import (
+        IKEGateway,
+        IPSecTunnel,
+        RemoteNetwork,
+        ServiceConnection,
+    )
+
+    return {
+        "service_connection": ServiceConnection,
+        "remote_network": RemoteNetwork,
+        "ipsec_tunnel": IPSecTunnel,
+        "ike_gateway": IKEGateway,
+    }
+
+
+def referenced_nodes(node, obj, labels):
+    """Return the (type, folder, name) nodes an existing object references, given the label of every object class."""
+    object_type, folder, _name = node
+    config = dict(vars(obj), folder=folder)
+
+    if object_type == "ipsec_tunnel":
+        references = ipsec_tunnel_references(config)
+    elif object_type in ("remote_network", "service_connection"):
+        references = connection_references(config)
+    else:
+        references = []
+
+    return set(
+        (labels[object_class], reference_folder, name)
+        for _label, object_class, reference_folder, name in references
+        if object_class in labels
+    )
+
+
+def main():
+    """This is the main function that contains the logic for deleting connections, IPsec tunnels and IKE gateways
+        in dependency order on the Prisma Access platform.
+
+    It takes no arguments and returns no values.
+
+    It uses the AnsibleModule class to get the module's argument specification and process the results of the
+        module's actions.
+
+    Raises an exception if an error occurs during the module's execution.
+    """
+    module = AnsibleModule(
+        argument_spec=network_teardown_spec(),
+        required_one_of=[["name_patterns", "names", "tags"]],
+        supports_check_mode=True,
+    )
+    object_types = object_classes()
+    labels = dict((value, key) for key, value in object_types.items())
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 1. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed  #
+    #    through the Ansible module.                                                                                 #
+    # -------------------------------------------------------------------------------------------------------------- #
+    try:
+        # get the provider parameter from the Ansible module, which includes the authentication credentials
+        session = get_authenticated_session(module)
+
+    except Exception as exception_error:
+        # if an exception occurs during the authentication process, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    limiter = RateLimiter(module.params["rate_limit"])
+    max_workers = module.params["max_workers"]
+
+    try:
+        # ---------------------------------------------------------------------------------------------------------- #
+        # 2. List every object type in every folder concurrently and index them by (type, folder, name).             #
+        # ---------------------------------------------------------------------------------------------------------- #
+        listings = [
+            (object_type, folder)
+            for object_type in object_types
+            for folder in module.params["folders"]
+        ]
+        inventory = {}
+        for (object_type, folder), objects in zip(
+            listings,
+            fan_out(
+                lambda listing: list_objects(
+                    session, object_types[listing[0]], listing[1], limiter
+                ),
+                listings,
+                max_workers,
+            ),
+        ):
+            for obj in objects:
+                inventory[(object_type, folder, obj.name)] = obj
+
+        # ---------------------------------------------------------------------------------------------------------- #
+        # 3. Build the reference graph and select the objects to delete.                                             #
+        # ---------------------------------------------------------------------------------------------------------- #
+        references = {}
+        referrers = {}
+        for node, obj in inventory.items():
+            references[node] = referenced_nodes(node, obj, labels) & set(
+                inventory
+            )
+            for referenced in references[node]:
+                referrers.setdefault(referenced, set()).add(node)
+
+        names = set(module.params["names"] or [])
+        patterns = module.params["name_patterns"] or []
+        tags = set(module.params["tags"] or [])
+
+        selected = set(
+            node
+            for node, obj in inventory.items()
+            if node[2] in names
+            or any(fnmatchcase(node[2], pattern) for pattern in patterns)
+            or tags & set(getattr(obj, "tag", None) or [])
+        )
+
+        # dependencies are added once every object referencing them is deleted as well
+        if module.params["cascade"]:
+            pending = set(selected)
+            while pending:
+                node = pending.pop()
+                for referenced in references[node]:
+                    if referenced not in selected and referrers[
+                        referenced
+                    ].issubset(selected):
+                        selected.add(referenced)
+                        pending.add(referenced)
+
+        blocked = sorted(
+            f"{node[0]} '{node[2]}' is referenced by {referrer[0]} '{referrer[2]}'"
+            for node in selected
+            for referrer in referrers.get(node, ())
+            if referrer not in selected
+        )
+        if blocked:
+            module.fail_json(
+                msg=f"Objects still in use: {'; '.join(blocked)}",
+                blocked=blocked,
+            )
+
+        # ---------------------------------------------------------------------------------------------------------- #
+        # 4. Delete one level of the reverse dependency graph at a time, the objects of a level concurrently. The     #
+        #    dependencies of an object that could not be deleted are kept.                                           #
+        # ---------------------------------------------------------------------------------------------------------- #
+        levels = dependency_levels(
+            selected,
+            [
+                (node, referenced)
+                for node in selected
+                for referenced in references[node]
+            ],
+        )
+
+        results = []
+        failed = set()
+        for level in levels:
+            level = sorted(level)
+
+            def delete(node):
+                object_type, folder, name = node
+                result = {"type": object_type, "folder": folder, "name": name}
+                if referrers.get(node, set()) & failed:
+                    result["result"] = "skipped"
+                elif module.check_mode:
+                    result["result"] = "deleted"
+                else:
+                    result.update(
+                        apply_object(
+                            session,
+                            object_types[object_type],
+                            {"name": name, "folder": folder},
+                            inventory[node],
+                            "absent",
+                            limiter,
+                        )
+                    )
+                return result
+
+            level_results = fan_out(delete, level, max_workers)
+            for node, result in zip(level, level_results):
+                if result["result"] in ("failed", "skipped"):
+                    failed.add(node)
+            results.append(level_results)
+
+    except Exception as exception_error:
+        # If an exception occurs, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 5. Aggregate the results of every level.                                                                       #
+    # -------------------------------------------------------------------------------------------------------------- #
+    changed = any(
+        each["result"] == "deleted" for level in results for each in level
+    )
+
+    if failed:
+        module.fail_json(
+            msg=f"{len(failed)} of {len(selected)} objects could not be deleted",
+            changed=changed,
+            levels=results,
+        )
+
+    module.exit_json(changed=changed, levels=results)
+
+
+if __name__ == "__main__":
+    run_profiled(main)
@@ -6,15 +6,28 @@ from __future__ import absolute_import, division, print_function
 from traceback import format_exc
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils._text import to_native
-from ..module_utils.api_spec import (
-    PrismaAccessSpec,
+from ..module_utils.specs.remote_network import (
+    remote_network_spec,
 )
 from ..module_utils.authenticate import (
     get_authenticated_session,
 )
-
-# Prisma Access SDK
-from panapi.config.network import RemoteNetwork
+from ..module_utils.capacity import (
+    CapacityCache,
+    fewest_networks_spn,
+)
+from ..module_utils.network import (
+    canonical_subnets,
+    merge_subnets,
+    remote_network_config,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+from ..module_utils.references import (
+    ReferenceResolver,
+    connection_references,
+)
 
 __metaclass__ = type
 
@@ -29,6 +42,15 @@ version_added: "0.1.8
 description: Manage Remote Networks objects within Prisma Access.
 
 options:
+    auto_spn:
+        description:
+            - when I(spn_name) is not set, place a new remote network on the SPN of its region with the fewest
+              remote networks
+            - SPNs are balanced on the number of remote networks rather than on bandwidth, which the API does not
+              report per remote network
+        required: false
+        default: false
+        type: bool
     bgp_peer:
         description: BGP peer information.
         options:
@@ -126,10 +148,49 @@ options:
         description: name of license type
         required: true
         type: str
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
     name:
         description: name of Remote Network
         required: true
         type: str
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
     protocol:
         description:
             - protocol to use
@@ -270,6 +331,35 @@ options:
         required: false
         type: list
         elements: str
+    subnets_add:
+        description:
+            - subnets added to those of an existing remote network, without replacing them
+            - equivalent notations of the same prefix are treated as one
+        required: false
+        type: list
+        elements: str
+    subnets_remove:
+        description:
+            - subnets removed from those of an existing remote network
+        required: false
+        type: list
+        elements: str
+    validate_placement:
+        description:
+            - check that the region has bandwidth allocated and that I(spn_name) belongs to it before creating the
+              remote network
+            - allocations are cached on the controller for five minutes per tenant
+            - also done when I(auto_spn) is enabled
+        required: false
+        default: false
+        type: bool
+    validate_references:
+        description:
+            - check that the IPsec tunnels exist before creating the remote network
+            - every unresolved name is reported at once, before any write is attempted
+        required: false
+        default: false
+        type: bool
 
 author:
     - Calvin Remsburg (@cdot65)
@@ -373,7 +463,10 @@ def main():
 
     Raises an exception if an error occurs during the module's execution.
     """
-    module = AnsibleModule(argument_spec=PrismaAccessSpec.remote_network_spec())
+    module = AnsibleModule(argument_spec=remote_network_spec())
+
+    # Prisma Access SDK, imported once the arguments have been validated
+    from panapi.config.network import RemoteNetwork
 
     # -------------------------------------------------------------------------------------------------------------- #
     # 1. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed  #
@@ -388,43 +481,16 @@ def main():
         module.fail_json(msg=to_native(exception_error), exception=format_exc())
 
     # -------------------------------------------------------------------------------------------------------------- #
-    # 2. Create a dictionary representing the configuration settings for a Remote Network.                           #
-    # -------------------------------------------------------------------------------------------------------------- #
-    remote_network = {
-        "name": module.params["name"],
-        "folder": module.params["folder"],
-        "license_type": module.params["license_type"],
-        "protocol": module.params["protocol"],
-        "region": module.params["region"],
-    }
-
-    # -------------------------------------------------------------------------------------------------------------- #
-    # 3. account for optional parameters, appending them to the dictionary only if they are declared in the playbook #
+    # 2. Build the configuration settings for a Remote Network from the parameters passed in the playbook.           #
     # -------------------------------------------------------------------------------------------------------------- #
-    if module.params["ecmp_load_balancing"]:
-        remote_network["ecmp_load_balancing"] = module.params[
-            "ecmp_load_balancing"
-        ]
-
-    if module.params["ecmp_tunnels"]:
-        remote_network["ecmp_tunnels"] = module.params["ecmp_tunnels"]
-
-    if module.params["ipsec_tunnel"]:
-        remote_network["ipsec_tunnel"] = module.params["ipsec_tunnel"]
-
-    if module.params["secondary_ipsec_tunnel"]:
-        remote_network["secondary_ipsec_tunnel"] = module.params[
-            "secondary_ipsec_tunnel"
-        ]
-
-    if module.params["spn_name"]:
-        remote_network["spn_name"] = module.params["spn_name"]
+    try:
+        remote_network = remote_network_config(module.params)
 
-    if module.params["subnets"]:
-        remote_network["subnets"] = module.params["subnets"]
+    except ValueError as exception_error:
+        module.fail_json(msg=to_native(exception_error))
 
     # -------------------------------------------------------------------------------------------------------------- #
-    # 4. create an instance of the "RemoteNetwork" class using the remote_network dictionary.                        #
+    # 3. create an instance of the "RemoteNetwork" class using the remote_network dictionary.                        #
     # -------------------------------------------------------------------------------------------------------------- #
     try:
         # Create an RemoteNetwork object with the remote_network dictionary
@@ -432,12 +498,14 @@ def main():
 
         # Check if an Remote Network with the same name already exists
         already_exists = False
+        current = None
         existing_remote_network = connection.list(session)
 
         for each in existing_remote_network:
             if connection.name == each.name:
                 already_exists = True
                 connection.id = each.id
+                current = each
 
         # Check the state parameter to see if the Remote Network should be created or deleted
         if module.params["state"] == "absent":
@@ -460,16 +528,79 @@ def main():
                 )
         else:
             if already_exists is False:
+                # Check the region and SPN against the cached bandwidth allocations, picking an SPN when asked to
+                placement = None
+                if (
+                    module.params["validate_placement"]
+                    or module.params["auto_spn"]
+                ):
+                    placement = CapacityCache(
+                        module.params["provider"]["scope"]
+                    )
+                    snapshot, error = placement.check(
+                        session,
+                        remote_network["region"],
+                        remote_network.get("spn_name"),
+                    )
+                    if error:
+                        module.fail_json(msg=error)
+                    if module.params["auto_spn"] and not getattr(
+                        connection, "spn_name", None
+                    ):
+                        connection.spn_name = fewest_networks_spn(
+                            snapshot, remote_network["region"]
+                        )
+
+                # Validate every name the remote network references in a single batch, before attempting the write
+                if module.params["validate_references"]:
+                    unresolved = ReferenceResolver(session).unresolved(
+                        connection_references(remote_network)
+                    )
+                    if unresolved:
+                        module.fail_json(
+                            msg=f"Unresolved references: {'; '.join(unresolved)}",
+                            unresolved=unresolved,
+                        )
+
                 # Create the Remote Network if it doesn't exist
                 connection.create(session)
                 if session.response.status_code != 201:
                     module.fail_json(
                         msg=f"Did not receive proper response: {session.response.text}"
                     )
+                if placement and getattr(connection, "spn_name", None):
+                    placement.record_placement(snapshot, connection.spn_name)
+                # Exit the module with a success message
+                module.exit_json(
+                    changed=True,
+                    data=session.response.json(),
+                )
+            elif (
+                module.params["subnets_add"] or module.params["subnets_remove"]
+            ):
+                # Apply the subnet additions and removals to the live subnets, updating only when the set differs
+                subnets = merge_subnets(
+                    getattr(current, "subnets", None),
+                    module.params["subnets_add"],
+                    module.params["subnets_remove"],
+                )
+                if set(subnets) == set(
+                    canonical_subnets(getattr(current, "subnets", None))
+                ):
+                    module.exit_json(changed=False, subnets=subnets)
+
+                current.folder = remote_network["folder"]
+                current.subnets = subnets
+                current.update(session)
+                if session.response.status_code != 200:
+                    module.fail_json(
+                        msg=f"Did not receive proper response: {session.response.text}"
+                    )
                 # Exit the module with a success message
                 module.exit_json(
                     changed=True,
                     data=session.response.json(),
+                    subnets=subnets,
                 )
             else:
                 # Exit the module with a message saying the Remote Network already exists
@@ -484,4 +615,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main)
@@ -6,15 +6,24 @@ from __future__ import absolute_import, division, print_function
 from traceback import format_exc
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils._text import to_native
-from ..module_utils.api_spec import (
-    PrismaAccessSpec,
+from ..module_utils.specs.service_connection import (
+    service_connection_spec,
 )
 from ..module_utils.authenticate import (
     get_authenticated_session,
 )
-
-# Prisma Access SDK
-from panapi.config.network import ServiceConnection
+from ..module_utils.network import (
+    canonical_subnets,
+    merge_subnets,
+    service_connection_config,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+from ..module_utils.references import (
+    ReferenceResolver,
+    connection_references,
+)
 
 __metaclass__ = type
 
@@ -87,6 +96,13 @@ options:
             - name of IPsec tunnel to use
         required: true
         type: str
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
     name:
         description:
             - name of service connection
@@ -107,6 +123,38 @@ options:
             - "Enabled-In"
             - "Enabled-Out"
             - "Enabled-Both"
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
     protocol:
         description:
             - protocol to use
@@ -257,9 +305,30 @@ options:
     subnets:
         description:
             - subnets
+            - required when the service connection is created
+        required: false
+        type: list
+        elements: str
+    subnets_add:
+        description:
+            - subnets added to those of an existing service connection, without replacing them
+            - equivalent notations of the same prefix are treated as one
         required: false
         type: list
         elements: str
+    subnets_remove:
+        description:
+            - subnets removed from those of an existing service connection
+        required: false
+        type: list
+        elements: str
+    validate_references:
+        description:
+            - check that the IPsec tunnels exist before creating the service connection
+            - every unresolved name is reported at once, before any write is attempted
+        required: false
+        default: false
+        type: bool
 
 author:
     - Calvin Remsburg (@cdot65)
@@ -389,9 +458,10 @@ def main():
 
     Raises an exception if an error occurs during the module's execution.
     """
-    module = AnsibleModule(
-        argument_spec=PrismaAccessSpec.service_connection_spec()
-    )
+    module = AnsibleModule(argument_spec=service_connection_spec())
+
+    # Prisma Access SDK, imported once the arguments have been validated
+    from panapi.config.network import ServiceConnection
 
     # -------------------------------------------------------------------------------------------------------------- #
     # 1. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed  #
@@ -406,49 +476,16 @@ def main():
         module.fail_json(msg=to_native(exception_error), exception=format_exc())
 
     # -------------------------------------------------------------------------------------------------------------- #
-    # 2. Create a dictionary representing the configuration settings for a Service Connection.                       #
-    # -------------------------------------------------------------------------------------------------------------- #
-    service_connection = {
-        "name": module.params["name"],
-        "folder": module.params["folder"],
-        "ipsec_tunnel": module.params["ipsec_tunnel"],
-        "region": module.params["region"],
-        "subnets": module.params["subnets"],
-    }
-
-    # -------------------------------------------------------------------------------------------------------------- #
-    # 3. account for optional parameters, appending them to the dictionary only if they are declared in the playbook #
+    # 2. Build the configuration settings for a Service Connection from the parameters passed in the playbook.       #
     # -------------------------------------------------------------------------------------------------------------- #
-    if module.params["backup_sc"]:
-        service_connection["backup_sc"] = module.params["backup_sc"]
-
-    if module.params["bgp_peer"]:
-        service_connection["bgp_peer"] = module.params["bgp_peer"]
-
-    if module.params["nat_pool"]:
-        service_connection["nat_pool"] = module.params["nat_pool"]
-
-    if module.params["no_export_community"]:
-        service_connection["no_export_community"] = module.params[
-            "no_export_community"
-        ]
-
-    if module.params["protocol"]:
-        service_connection["protocol"] = module.params["protocol"]
-
-    if module.params["qos"]:
-        service_connection["qos"] = module.params["qos"]
-
-    if module.params["secondary_ipsec_tunnel"]:
-        service_connection["secondary_ipsec_tunnel"] = module.params[
-            "secondary_ipsec_tunnel"
-        ]
+    try:
+        service_connection = service_connection_config(module.params)
 
-    if module.params["source_nat"]:
-        service_connection["source_nat"] = module.params["source_nat"]
+    except ValueError as exception_error:
+        module.fail_json(msg=to_native(exception_error))
 
     # -------------------------------------------------------------------------------------------------------------- #
-    # 4. create an instance of the "ServiceConnection" class using the service_connection dictionary.                #
+    # 3. create an instance of the "ServiceConnection" class using the service_connection dictionary.                #
     # -------------------------------------------------------------------------------------------------------------- #
     try:
         # Create an ServiceConnection object with the service_connection dictionary
@@ -456,12 +493,14 @@ def main():
 
         # Check if an Service Connection with the same name already exists
         already_exists = False
+        current = None
         existing_service_connection = connection.list(session)
 
         for each in existing_service_connection:
             if connection.name == each.name:
                 already_exists = True
                 connection.id = each.id
+                current = each
 
         # Check the state parameter to see if the Service Connection should be created or deleted
         if module.params["state"] == "absent":
@@ -484,6 +523,22 @@ def main():
                 )
         else:
             if already_exists is False:
+                if not service_connection["subnets"]:
+                    module.fail_json(
+                        msg="subnets or subnets_add is required to create a service connection"
+                    )
+
+                # Validate every name the service connection references in a single batch, before attempting the write
+                if module.params["validate_references"]:
+                    unresolved = ReferenceResolver(session).unresolved(
+                        connection_references(service_connection)
+                    )
+                    if unresolved:
+                        module.fail_json(
+                            msg=f"Unresolved references: {'; '.join(unresolved)}",
+                            unresolved=unresolved,
+                        )
+
                 # Create the Service Connection if it doesn't exist
                 connection.create(session)
                 if session.response.status_code != 201:
@@ -495,6 +550,33 @@ def main():
                     changed=True,
                     data=session.response.json(),
                 )
+            elif (
+                module.params["subnets_add"] or module.params["subnets_remove"]
+            ):
+                # Apply the subnet additions and removals to the live subnets, updating only when the set differs
+                subnets = merge_subnets(
+                    getattr(current, "subnets", None),
+                    module.params["subnets_add"],
+                    module.params["subnets_remove"],
+                )
+                if set(subnets) == set(
+                    canonical_subnets(getattr(current, "subnets", None))
+                ):
+                    module.exit_json(changed=False, subnets=subnets)
+
+                current.folder = service_connection["folder"]
+                current.subnets = subnets
+                current.update(session)
+                if session.response.status_code != 200:
+                    module.fail_json(
+                        msg=f"Did not receive proper response: {session.response.text}"
+                    )
+                # Exit the module with a success message
+                module.exit_json(
+                    changed=True,
+                    data=session.response.json(),
+                    subnets=subnets,
+                )
             else:
                 # Exit the module with a message saying the Service Connection already exists
                 module.exit_json(
@@ -508,4 +590,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main)
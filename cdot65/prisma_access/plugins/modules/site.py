@@ -0,0 +1,474 @@
+"""
+Ansible module for provisioning complete sites (IKE gateway, IPsec tunnel and connection) in Prisma Access.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+from traceback import format_exc
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils._text import to_native
+from ..module_utils.specs.site import (
+    site_objects,
+    site_spec,
+)
+from ..module_utils.authenticate import (
+    get_authenticated_session,
+)
+from ..module_utils.bulk import (
+    RateLimiter,
+    apply_object,
+    fan_out,
+)
+from ..module_utils.network import (
+    ike_gateway_config,
+    ipsec_tunnel_config,
+    remote_network_config,
+    service_connection_config,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+from ..module_utils.references import (
+    ReferenceResolver,
+    connection_references,
+    ike_gateway_references,
+    ipsec_tunnel_references,
+)
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: site
+
+short_description: Provision IKE gateway, IPsec tunnel and connection of sites in one task.
+
+version_added: "0.1.9"
+
+description:
+    - Create, update or delete the IKE gateway, IPsec tunnel and remote network or service connection of many sites.
+    - Objects are applied in dependency order, gateways first and connections last, and in reverse order on deletion.
+    - A single session is used and every object type is listed once per folder; sites are processed concurrently.
+    - References to objects not defined in the task are validated in one batch before anything is written.
+
+options:
+    max_workers:
+        description:
+            - number of sites processed concurrently
+        required: false
+        default: 8
+        type: int
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
+    rate_limit:
+        description:
+            - maximum number of API calls per second; 0 disables limiting
+        required: false
+        default: 5.0
+        type: float
+    sites:
+        description:
+            - sites to provision
+        required: true
+        type: list
+        elements: dict
+        suboptions:
+            folder:
+                description:
+                    - folder of the site's objects
+                    - defaults to C(Remote Networks) or C(Service Connections) depending on the connection type
+                required: false
+                type: str
+                choices:
+                    - "Remote Networks"
+                    - "Service Connections"
+            ike_gateway:
+                description:
+                    - IKE gateway of the site, using the options of the ike_gateway module
+                    - I(name) defaults to the site name followed by C(-IKE)
+                    - required with I(state=present); with I(state=absent) only I(name) is used
+                required: false
+                type: dict
+            ipsec_tunnel:
+                description:
+                    - IPsec tunnel of the site, using the options of the ipsec_tunnel module
+                    - I(name) defaults to the site name followed by C(-IPsec)
+                    - I(auto_key.ike_gateway) defaults to the site's IKE gateway
+                    - required with I(state=present); with I(state=absent) only I(name) is used
+                required: false
+                type: dict
+            name:
+                description:
+                    - name of the site
+                required: true
+                type: str
+            remote_network:
+                description:
+                    - remote network of the site, using the options of the remote_network module
+                    - I(name) defaults to the site name and I(ipsec_tunnel) to the site's IPsec tunnel
+                required: false
+                type: dict
+            service_connection:
+                description:
+                    - service connection of the site, using the options of the service_connection module
+                    - I(name) defaults to the site name and I(ipsec_tunnel) to the site's IPsec tunnel
+                required: false
+                type: dict
+    state:
+        description:
+            - declare whether you want the sites to exist or be deleted
+        required: true
+        choices:
+          - 'absent'
+          - 'present'
+        type: str
+    validate_references:
+        description:
+            - check that crypto profiles, IKE gateways and IPsec tunnels not defined in the task exist before writing
+        required: false
+        default: false
+        type: bool
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+    - name: Provision branch sites
+      cdot65.prisma_access.site:
+        provider:
+          client_id: "{{ client_id }}"
+          client_secret: "{{ client_secret }}"
+          scope: "{{ scope }}"
+        sites:
+          - name: "Branch-001"
+            ike_gateway:
+              peer_id:
+                id: "73.206.3.129"
+                type: "ipaddr"
+              authentication:
+                pre_shared_key: "paloalto1!"
+              peer_address:
+                ip: "73.206.3.129"
+              protocol:
+                ikev2:
+                  ike_crypto_profile: "PaloAlto-Networks-IKE-Crypto"
+                  dpd:
+                    enable: True
+                version: "ikev2-preferred"
+            ipsec_tunnel:
+              auto_key:
+                ipsec_crypto_profile: "PaloAlto-Networks-IPSec-Crypto"
+              anti_replay: True
+              tunnel_monitor:
+                enable: True
+                destination_ip: "192.168.100.1"
+            remote_network:
+              license_type: "FWAAS-AGGREGATE"
+              region: "us-south1"
+              spn_name: "us-south-raspberry"
+              subnets:
+                - "10.1.0.0/24"
+        max_workers: 10
+        state: "present"
+"""
+
+RETURN = r"""
+metrics:
+    description: API requests made by the module and the time spent authenticating, listing and writing
+    returned: when I(metrics) is enabled
+    type: dict
+sites:
+    description: result of every object of every site, in the order the sites were declared
+    returned: always
+    type: list
+    elements: dict
+"""
+
+
+def missing_options(site, kind):
+    """Return the options a site lacks to create its objects, as paths such as C(ike_gateway -> protocol)."""
+    missing = []
+    for each in ("ike_gateway", "ipsec_tunnel", kind):
+        if site[each] is None:
+            missing.append(each)
+            continue
+        _spec, required = site_objects()[each]
+        missing.extend(
+            f"{each} -> {key}" for key in required if site[each][key] is None
+        )
+    return missing
+
+
+def build_site(site, state):
+    """Return the configurations of a site's objects, keyed by object kind, in dependency order.
+
+    With state=absent only the names and folder of the objects are needed,
+    so every other option may be left out. The SDK is imported here rather
+    than with the module, once the arguments have been validated.
+    """
+    from panapi.config.network import (
+        IKEGateway,
+        IPSecTunnel,
+        RemoteNetwork,
+        ServiceConnection,
+    )
+
+    # connection types a site can use, with their object class and configuration builder
+    connections = {
+        "remote_network": (
+            RemoteNetwork,
+            remote_network_config,
+            "Remote Networks",
+        ),
+        "service_connection": (
+            ServiceConnection,
+            service_connection_config,
+            "Service Connections",
+        ),
+    }
+
+    kind = (
+        "remote_network"
+        if site["remote_network"] is not None
+        else "service_connection"
+    )
+    connection_class, connection_config, default_folder = connections[kind]
+    folder = site["folder"] or default_folder
+
+    gateway = dict(site["ike_gateway"] or {}, folder=folder)
+    gateway["name"] = gateway.get("name") or f"{site['name']}-IKE"
+
+    tunnel = dict(site["ipsec_tunnel"] or {}, folder=folder)
+    tunnel["name"] = tunnel.get("name") or f"{site['name']}-IPsec"
+
+    connection = dict(site[kind], folder=folder)
+    connection["name"] = connection.get("name") or site["name"]
+
+    if state == "absent":
+        return [
+            (
+                "ike_gateway",
+                IKEGateway,
+                {"folder": folder, "name": gateway["name"]},
+            ),
+            (
+                "ipsec_tunnel",
+                IPSecTunnel,
+                {"folder": folder, "name": tunnel["name"]},
+            ),
+            (
+                kind,
+                connection_class,
+                {"folder": folder, "name": connection["name"]},
+            ),
+        ]
+
+    missing = missing_options(site, kind)
+    if missing:
+        raise ValueError(
+            f"missing required arguments: {', '.join(missing)}"
+        )
+
+    tunnel["auto_key"] = dict(tunnel["auto_key"])
+    if not tunnel["auto_key"]["ike_gateway"]:
+        tunnel["auto_key"]["ike_gateway"] = [{"name": gateway["name"]}]
+
+    connection["ipsec_tunnel"] = connection["ipsec_tunnel"] or tunnel["name"]
+
+    return [
+        ("ike_gateway", IKEGateway, ike_gateway_config(gateway)),
+        ("ipsec_tunnel", IPSecTunnel, ipsec_tunnel_config(tunnel)),
+        (kind, connection_class, connection_config(connection)),
+    ]
+
+
+def main():
+    """This is the main function that contains the logic for provisioning the IKE gateway, IPsec tunnel and
+        connection of sites on the Prisma Access platform.
+
+    It takes no arguments and returns no values.
+
+    It uses the AnsibleModule class to get the module's argument specification and process the results of the
+        module's actions.
+
+    Raises an exception if an error occurs during the module's execution.
+    """
+    module = AnsibleModule(argument_spec=site_spec())
+    state = module.params["state"]
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 1. Build the configuration of every object of every site before contacting the API.                            #
+    # -------------------------------------------------------------------------------------------------------------- #
+    sites = []
+    for site in module.params["sites"]:
+        try:
+            sites.append((site["name"], build_site(site, state)))
+        except ValueError as exception_error:
+            module.fail_json(
+                msg=f"Site {site['name']}: {to_native(exception_error)}"
+            )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 2. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed  #
+    #    through the Ansible module. The session is shared by every site.                                            #
+    # -------------------------------------------------------------------------------------------------------------- #
+    try:
+        # get the provider parameter from the Ansible module, which includes the authentication credentials
+        session = get_authenticated_session(module)
+
+    except Exception as exception_error:
+        # if an exception occurs during the authentication process, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    limiter = RateLimiter(module.params["rate_limit"])
+    resolver = ReferenceResolver(session, limiter)
+
+    try:
+        # ---------------------------------------------------------------------------------------------------------- #
+        # 3. List every object type once per folder, then validate the references to objects that are not part of   #
+        #    the task in a single batch, before anything is written.                                                 #
+        # ---------------------------------------------------------------------------------------------------------- #
+        for _name, objects in sites:
+            for _kind, object_class, config in objects:
+                resolver.index(object_class, config["folder"])
+
+        if state == "present" and module.params["validate_references"]:
+            defined = set(
+                (object_class, config["folder"], config["name"])
+                for _name, objects in sites
+                for _kind, object_class, config in objects
+            )
+            references = []
+            for _name, objects in sites:
+                gateway, tunnel, connection = (each[2] for each in objects)
+                references.extend(ike_gateway_references(gateway))
+                references.extend(ipsec_tunnel_references(tunnel))
+                references.extend(connection_references(connection))
+
+            unresolved = resolver.unresolved(
+                sorted(
+                    set(
+                        reference
+                        for reference in references
+                        if reference[1:] not in defined
+                    ),
+                    key=lambda reference: (reference[0], reference[3]),
+                )
+            )
+            if unresolved:
+                module.fail_json(
+                    msg=f"Unresolved references: {'; '.join(unresolved)}",
+                    unresolved=unresolved,
+                )
+
+        # ---------------------------------------------------------------------------------------------------------- #
+        # 4. Apply one dependency level at a time (gateways, tunnels, then connections, or the reverse when deleting) #
+        #    with the sites of a level processed concurrently. A site whose object failed is not taken further.      #
+        # ---------------------------------------------------------------------------------------------------------- #
+        results = [{"name": name} for name, _objects in sites]
+        failed = set()
+        levels = range(3) if state == "present" else range(2, -1, -1)
+
+        for level in levels:
+
+            def apply(position):
+                _kind, object_class, config = sites[position][1][level]
+                if position in failed:
+                    return {"name": config["name"], "result": "skipped"}
+
+                result = apply_object(
+                    session,
+                    object_class,
+                    config,
+                    resolver.index(object_class, config["folder"]).get(
+                        config["name"]
+                    ),
+                    state,
+                    limiter,
+                )
+                if result["result"] == "created":
+                    resolver.add(
+                        object_class,
+                        config["folder"],
+                        object_class(id=result["id"], **config),
+                    )
+                elif result["result"] == "deleted":
+                    resolver.remove(
+                        object_class, config["folder"], config["name"]
+                    )
+                return result
+
+            for position, result in enumerate(
+                fan_out(apply, range(len(sites)), module.params["max_workers"])
+            ):
+                results[position][sites[position][1][level][0]] = result
+                if result["result"] == "failed":
+                    failed.add(position)
+
+    except Exception as exception_error:
+        # If an exception occurs, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 5. Aggregate the per-site results.                                                                             #
+    # -------------------------------------------------------------------------------------------------------------- #
+    changed = any(
+        value["result"] in ("created", "updated", "deleted")
+        for each in results
+        for value in each.values()
+        if isinstance(value, dict)
+    )
+
+    if failed:
+        module.fail_json(
+            msg=f"{len(failed)} of {len(sites)} sites failed: {', '.join(sites[each][0] for each in sorted(failed))}",
+            changed=changed,
+            sites=results,
+        )
+
+    module.exit_json(changed=changed, sites=results)
+
+
+if __name__ == "__main__":
+    run_profiled(main)
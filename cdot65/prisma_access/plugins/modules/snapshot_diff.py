@@ -0,0 +1,257 @@
+"""
+Ansible module for comparing two snapshots of a Prisma Access tenant.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+import json
+import tempfile
+from traceback import format_exc
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils._text import to_native
+from ..module_utils.specs.snapshot_diff import (
+    snapshot_diff_spec,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+from ..module_utils.snapshot import (
+    diff_snapshots,
+    snapshot_entries,
+)
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: snapshot_diff
+
+short_description: Compare two snapshots of a tenant.
+
+version_added: "0.1.9"
+
+description:
+    - Report the objects added, removed and modified between two snapshots of a tenant, each an export of the
+      tenant_export module or a mirror of the mirror_sync module, without contacting the API.
+    - Objects are matched by type, folder and name, and compared by the hash of their canonical configuration, so
+      the order of keys and of the lines of an export does not matter. Modified objects are reported with the
+      settings that changed.
+    - Both snapshots are streamed in sorted order and merged. Mirrors are read in the order of their index; exports
+      are sorted on disk in runs, so snapshots of hundreds of thousands of objects are compared without loading
+      either whole.
+
+options:
+    after:
+        description:
+            - path of the later snapshot
+        required: true
+        type: path
+    after_format:
+        description:
+            - format of I(after); C(auto) picks SQLite for files ending in C(.db), C(.sqlite) or C(.sqlite3), and
+              JSONL, compressed or not, otherwise
+        required: false
+        default: "auto"
+        type: str
+        choices:
+            - "auto"
+            - "jsonl"
+            - "sqlite"
+    before:
+        description:
+            - path of the earlier snapshot
+        required: true
+        type: path
+    before_format:
+        description:
+            - format of I(before), as for I(after_format)
+        required: false
+        default: "auto"
+        type: str
+        choices:
+            - "auto"
+            - "jsonl"
+            - "sqlite"
+    ignore_keys:
+        description:
+            - top-level settings left out of the comparison
+            - the id is ignored by default, so an object deleted and created again identically is unchanged
+        required: false
+        default: ["id"]
+        type: list
+        elements: str
+    max_differences:
+        description:
+            - maximum number of differences returned; all of them are written to I(report)
+        required: false
+        default: 100
+        type: int
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
+    report:
+        description:
+            - path on the controller of a JSONL file receiving every difference, in the order of type, folder and name
+        required: false
+        type: path
+    types:
+        description:
+            - only compare objects of these types
+        required: false
+        type: list
+        elements: str
+        choices:
+            - "address"
+            - "address_group"
+            - "ike_gateway"
+            - "ipsec_tunnel"
+            - "remote_network"
+            - "service_connection"
+            - "tag"
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+    - name: Review what the change window changed
+      cdot65.prisma_access.snapshot_diff:
+        before: "/var/backups/prisma_access/{{ scope }}-before.jsonl.gz"
+        after: "/var/backups/prisma_access/{{ scope }}-after.jsonl.gz"
+        report: "/var/tmp/{{ scope }}-change-window.jsonl"
+      register: review
+"""
+
+RETURN = r"""
+differences:
+    description: first I(max_differences) objects added, removed or modified, in the order of type, folder and name
+    returned: always
+    type: list
+    elements: dict
+summary:
+    description: number of objects added, removed, modified and unchanged
+    returned: always
+    type: dict
+types:
+    description: number of objects added, removed, modified and unchanged, per object type
+    returned: always
+    type: list
+    elements: dict
+"""
+
+
+def main():
+    """This is the main function that contains the logic for comparing two snapshots of a tenant of the
+        Prisma Access platform.
+
+    It takes no arguments and returns no values.
+
+    It uses the AnsibleModule class to get the module's argument specification and process the results of the
+        module's actions.
+
+    Raises an exception if an error occurs during the module's execution.
+    """
+    module = AnsibleModule(
+        argument_spec=snapshot_diff_spec(),
+        supports_check_mode=True,
+    )
+
+    ignore_keys = frozenset(module.params["ignore_keys"])
+    object_types = module.params["types"]
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 1. Stream both snapshots sorted by type, folder and name, and merge them, counting every object and writing    #
+    #    every difference to the report as it is found.                                                              #
+    # -------------------------------------------------------------------------------------------------------------- #
+    summary = {"added": 0, "removed": 0, "modified": 0, "unchanged": 0}
+    types = {}
+    differences = []
+    report = None
+
+    try:
+        if module.params["report"]:
+            report = open(module.params["report"], "w", encoding="utf-8")
+
+        with tempfile.TemporaryDirectory() as directory:
+            before = snapshot_entries(
+                module.params["before"],
+                module.params["before_format"],
+                ignore_keys,
+                object_types,
+                directory,
+            )
+            after = snapshot_entries(
+                module.params["after"],
+                module.params["after_format"],
+                ignore_keys,
+                object_types,
+                directory,
+            )
+
+            for difference in diff_snapshots(before, after):
+                if difference is None:
+                    summary["unchanged"] += 1
+                    continue
+                summary[difference["change"]] += 1
+                counts = types.setdefault(
+                    difference["type"],
+                    {"added": 0, "removed": 0, "modified": 0},
+                )
+                counts[difference["change"]] += 1
+
+                if len(differences) < module.params["max_differences"]:
+                    differences.append(difference)
+                if report:
+                    report.write(json.dumps(difference) + "\n")
+
+    except Exception as exception_error:
+        # If an exception occurs, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    finally:
+        if report:
+            report.close()
+
+    module.exit_json(
+        changed=False,
+        differences=differences,
+        summary=summary,
+        types=[
+            dict(type=object_type, **counts)
+            for object_type, counts in sorted(types.items())
+        ],
+    )
+
+
+if __name__ == "__main__":
+    run_profiled(main)
@@ -0,0 +1,351 @@
+"""
+Ansible module for finding overlapping subnets between remote networks and service connections in Prisma Access.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+from traceback import format_exc
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.validation import check_type_list
+from ansible.module_utils._text import to_native
+from ..module_utils.specs.subnet_overlap import (
+    subnet_overlap_spec,
+)
+from ..module_utils.authenticate import (
+    get_authenticated_session,
+)
+from ..module_utils.bulk import (
+    fan_out,
+    list_objects,
+)
+from ..module_utils.prefixes import (
+    find_overlaps,
+    parse_prefix,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+from ..module_utils.records import (
+    read_records,
+)
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: subnet_overlap
+
+short_description: Find overlapping subnets between remote networks and service connections.
+
+version_added: "0.1.9"
+
+description:
+    - List every remote network and service connection and report the subnets that are equal to, or contained in,
+      a subnet of another connection, or of the same connection.
+    - Planned changes can be checked before they are applied by passing them as I(candidates) or as the records
+      file of the bulk_remote_networks module; a candidate replaces the live subnets of a connection of the same name.
+    - Prefixes are sorted once and swept with a stack of enclosing prefixes, in O(n log n) time, so tenants with
+      thousands of sites and tens of subnets each are checked in seconds.
+    - Never changes anything; with I(fail_on_overlap) it can be used as a pre-flight gate.
+
+options:
+    candidates:
+        description:
+            - planned connections checked along with the live ones
+        required: false
+        type: list
+        elements: dict
+        suboptions:
+            name:
+                description:
+                    - name of the connection
+                required: true
+                type: str
+            subnets:
+                description:
+                    - planned subnets of the connection
+                required: true
+                type: list
+                elements: str
+            type:
+                description:
+                    - type of the connection
+                required: false
+                default: "remote_network"
+                type: str
+                choices:
+                    - "remote_network"
+                    - "service_connection"
+    fail_on_overlap:
+        description:
+            - fail when an overlap is found
+        required: false
+        default: true
+        type: bool
+    format:
+        description:
+            - format of the file at I(path); C(auto) picks CSV for files ending in C(.csv) and JSONL otherwise
+        required: false
+        default: "auto"
+        type: str
+        choices:
+            - "auto"
+            - "csv"
+            - "jsonl"
+    max_results:
+        description:
+            - maximum number of overlaps returned; all of them are counted
+        required: false
+        default: 1000
+        type: int
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
+    path:
+        description:
+            - path on the controller of a CSV or JSONL file of planned connections, such as the records of the
+              bulk_remote_networks module
+            - only the C(name), C(subnets) and C(type) keys of each record are used
+        required: false
+        type: path
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
+    scope:
+        description:
+            - C(all) reports every overlap, C(candidates) only those involving a candidate, ignoring overlaps that
+              already exist between live connections
+        required: false
+        default: "all"
+        type: str
+        choices:
+            - "all"
+            - "candidates"
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+    - name: Check the branches of an acquisition before onboarding them
+      cdot65.prisma_access.subnet_overlap:
+        provider:
+          client_id: "{{ client_id }}"
+          client_secret: "{{ client_secret }}"
+          scope: "{{ scope }}"
+        path: "files/acquisition-branches.csv"
+        scope: "candidates"
+"""
+
+RETURN = r"""
+metrics:
+    description: API requests made by the module and the time spent authenticating, listing and writing
+    returned: when I(metrics) is enabled
+    type: dict
+overlaps:
+    description: overlapping subnets, each with the connection it belongs to and how the two relate
+    returned: always
+    type: list
+    elements: dict
+summary:
+    description: number of connections and subnets checked and of overlaps found
+    returned: always
+    type: dict
+"""
+
+
+def connection_types():
+    """Return the connection types, with their object class and folder.
+
+    The SDK is imported here rather than with the module, once the arguments have been validated.
+    """
+    from panapi.config.network import RemoteNetwork, ServiceConnection
+
+    return {
+        "remote_network": (RemoteNetwork, "Remote Networks"),
+        "service_connection": (ServiceConnection, "Service Connections"),
+    }
+
+
+def read_candidates(module):
+    """Yield the (type, name, subnets) of every candidate, from the task and from the records file."""
+    for candidate in module.params["candidates"] or []:
+        yield candidate["type"], candidate["name"], candidate["subnets"]
+
+    if module.params["path"]:
+        for line_number, record in read_records(
+            module.params["path"], module.params["format"]
+        ):
+            if "name" not in record:
+                raise ValueError(f"line {line_number}: name is required")
+            connection_type = record.get("type", "remote_network")
+            if connection_type not in ("remote_network", "service_connection"):
+                raise ValueError(
+                    f"line {line_number}: unknown type {connection_type}"
+                )
+            yield connection_type, record["name"], check_type_list(
+                record.get("subnets") or []
+            )
+
+
+def main():
+    """This is the main function that contains the logic for finding overlapping subnets between remote networks
+        and service connections on the Prisma Access platform.
+
+    It takes no arguments and returns no values.
+
+    It uses the AnsibleModule class to get the module's argument specification and process the results of the
+        module's actions.
+
+    Raises an exception if an error occurs during the module's execution.
+    """
+    module = AnsibleModule(
+        argument_spec=subnet_overlap_spec(),
+        supports_check_mode=True,
+    )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 1. Read the candidates before contacting the API.                                                             #
+    # -------------------------------------------------------------------------------------------------------------- #
+    connections = {}
+    try:
+        for connection_type, name, subnets in read_candidates(module):
+            connections[(connection_type, name)] = ("candidate", subnets)
+
+    except (OSError, ValueError) as exception_error:
+        module.fail_json(msg=to_native(exception_error))
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 2. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed  #
+    #    through the Ansible module.                                                                                 #
+    # -------------------------------------------------------------------------------------------------------------- #
+    try:
+        # get the provider parameter from the Ansible module, which includes the authentication credentials
+        session = get_authenticated_session(module)
+
+    except Exception as exception_error:
+        # if an exception occurs during the authentication process, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    try:
+        # ---------------------------------------------------------------------------------------------------------- #
+        # 3. List the remote networks and service connections concurrently; candidates replace the live subnets of  #
+        #    the connection of the same name.                                                                        #
+        # ---------------------------------------------------------------------------------------------------------- #
+        connection_classes = connection_types()
+        listings = fan_out(
+            lambda connection_type: list_objects(
+                session, *connection_classes[connection_type]
+            ),
+            list(connection_classes),
+            len(connection_classes),
+        )
+        for connection_type, objects in zip(connection_classes, listings):
+            for each in objects:
+                connections.setdefault(
+                    (connection_type, each.name),
+                    ("live", getattr(each, "subnets", None) or []),
+                )
+
+    except Exception as exception_error:
+        # If an exception occurs, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 4. Sweep every prefix once, sorted, to find the overlapping pairs.                                             #
+    # -------------------------------------------------------------------------------------------------------------- #
+    entries = []
+    invalid = []
+    for (connection_type, name), (source, subnets) in connections.items():
+        for subnet in subnets:
+            try:
+                network = parse_prefix(subnet)
+            except ValueError:
+                invalid.append(f"{connection_type} {name}: {subnet}")
+                continue
+            entries.append((network, (connection_type, name, source)))
+
+    if invalid:
+        module.fail_json(
+            msg=f"Invalid subnets: {'; '.join(invalid)}", invalid=invalid
+        )
+
+    overlaps = []
+    count = 0
+    for (outer, outer_owner), (inner, inner_owner) in find_overlaps(entries):
+        if module.params["scope"] == "candidates" and "candidate" not in (
+            outer_owner[2],
+            inner_owner[2],
+        ):
+            continue
+
+        count += 1
+        if len(overlaps) < module.params["max_results"]:
+            overlaps.append(
+                {
+                    "subnet": str(outer),
+                    "type": outer_owner[0],
+                    "name": outer_owner[1],
+                    "source": outer_owner[2],
+                    "overlapping_subnet": str(inner),
+                    "overlapping_type": inner_owner[0],
+                    "overlapping_name": inner_owner[1],
+                    "overlapping_source": inner_owner[2],
+                    "relation": "equal" if outer == inner else "contains",
+                }
+            )
+
+    summary = {
+        "connections": len(connections),
+        "subnets": len(entries),
+        "overlaps": count,
+    }
+
+    if count and module.params["fail_on_overlap"]:
+        module.fail_json(
+            msg=f"{count} overlapping subnets found",
+            overlaps=overlaps,
+            summary=summary,
+        )
+
+    module.exit_json(changed=False, overlaps=overlaps, summary=summary)
+
+
+if __name__ == "__main__":
+    run_profiled(main)
@@ -0,0 +1,281 @@
+"""
+Ansible module for exporting the configuration of a Prisma Access tenant to a JSONL file.
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+"""
+from __future__ import absolute_import, division, print_function
+import os
+import time
+from traceback import format_exc
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils._text import to_native
+from ..module_utils.specs.tenant_export import (
+    tenant_export_spec,
+)
+from ..module_utils.authenticate import (
+    get_authenticated_session,
+)
+from ..module_utils.bulk import (
+    RateLimiter,
+)
+from ..module_utils.export import (
+    abort_export,
+    export_listings,
+    finish_export,
+    open_export,
+)
+from ..module_utils.mirror import (
+    MIRROR_TYPES,
+)
+from ..module_utils.profiling import (
+    run_profiled,
+)
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: tenant_export
+
+short_description: Export the configuration of a tenant to a JSONL file.
+
+version_added: "0.1.9"
+
+description:
+    - Export addresses, address groups, tags, IKE gateways, IPsec tunnels, remote networks and service connections
+      to a file on the host running the module, one JSON object per line, optionally compressed with gzip.
+    - Every object type is listed once per folder, page by page, the listings concurrently. Pages are written as they
+      arrive, so memory use does not grow with the size of the tenant.
+    - Each line holds the configuration of an object as the API returned it, with sorted keys and its type under
+      C(object_type), so exports of unchanged configuration only differ in their order.
+    - The export is written next to I(path) and only moved into place once complete, so a failed run leaves the
+      previous export untouched.
+    - Supports check mode, listing every object without writing the file.
+
+options:
+    compress:
+        description:
+            - compress the export with gzip
+            - defaults to true when I(path) ends with C(.gz)
+        required: false
+        type: bool
+    folders:
+        description:
+            - folders listed for every object type
+            - by default, address groups, addresses and tags are listed in C(Shared), C(Mobile Users),
+              C(Remote Networks) and C(Service Connections), IKE gateways and IPsec tunnels in C(Remote Networks) and
+              C(Service Connections), and remote networks and service connections in their own folder
+        required: false
+        type: list
+        elements: str
+    max_workers:
+        description:
+            - number of listings fetched concurrently
+        required: false
+        default: 8
+        type: int
+    metrics:
+        description:
+            - return the method, endpoint, status, size and duration of every API request, and the time spent
+              authenticating, listing and writing, under the C(metrics) key of the result
+        required: false
+        default: false
+        type: bool
+    path:
+        description:
+            - path of the export
+        required: true
+        type: path
+    profile:
+        description:
+            - profile the run of the module with cProfile, tracemalloc or both, writing the profiles to a directory
+              of the host running the module, which is the controller for local tasks
+            - profiling can also be requested for every module with the C(PRISMA_ACCESS_PROFILE),
+              C(PRISMA_ACCESS_PROFILE_DIR) and C(PRISMA_ACCESS_PROFILE_NAME) environment variables
+        required: false
+        type: dict
+        suboptions:
+            directory:
+                description:
+                    - directory receiving the profiles, C(~/.ansible/profiles/cdot65.prisma_access) by default
+                required: false
+                type: path
+            name:
+                description:
+                    - name the files are keyed by; the time and process id of the run are appended so loop items
+                      do not overwrite each other
+                    - defaults to the names of the module and of the object, which tasks acting on the same object
+                      share; set it to the name of the task to key the files by task
+                required: false
+                type: str
+            tools:
+                description:
+                    - profilers to run
+                required: false
+                default: ["cprofile"]
+                type: list
+                elements: str
+                choices:
+                    - "cprofile"
+                    - "tracemalloc"
+    rate_limit:
+        description:
+            - maximum number of API calls per second; 0 disables limiting
+        required: false
+        default: 5.0
+        type: float
+    types:
+        description:
+            - object types exported
+        required: false
+        default: ["address", "address_group", "ike_gateway", "ipsec_tunnel", "remote_network",
+                  "service_connection", "tag"]
+        type: list
+        elements: str
+        choices:
+            - "address"
+            - "address_group"
+            - "ike_gateway"
+            - "ipsec_tunnel"
+            - "remote_network"
+            - "service_connection"
+            - "tag"
+
+author:
+    - Calvin Remsburg (@cdot65)
+"""
+
+EXAMPLES = r"""
+    - name: Back up the tenant
+      cdot65.prisma_access.tenant_export:
+        provider:
+          client_id: "{{ client_id }}"
+          client_secret: "{{ client_secret }}"
+          scope: "{{ scope }}"
+        path: "/var/backups/prisma_access/{{ scope }}-{{ ansible_date_time.date }}.jsonl.gz"
+        rate_limit: 10
+"""
+
+RETURN = r"""
+compressed:
+    description: whether the export is compressed with gzip
+    returned: always
+    type: bool
+file:
+    description: path of the export
+    returned: always
+    type: str
+listings:
+    description: listings exported, with the number of objects of each
+    returned: always
+    type: list
+    elements: dict
+metrics:
+    description: API requests made by the module and the time spent authenticating, listing and writing
+    returned: when I(metrics) is enabled
+    type: dict
+objects:
+    description: number of objects exported
+    returned: always
+    type: int
+seconds:
+    description: time spent listing and writing the objects
+    returned: always
+    type: float
+size:
+    description: size of the export in bytes
+    returned: unless in check mode
+    type: int
+"""
+
+
+def main():
+    """This is the main function that contains the logic for exporting the configuration of a tenant of the
+        Prisma Access platform to a JSONL file.
+
+    It takes no arguments and returns no values.
+
+    It uses the AnsibleModule class to get the module's argument specification and process the results of the
+        module's actions.
+
+    Raises an exception if an error occurs during the module's execution.
+    """
+    module = AnsibleModule(
+        argument_spec=tenant_export_spec(),
+        supports_check_mode=True,
+    )
+    path = module.params["path"]
+    compress = module.params["compress"]
+    if compress is None:
+        compress = path.endswith(".gz")
+
+    listings = [
+        (object_type, folder)
+        for object_type in module.params["types"]
+        for folder in module.params["folders"] or MIRROR_TYPES[object_type][2]
+    ]
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 1. Authenticate the session object using the client_id, client_secret, scope, and token_url parameters passed  #
+    #    through the Ansible module.                                                                                 #
+    # -------------------------------------------------------------------------------------------------------------- #
+    try:
+        # get the provider parameter from the Ansible module, which includes the authentication credentials
+        session = get_authenticated_session(module)
+
+    except Exception as exception_error:
+        # if an exception occurs during the authentication process, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error), exception=format_exc()
+        )
+
+    limiter = RateLimiter(module.params["rate_limit"])
+
+    # -------------------------------------------------------------------------------------------------------------- #
+    # 2. List every object type in every folder concurrently, writing each page as it arrives, then move the         #
+    #    complete export into place.                                                                                 #
+    # -------------------------------------------------------------------------------------------------------------- #
+    started = time.monotonic()
+    try:
+        if module.check_mode:
+            stream = open(os.devnull, "w", encoding="utf-8")
+        else:
+            stream = open_export(path, compress)
+        with stream:
+            counts = export_listings(
+                session,
+                listings,
+                stream,
+                limiter,
+                module.params["max_workers"],
+            )
+        if not module.check_mode:
+            finish_export(path)
+
+    except Exception as exception_error:
+        if not module.check_mode:
+            abort_export(path)
+        # If an exception occurs, fail the module and return an error message
+        module.fail_json(
+            msg=to_native(exception_error),
+            exception=format_exc(),
+            file=path,
+        )
+
+    result = dict(
+        changed=True,
+        compressed=compress,
+        file=path,
+        listings=[
+            {"type": object_type, "folder": folder, "objects": count}
+            for (object_type, folder), count in zip(listings, counts)
+        ],
+        objects=sum(counts),
+        seconds=round(time.monotonic() - started, 3),
+    )
+    if not module.check_mode:
+        result["size"] = os.path.getsize(path)
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    run_profiled(main)
@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+Benchmarks of the collection's modules against the mock server, at increasing tenant sizes.
+
+For every scenario and size, the mock server is seeded with a tenant of that
+many objects, and the module is run the way Ansible runs it, in a Python
+process of its own. The benchmark records:
+
+- the wall time, and the number of tasks and objects per second;
+- the number of API calls per object, from the mock server's request log;
+- the peak RSS of the module processes;
+- the time spent starting up, authenticating, listing and writing, from the
+  timestamps of the requests.
+
+Modules managing one object per task are run --tasks times against the seeded
+tenant; bulk modules are run once over as many objects as the tenant holds.
+Results are written as JSON, and can be compared against a previous run:
+
+    python tests/benchmark.py --sizes 100 1000 10000 --output before.json
+    python tests/benchmark.py --sizes 100 1000 10000 --compare before.json
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import mock_server
+
+# root of the collection, the parent of this directory
+COLLECTION = Path(__file__).resolve().parents[1]
+
+# tenant the benchmarks run against
+TENANT = "1234567890"
+
+PROVIDER = {
+    "client_id": "benchmark@example.com",
+    "client_secret": "benchmark",
+    "scope": TENANT,
+}
+
+# IPsec tunnel every benchmarked remote network references
+IPSEC_TUNNEL = "Benchmark-IPsec"
+
+
+def address(index, prefix="Benchmark"):
+    return {
+        "name": f"{prefix}-{index:05d}",
+        "description": "benchmark address",
+        "ip_netmask": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}/32",
+    }
+
+
+def remote_network(index, prefix="Benchmark-RN"):
+    return {
+        "name": f"{prefix}-{index:05d}",
+        "ipsec_tunnel": IPSEC_TUNNEL,
+        "license_type": "FWAAS-AGGREGATE",
+        "region": "us-south1",
+        "spn_name": "us-south-raspberry",
+        "subnets": [
+            f"172.{16 + index // 65536 % 16}.{index // 256 % 256}.{index % 256}/32"
+        ],
+    }
+
+
+def seed_remote_networks(server, objects):
+    server.seed(
+        TENANT, "ipsec-tunnels", "Remote Networks", [{"name": IPSEC_TUNNEL}]
+    )
+    server.seed(TENANT, "remote-networks", "Remote Networks", objects)
+
+
+# ---------------------------------------------------------------------------------------------------------------------- #
+# scenarios                                                                                                            #
+# ---------------------------------------------------------------------------------------------------------------------- #
+# Every scenario seeds the tenant and returns the arguments of the tasks to run, and the number of objects they manage.
+
+
+def address_tasks(server, size, tasks, workdir):
+    server.seed(
+        TENANT,
+        "addresses",
+        "Shared",
+        (address(index) for index in range(size)),
+    )
+    return [
+        dict(
+            address(index, "Benchmark-New"),
+            provider=PROVIDER,
+            folder="Shared",
+            state="present",
+        )
+        for index in range(tasks)
+    ], tasks
+
+
+def remote_network_tasks(server, size, tasks, workdir):
+    seed_remote_networks(
+        server, (remote_network(index) for index in range(size))
+    )
+    return [
+        dict(
+            remote_network(index, "Benchmark-RN-New"),
+            provider=PROVIDER,
+            folder="Remote Networks",
+            state="present",
+        )
+        for index in range(tasks)
+    ], tasks
+
+
+def bulk_objects_tasks(server, size, tasks, workdir):
+    # half of the addresses already exist, the other half is created
+    server.seed(
+        TENANT,
+        "addresses",
+        "Shared",
+        (address(index) for index in range(size // 2)),
+    )
+    return [
+        {
+            "providers": [PROVIDER],
+            "folder": "Shared",
+            "addresses": [address(index) for index in range(size)],
+            "state": "present",
+            "rate_limit": 0,
+        }
+    ], size
+
+
+def bulk_remote_networks_tasks(server, size, tasks, workdir):
+    # half of the remote networks already exist, the other half is created
+    seed_remote_networks(
+        server, (remote_network(index) for index in range(size // 2))
+    )
+    path = Path(workdir, "remote_networks.jsonl")
+    with open(path, "w", encoding="utf-8") as records:
+        for index in range(size):
+            records.write(json.dumps(remote_network(index)) + "\n")
+    return [
+        {
+            "provider": PROVIDER,
+            "path": str(path),
+            "state": "present",
+            "rate_limit": 0,
+        }
+    ], size
+
+
+def tenant_export_tasks(server, size, tasks, workdir):
+    # addresses across every object folder, and remote networks, exported to a compressed file
+    folders = (
+        "Shared",
+        "Mobile Users",
+        "Remote Networks",
+        "Service Connections",
+    )
+    for position, folder in enumerate(folders):
+        server.seed(
+            TENANT,
+            "addresses",
+            folder,
+            (
+                address(index)
+                for index in range(position, size // 2, len(folders))
+            ),
+        )
+    seed_remote_networks(
+        server, (remote_network(index) for index in range(size - size // 2))
+    )
+    return [
+        {
+            "provider": PROVIDER,
+            "path": str(Path(workdir, "export.jsonl.gz")),
+            "rate_limit": 0,
+        }
+    ], size + 1  # the IPsec tunnel of the remote networks is exported too
+
+
+SCENARIOS = {
+    "address": ("address", address_tasks),
+    "remote_network": ("remote_network", remote_network_tasks),
+    "bulk_objects": ("bulk_objects", bulk_objects_tasks),
+    "bulk_remote_networks": (
+        "bulk_remote_networks",
+        bulk_remote_networks_tasks,
+    ),
+    "tenant_export": ("tenant_export", tenant_export_tasks),
+}
+
+
+# ---------------------------------------------------------------------------------------------------------------------- #
+# measurement                                                                                                          #
+# ---------------------------------------------------------------------------------------------------------------------- #
+def collections_path(workdir):
+    """Return a directory from which the collection is importable as ansible_collections.<namespace>.<name>."""
+    if COLLECTION.parents[1].name == "ansible_collections":
+        return COLLECTION.parents[2]
+
+    galaxy = {}
+    for line in (COLLECTION / "galaxy.yml").read_text().splitlines():
+        key, sep, value = line.partition(":")
+        if sep and key in ("namespace", "name"):
+            galaxy[key] = value.strip()
+
+    root = Path(workdir, "collections")
+    namespace = root / "ansible_collections" / galaxy["namespace"]
+    namespace.mkdir(parents=True)
+    (namespace / galaxy["name"]).symlink_to(COLLECTION)
+    return root
+
+
+def run_module(python, module, arguments, environment, workdir):
+    """Run a module in its own process and return its result, wall time, start time and peak RSS in KiB."""
+    args_path = Path(workdir, "args.json")
+    args_path.write_text(json.dumps({"ANSIBLE_MODULE_ARGS": arguments}))
+    output_path = Path(workdir, "output.json")
+
+    with open(output_path, "wb") as output:
+        started = time.time()
+        process = subprocess.Popen(
+            [
+                python,
+                "-m",
+                f"ansible_collections.cdot65.prisma_access.plugins.modules.{module}",
+                str(args_path),
+            ],
+            env=environment,
+            stdout=output,
+            stderr=subprocess.STDOUT,
+        )
+        _pid, status, usage = os.wait4(process.pid, 0)
+        wall = time.time() - started
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+    text = output_path.read_text()
+    try:
+        result = json.loads(text[text.index("{") :])
+    except ValueError:
+        raise RuntimeError(f"{module} did not return JSON: {text[-2000:]}")
+    if result.get("failed"):
+        raise RuntimeError(f"{module} failed: {result.get('msg')}")
+
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    peak_rss = usage.ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss //= 1024
+    return result, wall, started, peak_rss
+
+
+def union(intervals):
+    """Return the total length of a list of (start, end) intervals, counting overlaps once."""
+    total = 0.0
+    last_end = None
+    for start, end in sorted(intervals):
+        if last_end is None or start > last_end:
+            total += end - start
+            last_end = end
+        elif end > last_end:
+            total += end - last_end
+            last_end = end
+    return total
+
+
+def phases(log, started, wall):
+    """Split the wall time of one task into startup, auth, list, write and other phases.
+
+    Authentication runs from the token request to the first configuration
+    request, including the wait for the token to become valid; listing and
+    writing are the time with at least one GET, or one POST, PUT or DELETE,
+    in flight.
+    """
+    auth = [entry for entry in log if entry[3].startswith("/am/")]
+    api = [entry for entry in log if not entry[3].startswith("/am/")]
+    if not log:
+        return {
+            "startup": wall,
+            "auth": 0.0,
+            "list": 0.0,
+            "write": 0.0,
+            "other": 0.0,
+        }
+
+    first = min(entry[0] for entry in log)
+    auth_end = min(
+        (entry[0] for entry in api), default=max(entry[1] for entry in log)
+    )
+    result = {
+        "startup": first - started,
+        "auth": (auth_end - first) if auth else 0.0,
+        "list": union(
+            [(entry[0], entry[1]) for entry in api if entry[2] == "GET"]
+        ),
+        "write": union(
+            [(entry[0], entry[1]) for entry in api if entry[2] != "GET"]
+        ),
+    }
+    result["other"] = max(
+        0.0,
+        wall
+        - result["startup"]
+        - result["auth"]
+        - union([(entry[0], entry[1]) for entry in api]),
+    )
+    return result
+
+
+def run_scenario(server, name, size, tasks, python, environment):
+    """Seed the tenant, run the tasks of a scenario and return its measurements."""
+    module, build = SCENARIOS[name]
+    server.reset()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        task_arguments, objects = build(
+            server, size, min(size, tasks), workdir
+        )
+        server.reset_stats()
+
+        totals = {
+            "startup": 0.0,
+            "auth": 0.0,
+            "list": 0.0,
+            "write": 0.0,
+            "other": 0.0,
+        }
+        wall = 0.0
+        peak_rss = 0
+        for arguments in task_arguments:
+            mark = len(server.log)
+            _result, task_wall, started, task_rss = run_module(
+                python, module, arguments, environment, workdir
+            )
+            wall += task_wall
+            peak_rss = max(peak_rss, task_rss)
+            for phase, seconds in phases(
+                server.log[mark:], started, task_wall
+            ).items():
+                totals[phase] += seconds
+
+    stats = server.snapshot_stats()
+    return {
+        "scenario": name,
+        "module": module,
+        "size": size,
+        "tasks": len(task_arguments),
+        "objects": objects,
+        "wall_seconds": round(wall, 4),
+        "tasks_per_second": round(len(task_arguments) / wall, 4),
+        "objects_per_second": round(objects / wall, 4),
+        "api_calls": stats["requests"],
+        "api_calls_per_object": round(stats["requests"] / objects, 4),
+        "bytes": stats["bytes"],
+        "peak_rss_kb": peak_rss,
+        "phases": {
+            phase: round(seconds, 4) for phase, seconds in totals.items()
+        },
+        "requests": stats["by_endpoint"],
+        "status": stats["by_status"],
+    }
+
+
+def metadata(args, python):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=COLLECTION,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    version = subprocess.run(
+        [
+            python,
+            "-c",
+            "import ansible.release; print(ansible.release.__version__)",
+        ],
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+    return {
+        "commit": commit,
+        "started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "ansible": version or None,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "latency": args.latency,
+        "tasks": args.tasks,
+    }
+
+
+def compare(results, baseline):
+    """Return lines comparing wall time and API calls per object against a previous run."""
+    previous = {
+        (each["scenario"], each["size"]): each for each in baseline["results"]
+    }
+    lines = [
+        f"{'scenario':<22} {'size':>6} {'wall s':>10} {'change':>8} {'calls/obj':>10} {'change':>8}"
+    ]
+    for each in results:
+        before = previous.get((each["scenario"], each["size"]))
+        if not before:
+            continue
+
+        def change(key):
+            if not before[key]:
+                return "n/a"
+            return f"{(each[key] - before[key]) / before[key]:+.1%}"
+
+        lines.append(
+            f"{each['scenario']:<22} {each['size']:>6} {each['wall_seconds']:>10.3f} "
+            f"{change('wall_seconds'):>8} {each['api_calls_per_object']:>10.3f} "
+            f"{change('api_calls_per_object'):>8}"
+        )
+    return lines
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        default=list(SCENARIOS),
+        choices=list(SCENARIOS),
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[100, 1000, 10000]
+    )
+    parser.add_argument(
+        "--tasks",
+        type=int,
+        default=20,
+        help="tasks run by the scenarios managing one object per task",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="seconds the mock server adds to every request",
+    )
+    parser.add_argument(
+        "--python",
+        default=sys.executable,
+        help="interpreter running the modules",
+    )
+    parser.add_argument(
+        "--output",
+        help="file receiving the results as JSON; stdout by default",
+    )
+    parser.add_argument(
+        "--compare", help="results of a previous run to compare against"
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    config = mock_server.parse_args(
+        ["--port", "0", "--latency", str(args.latency)]
+    )
+    server = mock_server.MockServer(config).start()
+    server.record_requests()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        environment = dict(os.environ, **server.environment())
+        # keeps the caches of the modules, such as capacity snapshots, out of the user's home
+        environment["HOME"] = workdir
+        environment["PYTHONPATH"] = os.pathsep.join(
+            filter(
+                None,
+                [str(collections_path(workdir)), os.environ.get("PYTHONPATH")],
+            )
+        )
+
+        results = []
+        try:
+            for name in args.scenarios:
+                for size in args.sizes:
+                    result = run_scenario(
+                        server,
+                        name,
+                        size,
+                        args.tasks,
+                        args.python,
+                        environment,
+                    )
+                    results.append(result)
+                    print(
+                        f"{name:<22} {size:>6} objects: {result['wall_seconds']:.3f}s, "
+                        f"{result['api_calls_per_object']:.3f} calls/object, "
+                        f"{result['peak_rss_kb'] // 1024} MiB peak RSS",
+                        file=sys.stderr,
+                    )
+        finally:
+            server.stop()
+
+    report = {"metadata": metadata(args, args.python), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline:
+            for line in compare(results, json.load(baseline)):
+                print(line, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,733 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Prisma Access API, for running the collection without a tenant.
+
+The server implements the OAuth2 token endpoint and its JWKS document, the
+configuration object endpoints under /sse/config/v1 used by the modules, and
+candidate config pushes. State is kept in memory. Latency, pagination, rate
+limits and error injection can be configured to reproduce the behaviour of
+the real API in tests and benchmarks.
+
+Point the collection at it through the environment of the controller:
+
+    python tests/mock_server.py --port 8000 &
+    export PRISMA_ACCESS_TOKEN_URL=http://127.0.0.1:8000/am/oauth2/access_token
+    export PRISMA_ACCESS_API_URL=http://127.0.0.1:8000
+
+GET /_stats returns the number of requests per endpoint and status.
+
+Every tenant, identified by the tsg_id of the provider's scope, gets objects of
+its own. POST /_reset forgets every tenant and clears the statistics.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+import argparse
+import base64
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+# paths panapi derives from the token URL
+TOKEN_PATH = "/am/oauth2/access_token"
+JWKS_PATH = "/am/oauth2/connect/jwk_uri"
+
+# prefix of every configuration endpoint
+API_PREFIX = "/sse/config/v1/"
+
+# tenant a token was issued for, within its scope
+TSG_ID = re.compile(r"tsg_id:(\S+)")
+
+# compute regions and the aggregate region they belong to
+LOCATIONS = (
+    ("us-east1", "us-east", "US East"),
+    ("us-south1", "us-southeast", "US South"),
+    ("us-west1", "us-west", "US West"),
+    ("europe-west1", "europe-west", "Belgium"),
+    ("europe-west3", "europe-central", "Germany Central"),
+    ("asia-southeast1", "asia-southeast", "Singapore"),
+)
+
+# objects every tenant starts with, by endpoint
+SEED = {
+    "bandwidth-allocations": [
+        {
+            "name": "us-east",
+            "allocated_bandwidth": 1000,
+            "spn_name_list": ["us-east-ash", "us-east-birch"],
+        },
+        {
+            "name": "us-southeast",
+            "allocated_bandwidth": 1000,
+            "spn_name_list": ["us-south-raspberry", "us-south-strawberry"],
+        },
+        {
+            "name": "europe-west",
+            "allocated_bandwidth": 500,
+            "spn_name_list": ["europe-west-lavender"],
+        },
+    ],
+    "ike-crypto-profiles": [
+        {"name": "PaloAlto-Networks-IKE-Crypto", "folder": "Shared"},
+    ],
+    "ipsec-crypto-profiles": [
+        {"name": "PaloAlto-Networks-IPSec-Crypto", "folder": "Shared"},
+    ],
+}
+
+
+def b64url(data):
+    """Return the unpadded base64url encoding of bytes or of a JSON document."""
+    if not isinstance(data, bytes):
+        data = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def error_body(code, message, details=None):
+    """Return an error document in the API's format."""
+    return {
+        "_errors": [
+            {"code": code, "message": message, "details": details or {}}
+        ],
+        "_request_id": str(uuid.uuid4()),
+    }
+
+
+class TokenIssuer:
+    """Issues RS256 access tokens and publishes the key that verifies them."""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048
+        )
+        self.kid = uuid.uuid4().hex
+
+    def jwks(self):
+        """Return the JSON Web Key Set of the signing key."""
+        numbers = self.key.public_key().public_numbers()
+        return {
+            "keys": [
+                {
+                    "kty": "RSA",
+                    "kid": self.kid,
+                    "use": "sig",
+                    "alg": "RS256",
+                    "n": b64url(
+                        numbers.n.to_bytes(
+                            (numbers.n.bit_length() + 7) // 8, "big"
+                        )
+                    ),
+                    "e": b64url(
+                        numbers.e.to_bytes(
+                            (numbers.e.bit_length() + 7) // 8, "big"
+                        )
+                    ),
+                }
+            ]
+        }
+
+    def issue(self, client_id, scope):
+        """Return a signed access token for a client."""
+        now = int(time.time())
+        signing_input = ".".join(
+            (
+                b64url({"alg": "RS256", "typ": "JWT", "kid": self.kid}),
+                b64url(
+                    {
+                        "iss": "mock-prisma-access",
+                        "sub": client_id,
+                        "aud": client_id,
+                        "scope": scope,
+                        "iat": now,
+                        "exp": now + self.ttl,
+                        "jti": uuid.uuid4().hex,
+                    }
+                ),
+            )
+        )
+        signature = self.key.sign(
+            signing_input.encode(), padding.PKCS1v15(), hashes.SHA256()
+        )
+        return f"{signing_input}.{b64url(signature)}"
+
+    def verify(self, token):
+        """Return the claims of an unexpired token signed by this issuer, or None."""
+        try:
+            signing_input, signature = token.rsplit(".", 1)
+            self.key.public_key().verify(
+                base64.urlsafe_b64decode(
+                    signature + "=" * (-len(signature) % 4)
+                ),
+                signing_input.encode(),
+                padding.PKCS1v15(),
+                hashes.SHA256(),
+            )
+            payload = signing_input.split(".")[1]
+            claims = json.loads(
+                base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+            )
+        except Exception:
+            return None
+        return claims if claims.get("exp", 0) > time.time() else None
+
+
+class RateLimiter:
+    """Token bucket rejecting requests above a number per second."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Return True and take a token when one is available."""
+        if not self.rate:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class Store:
+    """In-memory configuration objects, by endpoint and id, indexed by folder and name."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Restore the objects every tenant starts with."""
+        with self.lock:
+            self.objects = {}
+            self.names = {}
+            self.jobs = {}
+            for endpoint, objects in SEED.items():
+                for each in objects:
+                    self._insert(endpoint, dict(each))
+
+    def _insert(self, endpoint, obj):
+        obj["id"] = str(uuid.uuid4())
+        self.objects.setdefault(endpoint, {})[obj["id"]] = obj
+        self.names[(endpoint, obj.get("folder"), obj.get("name"))] = obj["id"]
+        return obj
+
+    def list(self, endpoint, folder=None, name=None):
+        """Return the objects of an endpoint, optionally within a folder or by name."""
+        with self.lock:
+            return [
+                dict(each)
+                for each in self.objects.get(endpoint, {}).values()
+                if (folder is None or each.get("folder") == folder)
+                and (name is None or each.get("name") == name)
+            ]
+
+    def get(self, endpoint, object_id):
+        """Return an object by id, or None."""
+        with self.lock:
+            found = self.objects.get(endpoint, {}).get(object_id)
+            return dict(found) if found else None
+
+    def create(self, endpoint, folder, body):
+        """Create an object, returning it, or None when the name is taken."""
+        with self.lock:
+            if (endpoint, folder, body.get("name")) in self.names:
+                return None
+            obj = {key: value for key, value in body.items() if key != "id"}
+            if folder is not None:
+                obj["folder"] = folder
+            return dict(self._insert(endpoint, obj))
+
+    def update(self, endpoint, object_id, body):
+        """Replace an object, keeping its id and folder, or return None."""
+        with self.lock:
+            current = self.objects.get(endpoint, {}).get(object_id)
+            if current is None:
+                return None
+            obj = {key: value for key, value in body.items() if key != "id"}
+            obj["id"] = object_id
+            if "folder" in current:
+                obj["folder"] = current["folder"]
+            self.names.pop(
+                (endpoint, current.get("folder"), current.get("name")), None
+            )
+            self.names[
+                (endpoint, obj.get("folder"), obj.get("name"))
+            ] = object_id
+            self.objects[endpoint][object_id] = obj
+            return dict(obj)
+
+    def delete(self, endpoint, object_id):
+        """Delete an object, returning it, or None."""
+        with self.lock:
+            found = self.objects.get(endpoint, {}).pop(object_id, None)
+            if found is not None:
+                self.names.pop(
+                    (endpoint, found.get("folder"), found.get("name")), None
+                )
+            return found
+
+    def push(self, body):
+        """Record a candidate config push and return its job id."""
+        with self.lock:
+            job_id = str(len(self.jobs) + 1)
+            self.jobs[job_id] = {
+                "id": job_id,
+                "type_str": "CommitAndPush",
+                "status_str": "FIN",
+                "result_str": "OK",
+                "description": body.get("description", ""),
+                "folders": body.get("folders", []),
+            }
+            return job_id
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Routes requests to the token, JWKS, configuration and control endpoints."""
+
+    protocol_version = "HTTP/1.1"
+
+    # ---------------------------------------------------------------------------------------------------------- #
+    # plumbing                                                                                                   #
+    # ---------------------------------------------------------------------------------------------------------- #
+    def log_message(self, format, *args):
+        if self.server.config.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.count(
+            self.command, self.endpoint, status, len(data), self.started
+        )
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def read_json(self):
+        body = self.read_body()
+        return json.loads(body) if body else {}
+
+    def dispatch(self):
+        self.started = time.time()
+        url = urlsplit(self.path)
+        self.query = {
+            key: values[-1] for key, values in parse_qs(url.query).items()
+        }
+        path = unquote(url.path)
+        self.endpoint = path
+
+        config = self.server.config
+        if config.latency or config.jitter:
+            time.sleep(config.latency + random.uniform(0, config.jitter))
+
+        if path == TOKEN_PATH and self.command == "POST":
+            return self.token()
+        if path == JWKS_PATH and self.command == "GET":
+            return self.send_json(200, self.server.issuer.jwks())
+        if path == "/_stats" and self.command == "GET":
+            return self.send_json(200, self.server.snapshot_stats())
+        if path == "/_reset" and self.command == "POST":
+            self.read_body()
+            self.server.reset()
+            return self.send_json(200, {"success": True})
+        if not path.startswith(API_PREFIX):
+            self.read_body()
+            return self.send_json(
+                404, error_body("E005", "Not Found", {"path": path})
+            )
+
+        # every configuration endpoint is authenticated, rate limited and subject to error injection
+        parts = path[len(API_PREFIX) :].strip("/").split("/")
+        self.endpoint = parts[0]
+        body = self.read_json() if self.command in ("POST", "PUT") else {}
+
+        authorization = self.headers.get("Authorization", "")
+        claims = None
+        if authorization.startswith("Bearer "):
+            claims = self.server.issuer.verify(authorization[7:])
+        if not claims:
+            return self.send_json(
+                401, error_body("E016", "Not Authenticated", {})
+            )
+        if not self.server.limiter.allow():
+            return self.send_json(
+                429,
+                error_body("E429", "Too Many Requests", {}),
+                {"Retry-After": "1"},
+            )
+        if config.error_rate and random.random() < config.error_rate:
+            return self.send_json(
+                config.error_status,
+                error_body("E003", "Injected error", {}),
+            )
+
+        # every tenant has objects of its own, keyed by the tsg_id of the token's scope
+        tenant = TSG_ID.search(claims.get("scope", ""))
+        self.store = self.server.tenant(tenant.group(1) if tenant else "")
+        return self.api(parts, body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = dispatch
+
+    # ---------------------------------------------------------------------------------------------------------- #
+    # endpoints                                                                                                  #
+    # ---------------------------------------------------------------------------------------------------------- #
+    def token(self):
+        form = {
+            key: values[-1]
+            for key, values in parse_qs(self.read_body().decode()).items()
+        }
+        client_id = form.get("client_id")
+        client_secret = form.get("client_secret")
+        authorization = self.headers.get("Authorization", "")
+        if authorization.startswith("Basic "):
+            client_id, _sep, client_secret = (
+                base64.b64decode(authorization[6:]).decode().partition(":")
+            )
+
+        config = self.server.config
+        if form.get("grant_type") != "client_credentials" or not client_id:
+            return self.send_json(400, {"error": "invalid_request"})
+        if (config.client_id and client_id != config.client_id) or (
+            config.client_secret and client_secret != config.client_secret
+        ):
+            return self.send_json(401, {"error": "invalid_client"})
+
+        self.server.count_token()
+        return self.send_json(
+            200,
+            {
+                "access_token": self.server.issuer.issue(
+                    client_id, form.get("scope", "")
+                ),
+                "token_type": "Bearer",
+                "expires_in": config.token_ttl,
+                "scope": form.get("scope", ""),
+            },
+        )
+
+    def api(self, parts, body):
+        store = self.store
+        endpoint = parts[0]
+        object_id = parts[1] if len(parts) > 1 else None
+        folder = self.query.get("folder")
+
+        if endpoint == "locations" and self.command == "GET":
+            return self.send_json(
+                200,
+                [
+                    {
+                        "value": value,
+                        "aggregate_region": aggregate_region,
+                        "display": display,
+                        "region": value,
+                    }
+                    for value, aggregate_region, display in LOCATIONS
+                ],
+            )
+
+        if endpoint == "config-versions" and object_id == "candidate:push":
+            if self.command != "POST":
+                return self.method_not_allowed()
+            job_id = store.push(body)
+            return self.send_json(
+                200,
+                {
+                    "success": True,
+                    "job_id": job_id,
+                    "message": f"CommitAndPush job enqueued with jobid {job_id}",
+                },
+            )
+
+        if endpoint == "jobs" and self.command == "GET":
+            jobs = list(store.jobs.values())
+            if object_id:
+                jobs = [each for each in jobs if each["id"] == object_id]
+                if not jobs:
+                    return self.not_found(object_id)
+            return self.send_json(200, {"data": jobs})
+
+        if object_id is None:
+            if self.command == "GET":
+                return self.list(endpoint, folder)
+            if self.command == "POST":
+                return self.create(endpoint, folder, body)
+            return self.method_not_allowed()
+
+        if self.command == "GET":
+            found = store.get(endpoint, object_id)
+        elif self.command == "PUT":
+            found = store.update(endpoint, object_id, body)
+        elif self.command == "DELETE":
+            found = store.delete(endpoint, object_id)
+        else:
+            return self.method_not_allowed()
+
+        if found is None:
+            return self.not_found(object_id)
+        return self.send_json(200, found)
+
+    def list(self, endpoint, folder):
+        config = self.server.config
+        try:
+            limit = int(self.query.get("limit", config.page_size))
+            offset = int(self.query.get("offset", 0))
+        except ValueError:
+            return self.send_json(
+                400, error_body("E003", "Invalid limit or offset", {})
+            )
+        limit = max(1, min(limit, config.max_limit))
+
+        objects = self.store.list(endpoint, folder, self.query.get("name"))
+        return self.send_json(
+            200,
+            {
+                "data": objects[offset : offset + limit],
+                "limit": limit,
+                "offset": offset,
+                "total": len(objects),
+            },
+        )
+
+    def create(self, endpoint, folder, body):
+        if not isinstance(body, dict) or not body.get("name"):
+            return self.send_json(
+                400,
+                error_body(
+                    "API_I00013",
+                    "Your configuration is not valid.",
+                    {
+                        "errorType": "Invalid Object",
+                        "message": ["name is required"],
+                    },
+                ),
+            )
+
+        created = self.store.create(endpoint, folder, body)
+        if created is None:
+            return self.send_json(
+                400,
+                error_body(
+                    "API_I00013",
+                    "Your configuration is not valid.",
+                    {
+                        "errorType": "Object Already Exists",
+                        "message": [f"{body['name']} is not unique"],
+                    },
+                ),
+            )
+        return self.send_json(201, created)
+
+    def not_found(self, object_id):
+        return self.send_json(
+            404,
+            error_body("API_I00035", "Object Not Present", {"id": object_id}),
+        )
+
+    def method_not_allowed(self):
+        return self.send_json(
+            405, error_body("E405", "Method Not Allowed", {})
+        )
+
+
+class MockServer(ThreadingHTTPServer):
+    """The stand-in API server, which can also run in a background thread."""
+
+    daemon_threads = True
+
+    def __init__(self, config):
+        super().__init__((config.host, config.port), Handler)
+        self.config = config
+        self.issuer = TokenIssuer(config.token_ttl)
+        self.limiter = RateLimiter(config.rate_limit, config.burst)
+        self.tenants = {}
+        self.tenants_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.thread = None
+        # (start, end, method, endpoint, status, bytes) of every request, when enabled
+        self.log = None
+        self.reset_stats()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def environment(self):
+        """Return the environment variables pointing the collection at this server."""
+        return {
+            "PRISMA_ACCESS_TOKEN_URL": self.url + TOKEN_PATH,
+            "PRISMA_ACCESS_API_URL": self.url,
+            "OAUTHLIB_INSECURE_TRANSPORT": "1",
+        }
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        self.shutdown()
+        self.server_close()
+
+    def record_requests(self, enabled=True):
+        """Keep a timed log of every request, for benchmarks."""
+        with self.stats_lock:
+            self.log = [] if enabled else None
+
+    def tenant(self, tsg_id):
+        """Return the objects of a tenant, created on first use."""
+        with self.tenants_lock:
+            if tsg_id not in self.tenants:
+                self.tenants[tsg_id] = Store()
+            return self.tenants[tsg_id]
+
+    def seed(self, tsg_id, endpoint, folder, objects):
+        """Create objects of a tenant directly, without going through the API."""
+        store = self.tenant(tsg_id)
+        for each in objects:
+            store.create(endpoint, folder, each)
+
+    def reset(self):
+        """Forget every tenant and clear the statistics."""
+        with self.tenants_lock:
+            self.tenants = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.stats_lock:
+            if self.log is not None:
+                self.log = []
+            self.stats = {
+                "requests": 0,
+                "bytes": 0,
+                "tokens": 0,
+                "by_endpoint": {},
+                "by_status": {},
+            }
+
+    def count(self, method, endpoint, status, size, started):
+        with self.stats_lock:
+            if self.log is not None:
+                self.log.append(
+                    (started, time.time(), method, endpoint, status, size)
+                )
+            self.stats["requests"] += 1
+            self.stats["bytes"] += size
+            key = f"{method} {endpoint}"
+            self.stats["by_endpoint"][key] = (
+                self.stats["by_endpoint"].get(key, 0) + 1
+            )
+            self.stats["by_status"][str(status)] = (
+                self.stats["by_status"].get(str(status), 0) + 1
+            )
+
+    def count_token(self):
+        with self.stats_lock:
+            self.stats["tokens"] += 1
+
+    def snapshot_stats(self):
+        with self.stats_lock:
+            return json.loads(json.dumps(self.stats))
+
+
+def parse_args(argv=None):
+    """Return the server configuration from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--port", default=8000, type=int, help="0 picks a free port"
+    )
+    parser.add_argument(
+        "--latency",
+        default=0.0,
+        type=float,
+        help="seconds added to every request",
+    )
+    parser.add_argument(
+        "--jitter",
+        default=0.0,
+        type=float,
+        help="random extra latency, in seconds",
+    )
+    parser.add_argument(
+        "--page-size",
+        default=200,
+        type=int,
+        help="objects per page without a limit",
+    )
+    parser.add_argument(
+        "--max-limit", default=5000, type=int, help="largest limit honoured"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        default=0.0,
+        type=float,
+        help="requests per second before answering 429; 0 disables it",
+    )
+    parser.add_argument("--burst", default=None, type=int)
+    parser.add_argument(
+        "--error-rate",
+        default=0.0,
+        type=float,
+        help="fraction of API requests failing with --error-status",
+    )
+    parser.add_argument("--error-status", default=500, type=int)
+    parser.add_argument("--token-ttl", default=900, type=int)
+    parser.add_argument(
+        "--client-id", default=None, help="only accept this client id"
+    )
+    parser.add_argument(
+        "--client-secret", default=None, help="only accept this client secret"
+    )
+    parser.add_argument("--seed", default=None, type=int, help="random seed")
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main():
+    config = parse_args()
+    if config.seed is not None:
+        random.seed(config.seed)
+
+    server = MockServer(config)
+    for key, value in server.environment().items():
+        print(f"export {key}={value}", flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
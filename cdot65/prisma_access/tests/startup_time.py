@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Startup time and payload size of the collection's modules, and a budget they are checked against.
+
+Every module is imported with python -X importtime in a fresh process, and run
+with arguments failing validation, which is as far as a module gets before
+its first API call. The AnsiballZ payload Ansible builds for the module is
+kept, and its size recorded; it is then run the same way, which adds the
+cost of unpacking and compiling the bundled module_utils. For each, the
+median of --runs runs is recorded, along with the import time per top-level
+package, so the packages a module pays for at startup are visible:
+
+    python tests/startup_time.py --output before.json
+    python tests/startup_time.py --compare before.json --budget 150
+
+The run fails when a module's import exceeds --budget milliseconds, or when
+importing it loads one of the --forbid packages, which modules are expected
+to import only once their arguments are valid.
+
+Copyright: (c) 2023, Calvin Remsburg (@cdot65) <cremsburg.dev@gmail.com>
+Apache 2.0 License
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark import COLLECTION, collections_path
+
+PACKAGE = "ansible_collections.cdot65.prisma_access.plugins.modules"
+
+MODULES = sorted(
+    path.stem
+    for path in (COLLECTION / "plugins" / "modules").glob("*.py")
+    if path.stem != "__init__"
+)
+
+
+def import_times(python, module, environment):
+    """Return the cumulative import time of a module, and the self time per top-level package, in milliseconds."""
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {PACKAGE}.{module}"],
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total = 0.0
+    packages = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # the header line
+            continue
+        name = name.strip()
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(self_us) / 1000
+        if name == f"{PACKAGE}.{module}":
+            total = int(cumulative_us) / 1000
+    return total, packages
+
+
+def validation_time(python, module, environment, workdir):
+    """Return the wall time, in milliseconds, of running a module until it fails argument validation."""
+    arguments = Path(workdir, "arguments.json")
+    arguments.write_text(json.dumps({"ANSIBLE_MODULE_ARGS": {}}))
+
+    started = time.monotonic()
+    completed = subprocess.run(
+        [python, "-m", f"{PACKAGE}.{module}", str(arguments)],
+        env=environment,
+        cwd=workdir,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = (time.monotonic() - started) * 1000
+
+    result = json.loads(completed.stdout)
+    if not result.get("failed"):
+        raise RuntimeError(f"{module} did not fail validation: {result}")
+    return elapsed
+
+
+def build_payload(python, module, environment, workdir):
+    """Return the path of the AnsiballZ payload Ansible builds for a module, with arguments failing validation."""
+    remote = Path(workdir, "remote", module)
+    subprocess.run(
+        [
+            python,
+            "-m",
+            "ansible",
+            "adhoc",
+            "localhost",
+            "--connection",
+            "local",
+            "--module-name",
+            f"cdot65.prisma_access.{module}",
+            "--args",
+            json.dumps({"_startup_time": True}),
+        ],
+        env=dict(
+            environment,
+            ANSIBLE_KEEP_REMOTE_FILES="1",
+            ANSIBLE_REMOTE_TMP=str(remote),
+        ),
+        cwd=workdir,
+        capture_output=True,
+        text=True,
+    )
+    for path in remote.glob(f"*/AnsiballZ_{module}.py"):
+        return path
+    raise RuntimeError(f"no AnsiballZ payload was built for {module}")
+
+
+def payload_time(python, payload, environment, workdir):
+    """Return the wall time, in milliseconds, of running an AnsiballZ payload until the module fails validation."""
+    started = time.monotonic()
+    completed = subprocess.run(
+        [python, str(payload)],
+        env=environment,
+        cwd=workdir,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = (time.monotonic() - started) * 1000
+
+    result = json.loads(completed.stdout)
+    if not result.get("failed"):
+        raise RuntimeError(f"{payload.name} did not fail validation: {result}")
+    return elapsed
+
+
+def measure(python, module, runs, environment, workdir):
+    imports = [import_times(python, module, environment) for _ in range(runs)]
+    validations = [
+        validation_time(python, module, environment, workdir)
+        for _ in range(runs)
+    ]
+    payload = build_payload(python, module, environment, workdir)
+    payloads = [
+        payload_time(python, payload, environment, workdir)
+        for _ in range(runs)
+    ]
+
+    # the run whose total is the median stands for the module
+    imports.sort(key=lambda each: each[0])
+    total, packages = imports[len(imports) // 2]
+    return {
+        "module": module,
+        "import_ms": round(total, 3),
+        "validation_ms": round(statistics.median(validations), 3),
+        "payload_bytes": payload.stat().st_size,
+        "payload_ms": round(statistics.median(payloads), 3),
+        "packages": dict(
+            (package, round(ms, 3))
+            for package, ms in sorted(
+                packages.items(), key=lambda each: each[1], reverse=True
+            )
+        ),
+    }
+
+
+def check(results, budget, forbid):
+    """Return the lines describing every module over budget or importing a forbidden package."""
+    problems = []
+    for each in results:
+        if budget and each["import_ms"] > budget:
+            problems.append(
+                f"{each['module']}: import takes {each['import_ms']:.1f} ms, over the {budget:.1f} ms budget"
+            )
+        for package in forbid:
+            if package in each["packages"]:
+                problems.append(
+                    f"{each['module']}: importing the module imports {package}"
+                )
+    return problems
+
+
+def metadata(args, python):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=COLLECTION,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "budget_ms": args.budget,
+    }
+
+
+def compare(results, baseline):
+    """Return lines comparing import and validation times, and payloads, against a previous run."""
+    previous = dict((each["module"], each) for each in baseline["results"])
+    lines = [
+        f"{'module':<26} {'import ms':>10} {'change':>8} {'validate ms':>12} {'change':>8} "
+        f"{'payload KiB':>12} {'change':>8} {'payload ms':>11} {'change':>8}"
+    ]
+    for each in results:
+        before = previous.get(each["module"])
+        if not before:
+            continue
+
+        def change(key):
+            if not before[key]:
+                return "n/a"
+            return f"{(each[key] - before[key]) / before[key]:+.1%}"
+
+        lines.append(
+            f"{each['module']:<26} {each['import_ms']:>10.1f} {change('import_ms'):>8} "
+            f"{each['validation_ms']:>12.1f} {change('validation_ms'):>8} "
+            f"{each['payload_bytes'] / 1024:>12.1f} {change('payload_bytes'):>8} "
+            f"{each['payload_ms']:>11.1f} {change('payload_ms'):>8}"
+        )
+    return lines
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--modules", nargs="+", default=MODULES, choices=MODULES
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="runs per module; the median is reported",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        help="milliseconds a module's import may take",
+    )
+    parser.add_argument(
+        "--forbid",
+        nargs="*",
+        default=["panapi"],
+        help="top-level packages importing a module must not import",
+    )
+    parser.add_argument(
+        "--python",
+        default=sys.executable,
+        help="interpreter running the modules",
+    )
+    parser.add_argument(
+        "--output",
+        help="file receiving the results as JSON; stdout by default",
+    )
+    parser.add_argument(
+        "--compare", help="results of a previous run to compare against"
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        collections = str(collections_path(workdir))
+        environment = dict(os.environ)
+        environment["HOME"] = workdir
+        environment["ANSIBLE_COLLECTIONS_PATH"] = collections
+        environment["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [collections, os.environ.get("PYTHONPATH")])
+        )
+
+        results = []
+        for module in args.modules:
+            result = measure(
+                args.python, module, args.runs, environment, workdir
+            )
+            results.append(result)
+            heaviest = ", ".join(
+                f"{package} {ms:.1f}"
+                for package, ms in list(result["packages"].items())[:3]
+            )
+            print(
+                f"{module:<26} import {result['import_ms']:>7.1f} ms, "
+                f"validation {result['validation_ms']:>7.1f} ms, "
+                f"payload {result['payload_bytes'] / 1024:.1f} KiB "
+                f"in {result['payload_ms']:.1f} ms ({heaviest})",
+                file=sys.stderr,
+            )
+
+    report = {"metadata": metadata(args, args.python), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline:
+            for line in compare(results, json.load(baseline)):
+                print(line, file=sys.stderr)
+
+    problems = check(results, args.budget, args.forbid)
+    for line in problems:
+        print(line, file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()